@@ -5,19 +5,53 @@ from pyguiadapterlite.components.valuewidget import (
 )
 from pyguiadapterlite.core.adapter import GUIAdapter
 from pyguiadapterlite.core.fn import ParameterError
+from pyguiadapterlite.core.cache import ResultCache, CacheStats
+from pyguiadapterlite.core.fingerprint import (
+    FileFingerprinter,
+    default_fingerprinter,
+    set_fingerprint_index_path,
+)
+from pyguiadapterlite.core.watchdog import ExecutionTimeoutError
+from pyguiadapterlite.core.dispatcher import (
+    UIDispatcher,
+    UIDispatcherStats,
+    default_ui_dispatcher,
+)
+from pyguiadapterlite.core.streaming import ResultStream, StreamedResult
+from pyguiadapterlite.core.progresstasks import ProgressTask, ProgressTaskInfo
+from pyguiadapterlite.core.uprogress import (
+    uprogress,
+    utrange,
+    ProgressIterator,
+    ProgressSink,
+)
+from pyguiadapterlite.core.batch import (
+    BatchRunner,
+    BatchItemResult,
+    BatchProgress,
+    parameter_grid,
+)
 from pyguiadapterlite.core.registry import ParameterWidgetFactory
 from pyguiadapterlite.windows.basewindow import BaseWindowConfig, BaseWindow
 from pyguiadapterlite.windows.fnexecwindow import FnExecuteWindowConfig, FnExecuteWindow
 from pyguiadapterlite.windows.fnselectwindow import FnSelectWindowConfig, FnSelectWindow
 from pyguiadapterlite.core.context import (
     uprint,
+    get_output_stats,
+    run_subprocess,
     is_function_cancelled,
     is_cancel_requested,
+    current_run_id,
+    copy_run_context,
+    spawn_thread,
     is_progressbar_enabled,
     is_progress_label_enabled,
     start_progressbar,
     stop_progressbar,
     update_progressbar,
+    get_progress_stats,
+    open_progress_task,
+    current_progress_task,
     show_progressbar,
     hide_progressbar,
     show_toast,
@@ -39,6 +73,56 @@ from pyguiadapterlite.core.context import (
     get_path_input,
     get_text_input,
     show_custom_dialog,
+    show_info_messagebox_async,
+    show_warning_messagebox_async,
+    show_critical_messagebox_async,
+    show_question_messagebox_async,
+    show_ok_cancel_messagebox_async,
+    show_retry_cancel_messagebox_async,
+    show_yes_no_cancel_messagebox_async,
+    show_yes_no_messagebox_async,
+    get_string_input_async,
+    get_string_input2_async,
+    get_int_input_async,
+    get_float_input_async,
+    get_path_input_async,
+    get_file_path_input_async,
+    get_dir_path_input_async,
+    get_text_input_async,
+    show_custom_dialog_async,
+    show_error_messagebox_async,
+)
+from pyguiadapterlite.core.acontext import (
+    auprint,
+    ais_cancel_requested,
+    ais_progressbar_enabled,
+    ais_progress_label_enabled,
+    astart_progressbar,
+    astop_progressbar,
+    aupdate_progressbar,
+    ashow_progressbar,
+    ahide_progressbar,
+    aopen_progress_task,
+    ashow_toast,
+    arun_subprocess,
+    ashow_info_messagebox,
+    ashow_warning_messagebox,
+    ashow_critical_messagebox,
+    ashow_error_messagebox,
+    ashow_question_messagebox,
+    ashow_ok_cancel_messagebox,
+    ashow_yes_no_messagebox,
+    ashow_retry_cancel_messagebox,
+    ashow_yes_no_cancel_messagebox,
+    aget_string_input,
+    aget_string_input2,
+    aget_int_input,
+    aget_float_input,
+    aget_file_path_input,
+    aget_dir_path_input,
+    aget_path_input,
+    aget_text_input,
+    ashow_custom_dialog,
 )
 from pyguiadapterlite.components.menus import Action, Menu, Separator
 from pyguiadapterlite.components.dialog import (
@@ -114,6 +114,17 @@ class Messages(object):
         self.MSG_SCROLL_TO_TOP = tr_("Scroll to Top")
         self.MSG_SCROLL_TO_BOTTOM = tr_("Scroll to Bottom")
         self.MSG_SAVE_TO_FILE = tr_("Save to File")
+        self.MSG_JUMP_TO_LATEST = tr_("Jump to Latest ↓")
+        self.MSG_OUTPUT_LINES_TRUNCATED = tr_("{} earlier lines truncated")
+        self.MSG_OUTPUT_LINES_SUPPRESSED = tr_("... {:,} lines suppressed")
+        self.MSG_SEARCH_REGEX = tr_("Regex")
+        self.MSG_SEARCH_MATCH_CASE = tr_("Match Case")
+        self.MSG_SEARCH_FILTER_LINES = tr_("Only Matching Lines")
+        self.MSG_SEARCH_PREVIOUS = tr_("↑")
+        self.MSG_SEARCH_NEXT = tr_("↓")
+        self.MSG_SEARCH_STATUS = tr_("{}/{} matches")
+        self.MSG_SEARCH_IN_PROGRESS = tr_(" (searching...)")
+        self.MSG_SEARCH_INVALID_PATTERN = tr_("Invalid pattern")
         self.MSG_ZOOMING = tr_("Zoom")
         self.MSG_ZOOM_IN = tr_("Zoom In")
         self.MSG_ZOOM_OUT = tr_("Zoom Out")
@@ -142,6 +153,48 @@ class Messages(object):
             "An exception occurred during function execution:"
         )
         self.MSG_FUNC_RET_MSG = tr_("The function returned: {}")
+        self.MSG_FUNC_CANCELLED = tr_("The function was cancelled.")
+        self.MSG_CACHE_HIT = tr_("Result loaded from cache.")
+        self.MSG_CACHE_STATS = tr_(
+            "Result cache: {} hits, {} misses, {} evictions, {} entries"
+        )
+        self.MSG_MAX_CONCURRENT_RUNS = tr_(
+            "At most {} runs can be executed at the same time, please wait..."
+        )
+
+        self.MSG_RUNS_TAB_TITLE = tr_("Runs")
+        self.MSG_RUN_TAB_TITLE = tr_("Run #{}")
+        self.MSG_RUN_COLUMN_RUN = tr_("Run")
+        self.MSG_RUN_COLUMN_STATE = tr_("State")
+        self.MSG_RUN_COLUMN_DURATION = tr_("Duration")
+        self.MSG_RUN_COLUMN_RESULT = tr_("Result")
+        self.MSG_RUN_STATE_QUEUED = tr_("Queued")
+        self.MSG_RUN_STATE_RUNNING = tr_("Running")
+        self.MSG_RUN_STATE_DONE = tr_("Done")
+        self.MSG_RUN_STATE_FAILED = tr_("Failed")
+        self.MSG_RUN_STATE_CANCELLED = tr_("Cancelled")
+        self.MSG_CANCEL_SELECTED_RUNS = tr_("Cancel Selected")
+        self.MSG_CLOSE_FINISHED_RUNS = tr_("Close Finished")
+
+        self.MSG_BATCH_TAB_TITLE = tr_("Batch")
+        self.MSG_BATCH_ADD_CURRENT = tr_("Add Current Parameters")
+        self.MSG_BATCH_REMOVE_SELECTED = tr_("Remove Selected")
+        self.MSG_BATCH_CLEAR = tr_("Clear")
+        self.MSG_BATCH_RUN = tr_("Run Batch")
+        self.MSG_BATCH_CANCEL = tr_("Cancel Batch")
+        self.MSG_BATCH_COLUMN_ARGUMENTS = tr_("Arguments")
+        self.MSG_BATCH_NO_ITEMS = tr_("There are no items in the batch!")
+        self.MSG_BATCH_RUNNING = tr_("A batch is running, please wait...")
+        self.MSG_BATCH_PROGRESS = tr_(
+            "{}/{} finished, {} failed, {} cancelled, elapsed: {}, ETA: {}"
+        )
+        self.MSG_BATCH_SUMMARY = tr_(
+            "Batch finished: {} succeeded, {} failed, {} cancelled."
+        )
+        self.MSG_RESULTS_TAB_TITLE = tr_("Results")
+        self.MSG_RESULTS_COLUMN_VALUE = tr_("Value")
+        self.MSG_STREAM_SUMMARY = tr_("{} results streamed to: {}")
+        self.MSG_PROGRESS_TASKS_MORE = tr_("... and {} more tasks")
 
         self.MSG_FUNC_SEL_WIN_TITLE = tr_("Select Function")
         self.MSG_SEL_BUTTON_TEXT = tr_("Select")
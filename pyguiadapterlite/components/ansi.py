@@ -0,0 +1,339 @@
+import re
+from collections import OrderedDict
+from tkinter import Text, TclError
+from typing import Dict, List, Optional, Tuple
+
+from pyguiadapterlite.utils import _warning
+
+# 匹配完整的CSI序列，仅SGR序列（以m结尾）会影响文本样式，其余序列将被忽略
+CSI_PATTERN = re.compile(r"\x1b\[([\d;?]*)([@-~])")
+
+# 用于从文本中去除控制码。与AnsiParser相同，去除所有完整的CSI序列（而不仅是SGR序列），
+# 因此保存、搜索的纯文本与控件中显示的文本一致
+ANSI_PATTERN = CSI_PATTERN
+
+# 旧版TermView.ansi_pattern使用的SGR序列模式，仅为兼容而保留
+SGR_PATTERN = re.compile(r"\x1b\[([\d;]*)m")
+
+# 匹配可能被截断的转义序列前缀
+_INCOMPLETE_PATTERN = re.compile(r"\x1b(\[[\d;?]*)?")
+
+STANDARD_COLORS = (
+    "black",
+    "red",
+    "green",
+    "yellow",
+    "blue",
+    "magenta",
+    "cyan",
+    "white",
+)
+
+BRIGHT_COLORS = tuple(f"bright_{c}" for c in STANDARD_COLORS)
+
+# (fg, bg, bold, italic, underline, reverse)
+# fg/bg为None表示默认颜色，为颜色名称（如red、bright_red）或"#rrggbb"形式的颜色值
+StyleKey = Tuple[Optional[str], Optional[str], bool, bool, bool, bool]
+
+DEFAULT_STYLE: StyleKey = (None, None, False, False, False, False)
+
+
+def split_incomplete(text: str) -> Tuple[str, str]:
+    """将文本末尾被截断的转义序列分离出来，返回（完整部分，截断部分）"""
+    pos = text.rfind("\x1b")
+    if pos < 0:
+        return text, ""
+    tail = text[pos:]
+    if _INCOMPLETE_PATTERN.fullmatch(tail):
+        return text[:pos], tail
+    return text, ""
+
+
+def xterm_256_color(index: int) -> str:
+    """将xterm 256色索引转换为颜色名称或"#rrggbb"形式的颜色值"""
+    if index < 8:
+        return STANDARD_COLORS[index]
+    if index < 16:
+        return BRIGHT_COLORS[index - 8]
+    if index < 232:
+        index -= 16
+        levels = (0, 95, 135, 175, 215, 255)
+        r, g, b = levels[index // 36], levels[(index // 6) % 6], levels[index % 6]
+        return f"#{r:02x}{g:02x}{b:02x}"
+    level = 8 + (index - 232) * 10
+    return f"#{level:02x}{level:02x}{level:02x}"
+
+
+class AnsiParser(object):
+    """
+    增量式ANSI SGR解析器。
+    每次调用feed()时返回（文本，样式）片段列表，样式状态以及被截断在两次输入之间的转义序列会被保留到下一次调用。
+    """
+
+    def __init__(self):
+        self._fg: Optional[str] = None
+        self._bg: Optional[str] = None
+        self._bold = False
+        self._italic = False
+        self._underline = False
+        self._reverse = False
+        self._style: StyleKey = DEFAULT_STYLE
+        self._carry = ""
+
+    @property
+    def style(self) -> StyleKey:
+        return self._style
+
+    @property
+    def has_pending(self) -> bool:
+        """是否有被截断、尚未处理完的转义序列"""
+        return bool(self._carry)
+
+    def reset(self):
+        self._reset_style()
+        self._carry = ""
+
+    def set_style(self, style: StyleKey):
+        """直接设置当前样式，用于从某一行的起始样式开始解析"""
+        (
+            self._fg,
+            self._bg,
+            self._bold,
+            self._italic,
+            self._underline,
+            self._reverse,
+        ) = style
+        self._style = style
+
+    def feed(self, text: str) -> List[Tuple[str, StyleKey]]:
+        if self._carry:
+            text = self._carry + text
+            self._carry = ""
+        if "\x1b" not in text:
+            return [(text, self._style)] if text else []
+
+        segments = []
+        pos = 0
+        for match in CSI_PATTERN.finditer(text):
+            start = match.start()
+            if start > pos:
+                segments.append((text[pos:start], self._style))
+            if match.group(2) == "m":
+                self._apply_sgr(match.group(1))
+            pos = match.end()
+        rest, self._carry = split_incomplete(text[pos:])
+        if rest:
+            segments.append((rest, self._style))
+        return segments
+
+    def _reset_style(self):
+        self._fg = None
+        self._bg = None
+        self._bold = False
+        self._italic = False
+        self._underline = False
+        self._reverse = False
+        self._style = DEFAULT_STYLE
+
+    def _apply_sgr(self, params: str):
+        if not params:
+            self._reset_style()
+            return
+        try:
+            codes = [int(c) if c else 0 for c in params.split(";")]
+        except ValueError:
+            return
+
+        i = 0
+        count = len(codes)
+        while i < count:
+            c = codes[i]
+            i += 1
+            if c == 0:
+                self._reset_style()
+                continue
+            if c == 1:
+                self._bold = True
+            elif c == 3:
+                self._italic = True
+            elif c == 4:
+                self._underline = True
+            elif c == 7:
+                self._reverse = True
+            elif c == 22:
+                self._bold = False
+            elif c == 23:
+                self._italic = False
+            elif c == 24:
+                self._underline = False
+            elif c == 27:
+                self._reverse = False
+            elif 30 <= c <= 37:
+                self._fg = STANDARD_COLORS[c - 30]
+            elif 90 <= c <= 97:
+                self._fg = BRIGHT_COLORS[c - 90]
+            elif 40 <= c <= 47:
+                self._bg = STANDARD_COLORS[c - 40]
+            elif 100 <= c <= 107:
+                self._bg = BRIGHT_COLORS[c - 100]
+            elif c == 39:
+                self._fg = None
+            elif c == 49:
+                self._bg = None
+            elif c in (38, 48):
+                color, i = self._parse_extended_color(codes, i)
+                if color is not None:
+                    if c == 38:
+                        self._fg = color
+                    else:
+                        self._bg = color
+        self._style = (
+            self._fg,
+            self._bg,
+            self._bold,
+            self._italic,
+            self._underline,
+            self._reverse,
+        )
+
+    @staticmethod
+    def _parse_extended_color(codes: List[int], i: int) -> Tuple[Optional[str], int]:
+        # 38;5;n / 48;5;n       256色
+        # 38;2;r;g;b / 48;2;r;g;b 真彩色
+        if i >= len(codes):
+            return None, i
+        mode = codes[i]
+        if mode == 5 and i + 1 < len(codes):
+            return xterm_256_color(min(max(codes[i + 1], 0), 255)), i + 2
+        if mode == 2 and i + 3 < len(codes):
+            r, g, b = (min(max(v, 0), 255) for v in codes[i + 1 : i + 4])
+            return f"#{r:02x}{g:02x}{b:02x}", i + 4
+        return None, len(codes)
+
+
+class StyleTagCache(object):
+    """
+    管理Text控件中用于显示ANSI样式的标签。
+    每种样式组合对应的标签元组会被缓存；256色、真彩色等调色板之外的颜色按需创建标签，
+    并以LRU方式限制其数量，避免标签表无限增长。
+    """
+
+    def __init__(
+        self,
+        text_widget: Text,
+        colormap: Dict[str, str],
+        foreground: str,
+        background: str,
+        font: tuple,
+        max_dynamic_tags: int = 256,
+    ):
+        self._text_widget = text_widget
+        self._colormap = colormap
+        self._foreground = foreground
+        self._background = background
+        self._font = font
+        # 样式 -> (标签组合, 使用到的动态标签)
+        self._style_tags_cache: Dict[StyleKey, Tuple[Tuple[str, ...], tuple]] = {}
+        # 256色、真彩色等动态创建的标签，按最近使用顺序排列
+        self._dynamic_tags: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._dynamic_tag_counter = 0
+        self._max_dynamic_tags = max(8, max_dynamic_tags)
+        # 存储标签配置
+        self._tag_configs = {}
+        self._init_tags()
+
+    @property
+    def tag_configs(self) -> Dict[str, dict]:
+        return self._tag_configs
+
+    def _init_tags(self):
+        """初始化文本样式标签"""
+        # 前景色标签
+        for name, color in self._colormap.items():
+            tag_name = f"fg_{name}"
+            self._text_widget.tag_config(tag_name, foreground=color)
+            self._tag_configs[tag_name] = {"foreground": color}
+
+        # 背景色标签
+        for name, color in self._colormap.items():
+            tag_name = f"bg_{name}"
+            self._text_widget.tag_config(tag_name, background=color)
+            self._tag_configs[tag_name] = {"background": color}
+
+        # 样式标签
+        font_family, font_size = self._font[0], self._font[1]
+        self._text_widget.tag_config("bold", font=(font_family, font_size, "bold"))
+        self._text_widget.tag_config("italic", font=(font_family, font_size, "italic"))
+        self._text_widget.tag_config(
+            "bold_italic", font=(font_family, font_size, "bold", "italic")
+        )
+        self._text_widget.tag_config("underline", underline=True)
+        self._tag_configs["bold"] = {"font": (font_family, font_size, "bold")}
+        self._tag_configs["italic"] = {"font": (font_family, font_size, "italic")}
+        self._tag_configs["bold_italic"] = {
+            "font": (font_family, font_size, "bold", "italic")
+        }
+        self._tag_configs["underline"] = {"underline": True}
+
+    def tags_for(self, style: StyleKey) -> Tuple[str, ...]:
+        """获取样式对应的标签组合，结果会被缓存"""
+        cached = self._style_tags_cache.get(style)
+        if cached is not None:
+            tags, dynamic_keys = cached
+            for key in dynamic_keys:
+                self._dynamic_tags.move_to_end(key)
+            return tags
+
+        fg, bg, bold, italic, underline, reverse = style
+        if reverse:
+            fg, bg = (bg or self._background), (fg or self._foreground)
+
+        tags = []
+        dynamic_keys = []
+        for prefix, color in (("fg", fg), ("bg", bg)):
+            if not color:
+                continue
+            if color in self._colormap:
+                tags.append(f"{prefix}_{color}")
+            else:
+                key = (prefix, color)
+                tags.append(self._dynamic_tag(key))
+                dynamic_keys.append(key)
+
+        if bold and italic:
+            tags.append("bold_italic")
+        elif bold:
+            tags.append("bold")
+        elif italic:
+            tags.append("italic")
+        if underline:
+            tags.append("underline")
+
+        tags = tuple(tags)
+        self._style_tags_cache[style] = (tags, tuple(dynamic_keys))
+        return tags
+
+    def _dynamic_tag(self, key: Tuple[str, str]) -> str:
+        """获取或创建256色、真彩色对应的标签，标签总数超过上限时删除最久未使用的标签"""
+        tag_name = self._dynamic_tags.get(key)
+        if tag_name is not None:
+            self._dynamic_tags.move_to_end(key)
+            return tag_name
+
+        prefix, color = key
+        self._dynamic_tag_counter += 1
+        tag_name = f"{prefix}_x{self._dynamic_tag_counter}"
+        option = "foreground" if prefix == "fg" else "background"
+        try:
+            self._text_widget.tag_config(tag_name, **{option: color})
+        except TclError:
+            _warning(f"invalid color: {color}")
+            self._text_widget.tag_config(tag_name)
+        self._dynamic_tags[key] = tag_name
+
+        while len(self._dynamic_tags) > self._max_dynamic_tags:
+            _, evicted = self._dynamic_tags.popitem(last=False)
+            # 被删除标签所覆盖的已有文本将恢复默认颜色
+            self._text_widget.tag_delete(evicted)
+            self._style_tags_cache.clear()
+        return tag_name
@@ -0,0 +1,176 @@
+from tkinter.ttk import Frame, Treeview, Scrollbar, Button, Progressbar, Label
+from typing import Optional, Callable, List, Dict, Any
+
+from pyguiadapterlite._messages import messages as msgs
+from pyguiadapterlite.components.runlist import format_duration
+
+
+def format_arguments(arguments: Dict[str, Any], max_length: int = 200) -> str:
+    text = ", ".join(f"{name}={value!r}" for name, value in arguments.items())
+    if len(text) > max_length:
+        text = text[: max_length - 3] + "..."
+    return text
+
+
+class BatchView(Frame):
+    """批量执行的参数列表和结果表格，以及整体进度"""
+
+    _COLUMNS = ("index", "arguments", "state", "duration", "result")
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._add_handler: Optional[Callable[[], None]] = None
+        self._remove_handler: Optional[Callable[[List[int]], None]] = None
+        self._clear_handler: Optional[Callable[[], None]] = None
+        self._run_handler: Optional[Callable[[], None]] = None
+        self._cancel_handler: Optional[Callable[[], None]] = None
+        self._cancel_selected_handler: Optional[Callable[[List[int]], None]] = None
+
+        msgs_ = msgs()
+        toolbar = Frame(self)
+        self._add_button = Button(
+            toolbar,
+            text=msgs_.MSG_BATCH_ADD_CURRENT,
+            command=lambda: self._call(self._add_handler),
+        )
+        self._remove_button = Button(
+            toolbar,
+            text=msgs_.MSG_BATCH_REMOVE_SELECTED,
+            command=lambda: self._call(self._remove_handler, self.selected_items()),
+        )
+        self._clear_button = Button(
+            toolbar,
+            text=msgs_.MSG_BATCH_CLEAR,
+            command=lambda: self._call(self._clear_handler),
+        )
+        self._run_button = Button(
+            toolbar,
+            text=msgs_.MSG_BATCH_RUN,
+            command=lambda: self._call(self._run_handler),
+        )
+        self._cancel_button = Button(
+            toolbar,
+            text=msgs_.MSG_BATCH_CANCEL,
+            command=lambda: self._call(self._cancel_handler),
+            state="disabled",
+        )
+        self._cancel_selected_button = Button(
+            toolbar,
+            text=msgs_.MSG_CANCEL_SELECTED_RUNS,
+            command=lambda: self._call(
+                self._cancel_selected_handler, self.selected_items()
+            ),
+            state="disabled",
+        )
+        for button in (
+            self._add_button,
+            self._remove_button,
+            self._clear_button,
+            self._run_button,
+            self._cancel_button,
+            self._cancel_selected_button,
+        ):
+            button.pack(side="left", padx=2, pady=2)
+
+        tree_frame = Frame(self)
+        self._tree = Treeview(
+            tree_frame, columns=self._COLUMNS, show="headings", selectmode="extended"
+        )
+        self._tree.heading("index", text="#")
+        self._tree.heading("arguments", text=msgs_.MSG_BATCH_COLUMN_ARGUMENTS)
+        self._tree.heading("state", text=msgs_.MSG_RUN_COLUMN_STATE)
+        self._tree.heading("duration", text=msgs_.MSG_RUN_COLUMN_DURATION)
+        self._tree.heading("result", text=msgs_.MSG_RUN_COLUMN_RESULT)
+        self._tree.column("index", width=50, stretch=False)
+        self._tree.column("arguments", width=300, stretch=True)
+        self._tree.column("state", width=90, stretch=False)
+        self._tree.column("duration", width=80, stretch=False)
+        self._tree.column("result", width=200, stretch=True)
+        scrollbar = Scrollbar(tree_frame, orient="vertical", command=self._tree.yview)
+        self._tree.config(yscrollcommand=scrollbar.set)
+        self._tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        progress_frame = Frame(self)
+        self._progressbar = Progressbar(
+            progress_frame, orient="horizontal", mode="determinate", maximum=100
+        )
+        self._progress_label = Label(progress_frame, text="")
+        self._progressbar.pack(side="top", fill="x", padx=2, pady=(2, 0))
+        self._progress_label.pack(side="top", fill="x", padx=2, pady=(0, 2))
+
+        toolbar.pack(side="top", fill="x")
+        progress_frame.pack(side="bottom", fill="x")
+        tree_frame.pack(side="top", fill="both", expand=True)
+
+    def set_add_handler(self, handler: Callable[[], None]):
+        self._add_handler = handler
+
+    def set_remove_handler(self, handler: Callable[[List[int]], None]):
+        self._remove_handler = handler
+
+    def set_clear_handler(self, handler: Callable[[], None]):
+        self._clear_handler = handler
+
+    def set_run_handler(self, handler: Callable[[], None]):
+        self._run_handler = handler
+
+    def set_cancel_handler(self, handler: Callable[[], None]):
+        self._cancel_handler = handler
+
+    def set_cancel_selected_handler(self, handler: Callable[[List[int]], None]):
+        self._cancel_selected_handler = handler
+
+    def set_items(self, items: List[Dict[str, Any]], state: str):
+        """重新填充表格，每一行对应一组参数"""
+        self._tree.delete(*self._tree.get_children())
+        for index, arguments in enumerate(items):
+            self._tree.insert(
+                "",
+                "end",
+                iid=str(index),
+                values=(index + 1, format_arguments(arguments), state, "", ""),
+            )
+
+    def update_item(
+        self,
+        index: int,
+        state: Optional[str] = None,
+        duration: Optional[float] = None,
+        result: Optional[str] = None,
+    ):
+        iid = str(index)
+        if not self._tree.exists(iid):
+            return
+        if state is not None:
+            self._tree.set(iid, "state", state)
+        if duration is not None:
+            self._tree.set(iid, "duration", format_duration(duration))
+        if result is not None:
+            self._tree.set(iid, "result", result.splitlines()[0] if result else "")
+
+    def selected_items(self) -> List[int]:
+        return [int(iid) for iid in self._tree.selection()]
+
+    def set_running(self, running: bool):
+        """切换执行中/空闲状态下各按钮的可用状态"""
+        idle_state = "disabled" if running else "normal"
+        busy_state = "normal" if running else "disabled"
+        for button in (
+            self._add_button,
+            self._remove_button,
+            self._clear_button,
+            self._run_button,
+        ):
+            button.config(state=idle_state)
+        self._cancel_button.config(state=busy_state)
+        self._cancel_selected_button.config(state=busy_state)
+
+    def set_progress(self, percent: float, text: str):
+        self._progressbar.config(value=percent)
+        self._progress_label.config(text=text)
+
+    @staticmethod
+    def _call(handler: Optional[Callable[..., None]], *args):
+        if handler is not None:
+            handler(*args)
@@ -0,0 +1,118 @@
+from array import array
+from typing import Iterator, List
+
+
+class LineBuffer(object):
+    """
+    紧凑的只追加行缓冲区。
+    所有文本以UTF-8编码连续存放在一个bytearray中，另用一个array记录每一行的起始偏移量，
+    因此内存占用只与写入的字节数成正比，且可以在O(1)时间内按行号访问任意一行。
+    追加只能在一个线程（通常是主线程）中进行，其他线程可以同时读取。
+    """
+
+    def __init__(self, encoding: str = "utf-8", first_line: int = 0):
+        self._encoding = encoding
+        # (文本数据, 每一行在文本数据中的起始位置, 第一行的行号)
+        # offsets的最后一项为当前未结束行的起始位置。
+        # 丢弃旧行或清空时整体替换该元组，使其他线程总能读取到一致的快照
+        self._state = (bytearray(), array("Q", [0]), max(0, first_line))
+        # 每次清空时递增，用于让使用者判断行号是否已失效
+        self._epoch = 0
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    @property
+    def epoch(self) -> int:
+        """清空次数，行号只在同一epoch内有意义"""
+        return self._epoch
+
+    @property
+    def nbytes(self) -> int:
+        """已存储文本的字节数"""
+        return len(self._state[0])
+
+    @property
+    def first_line(self) -> int:
+        """仍保留在缓冲区中的第一行的行号"""
+        return self._state[2]
+
+    @property
+    def line_count(self) -> int:
+        """行数（包括已丢弃的行），末尾未结束的行只有在非空时才计入"""
+        blob, offsets, first = self._state
+        count = first + len(offsets)
+        if offsets[-1] == len(blob):
+            count -= 1
+        return count
+
+    @property
+    def open_line_index(self) -> int:
+        """当前未结束的行（即下一次追加的文本所在的行）的行号"""
+        _, offsets, first = self._state
+        return first + len(offsets) - 1
+
+    def __len__(self) -> int:
+        return self.line_count
+
+    def append(self, text: str) -> int:
+        """追加文本，返回本次新增的完整行数"""
+        if not text:
+            return 0
+        blob, offsets, _ = self._state
+        data = text.encode(self._encoding, errors="replace")
+        base = len(blob)
+        blob += data
+        added = 0
+        pos = data.find(b"\n")
+        while pos >= 0:
+            offsets.append(base + pos + 1)
+            added += 1
+            pos = data.find(b"\n", pos + 1)
+        return added
+
+    def get_line(self, index: int) -> str:
+        blob, offsets, first = self._state
+        count = first + len(offsets)
+        if offsets[-1] == len(blob):
+            count -= 1
+        if index < 0:
+            index += count
+        local = index - first
+        if local < 0 or index >= count:
+            raise IndexError("line index out of range")
+        start = offsets[local]
+        if local + 1 < len(offsets):
+            end = offsets[local + 1] - 1
+        else:
+            end = len(blob)
+        return blob[start:end].decode(self._encoding, errors="replace")
+
+    def __getitem__(self, index: int) -> str:
+        return self.get_line(index)
+
+    def get_lines(self, start: int, end: int) -> List[str]:
+        end = min(end, self.line_count)
+        return [self.get_line(i) for i in range(max(self.first_line, start), end)]
+
+    def iter_lines(self, start: int = 0, end: int = None) -> Iterator[str]:
+        if end is None:
+            end = self.line_count
+        for i in range(max(self.first_line, start), min(end, self.line_count)):
+            yield self.get_line(i)
+
+    def discard_before(self, index: int) -> int:
+        """丢弃行号小于index的旧行，当前未结束的行不会被丢弃。其余行的行号保持不变。返回丢弃的行数"""
+        blob, offsets, first = self._state
+        count = min(index - first, len(offsets) - 1)
+        if count <= 0:
+            return 0
+        cut = offsets[count]
+        new_offsets = array("Q", (o - cut for o in offsets[count:]))
+        self._state = (blob[cut:], new_offsets, first + count)
+        return count
+
+    def clear(self):
+        self._state = (bytearray(), array("Q", [0]), 0)
+        self._epoch += 1
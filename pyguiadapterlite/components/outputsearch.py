@@ -0,0 +1,398 @@
+import dataclasses
+import queue
+import re
+import threading
+from array import array
+from tkinter import StringVar, BooleanVar, TclError
+from tkinter.ttk import Frame, Entry, Checkbutton, Button, Label
+from typing import Optional, List, Pattern
+
+from pyguiadapterlite._messages import messages as msgs
+from pyguiadapterlite.components.ansi import ANSI_PATTERN
+from pyguiadapterlite.components.linebuffer import LineBuffer
+from pyguiadapterlite.utils import _exception
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchQuery(object):
+    text: str
+    """要搜索的文本或正则表达式"""
+
+    regex: bool = False
+    """是否将text视为正则表达式"""
+
+    case_sensitive: bool = False
+    """是否区分大小写"""
+
+    def compile(self) -> Pattern:
+        """编译为正则表达式对象，正则表达式无效时抛出re.error"""
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        if self.regex:
+            return re.compile(self.text, flags)
+        return re.compile(re.escape(self.text), flags)
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchResultPage(object):
+    generation: int
+    """所属搜索任务的编号"""
+
+    lines: List[int]
+    """本页中匹配的行号"""
+
+    scanned_to: int
+    """已搜索到的行号（不含）"""
+
+    done: bool
+    """本次搜索任务是否已完成"""
+
+
+def plain_line(line: str) -> str:
+    """去除一行文本中的ANSI转义序列"""
+    if "\x1b" in line:
+        return ANSI_PATTERN.sub("", line)
+    return line
+
+
+class OutputSearcher(object):
+    """
+    在后台线程中搜索LineBuffer中的文本。
+    搜索结果按页放入结果队列，由主线程调用poll()取出；发起新的搜索时，旧的搜索任务会尽快中止。
+    """
+
+    def __init__(self, page_size: int = 500, check_interval: int = 2000):
+        self._page_size = max(1, page_size)
+        self._check_interval = max(1, check_interval)
+        self._jobs: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._results: "queue.SimpleQueue[SearchResultPage]" = queue.SimpleQueue()
+        self._generation = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def search(self, buffer: LineBuffer, pattern: Pattern, start: int, end: int) -> int:
+        """中止当前的搜索，开始在[start, end)范围内搜索pattern，返回新的搜索任务编号"""
+        self._generation += 1
+        self.extend(buffer, pattern, start, end)
+        return self._generation
+
+    def extend(self, buffer: LineBuffer, pattern: Pattern, start: int, end: int):
+        """在当前搜索任务中追加搜索[start, end)范围内的行，用于搜索新产生的输出"""
+        if self._closed:
+            return
+        self._ensure_thread()
+        self._jobs.put((self._generation, buffer, pattern, start, end))
+
+    def cancel(self):
+        """中止当前的搜索"""
+        self._generation += 1
+
+    def poll(self, max_pages: int = 20) -> List[SearchResultPage]:
+        """取出已完成的结果页（最多max_pages页），过期任务的结果会被丢弃。在主线程中调用"""
+        pages = []
+        while len(pages) < max_pages:
+            try:
+                page = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if page.generation == self._generation:
+                pages.append(page)
+        return pages
+
+    def close(self):
+        self._closed = True
+        self._generation += 1
+        self._jobs.put(None)
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="OutputSearcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                self._search(*job)
+            except Exception as e:
+                _exception(e, "error occurred while searching output")
+
+    def _search(
+        self,
+        generation: int,
+        buffer: LineBuffer,
+        pattern: Pattern,
+        start: int,
+        end: int,
+    ):
+        if generation != self._generation:
+            return
+        search = pattern.search
+        page: List[int] = []
+        index = max(start, buffer.first_line)
+        while index < end:
+            batch_end = min(end, index + self._check_interval)
+            for i in range(index, batch_end):
+                try:
+                    line = buffer.get_line(i)
+                except IndexError:
+                    # 行已被丢弃或缓冲区已被清空
+                    continue
+                if search(plain_line(line)):
+                    page.append(i)
+            index = batch_end
+            if generation != self._generation:
+                return
+            if len(page) >= self._page_size:
+                self._results.put(SearchResultPage(generation, page, index, False))
+                page = []
+        self._results.put(SearchResultPage(generation, page, end, True))
+
+
+class SearchBar(Frame):
+    """
+    输出区域的搜索栏。
+    view需要提供line_buffer属性以及goto_line()、highlight_line()、clear_highlight()、set_line_filter()、extend_line_filter()、
+    add_change_listener()、remove_change_listener()方法。
+    每次按键只会重新安排一次延迟搜索，实际的搜索在后台线程中进行，因此主线程的开销与输出的大小无关。
+    只有在搜索任务尚未完成或输出发生变化时才检查搜索结果，空闲时不会周期性地唤醒主线程。
+    """
+
+    def __init__(
+        self,
+        parent,
+        view,
+        debounce: int = 150,
+        poll_interval: int = 50,
+        **kwargs,
+    ):
+        super().__init__(parent, **kwargs)
+        self._view = view
+        self._debounce = max(0, debounce)
+        self._poll_interval = max(1, poll_interval)
+        self._searcher = OutputSearcher()
+
+        self._pattern: Optional[Pattern] = None
+        self._matches = array("Q")
+        self._current: Optional[int] = None
+        self._searched_until = 0
+        # 尚未搜索时不访问view.line_buffer，以免过早建立行索引
+        self._epoch: Optional[int] = None
+        # 尚未完成的搜索任务数
+        self._pending_jobs = 0
+        self._debounce_id: Optional[str] = None
+        self._poll_id: Optional[str] = None
+
+        msgs_ = msgs()
+        self._query_var = StringVar(self, value="")
+        self._regex_var = BooleanVar(self, value=False)
+        self._case_var = BooleanVar(self, value=False)
+        self._filter_var = BooleanVar(self, value=False)
+
+        self._entry = Entry(self, textvariable=self._query_var)
+        regex_check = Checkbutton(
+            self,
+            text=msgs_.MSG_SEARCH_REGEX,
+            variable=self._regex_var,
+            command=self._on_query_changed,
+        )
+        case_check = Checkbutton(
+            self,
+            text=msgs_.MSG_SEARCH_MATCH_CASE,
+            variable=self._case_var,
+            command=self._on_query_changed,
+        )
+        filter_check = Checkbutton(
+            self,
+            text=msgs_.MSG_SEARCH_FILTER_LINES,
+            variable=self._filter_var,
+            command=self._on_filter_changed,
+        )
+        prev_button = Button(
+            self, text=msgs_.MSG_SEARCH_PREVIOUS, width=3, command=self.find_previous
+        )
+        next_button = Button(
+            self, text=msgs_.MSG_SEARCH_NEXT, width=3, command=self.find_next
+        )
+        self._status_label = Label(self, text="", anchor="w")
+
+        self._entry.pack(side="left", fill="x", expand=True, padx=(0, 4))
+        prev_button.pack(side="left")
+        next_button.pack(side="left", padx=(0, 4))
+        regex_check.pack(side="left")
+        case_check.pack(side="left")
+        filter_check.pack(side="left")
+        self._status_label.pack(side="left", padx=(4, 0))
+
+        self._query_var.trace_add("write", lambda *_: self._on_query_changed())
+        self._entry.bind("<Return>", lambda _: self.find_next())
+        self._entry.bind("<Shift-Return>", lambda _: self.find_previous())
+        self._entry.bind("<Escape>", lambda _: self._query_var.set(""))
+        view.add_change_listener(self._on_view_changed)
+
+    @property
+    def match_count(self) -> int:
+        return len(self._matches)
+
+    @property
+    def matches(self) -> array:
+        """已找到的匹配行的行号"""
+        return self._matches
+
+    def focus_entry(self):
+        self._entry.focus_set()
+        self._entry.select_range(0, "end")
+
+    def find_next(self):
+        self._goto_match(1)
+
+    def find_previous(self):
+        self._goto_match(-1)
+
+    def destroy(self):
+        self._cancel_after("_debounce_id")
+        self._cancel_after("_poll_id")
+        self._view.remove_change_listener(self._on_view_changed)
+        self._searcher.close()
+        super().destroy()
+
+    def _on_query_changed(self):
+        # 每次按键只重新安排一次延迟搜索
+        self._cancel_after("_debounce_id")
+        self._debounce_id = self.after(self._debounce, self._start_search)
+
+    def _on_filter_changed(self):
+        if self._filter_var.get() and self._pattern is not None:
+            self._view.set_line_filter(self._matches)
+        else:
+            self._view.set_line_filter(None)
+
+    def _start_search(self):
+        self._debounce_id = None
+        self._searcher.cancel()
+        self._matches = array("Q")
+        self._current = None
+        self._view.clear_highlight()
+
+        query = SearchQuery(
+            self._query_var.get(),
+            regex=self._regex_var.get(),
+            case_sensitive=self._case_var.get(),
+        )
+        if not query.text:
+            self._pattern = None
+            self._pending_jobs = 0
+            self._view.set_line_filter(None)
+            self._status_label.config(text="")
+            return
+        try:
+            self._pattern = query.compile()
+        except re.error:
+            self._pattern = None
+            self._pending_jobs = 0
+            self._status_label.config(text=msgs().MSG_SEARCH_INVALID_PATTERN)
+            return
+
+        buffer = self._view.line_buffer
+        self._epoch = buffer.epoch
+        # 只搜索已结束的行，未结束的行在结束后由增量搜索处理
+        self._searched_until = buffer.open_line_index
+        self._searcher.search(
+            buffer, self._pattern, buffer.first_line, self._searched_until
+        )
+        self._pending_jobs = 1
+        if self._filter_var.get():
+            self._view.set_line_filter(self._matches)
+        self._update_status()
+        self._schedule_poll()
+
+    def _on_view_changed(self):
+        # 有新的输出、旧行被丢弃或输出被清空：若正在搜索，则稍后检查是否需要增量搜索或重新搜索
+        if self._pattern is not None:
+            self._schedule_poll()
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.after(self._poll_interval, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        if self._pattern is None:
+            return
+
+        buffer = self._view.line_buffer
+        if buffer.epoch != self._epoch:
+            # 输出已被清空，重新搜索
+            self._start_search()
+            return
+
+        for page in self._searcher.poll():
+            if page.lines:
+                self._matches.extend(page.lines)
+                if self._filter_var.get():
+                    self._view.extend_line_filter(page.lines)
+                if self._current is None:
+                    self._goto_match(1)
+            if page.done:
+                self._pending_jobs -= 1
+
+        # 增量搜索新产生的输出
+        open_line = buffer.open_line_index
+        if open_line > self._searched_until:
+            self._searcher.extend(
+                buffer,
+                self._pattern,
+                max(self._searched_until, buffer.first_line),
+                open_line,
+            )
+            self._searched_until = open_line
+            self._pending_jobs += 1
+
+        self._update_status()
+        # 只在仍有未完成的搜索任务时继续检查，新的输出由_on_view_changed()触发检查
+        if self._pending_jobs > 0:
+            self._schedule_poll()
+
+    def _goto_match(self, step: int):
+        count = len(self._matches)
+        if count <= 0 or self._pattern is None:
+            return
+        if self._current is None:
+            self._current = 0 if step > 0 else count - 1
+        else:
+            self._current = (self._current + step) % count
+        index = self._matches[self._current]
+        try:
+            line = plain_line(self._view.line_buffer.get_line(index))
+        except IndexError:
+            return
+        spans = [m.span() for m in self._pattern.finditer(line) if m.end() > m.start()]
+        self._view.goto_line(index)
+        self._view.highlight_line(index, spans)
+        self._update_status()
+
+    def _update_status(self):
+        msgs_ = msgs()
+        current = 0 if self._current is None else self._current + 1
+        text = msgs_.MSG_SEARCH_STATUS.format(current, len(self._matches))
+        if self._pending_jobs > 0:
+            text += msgs_.MSG_SEARCH_IN_PROGRESS
+        self._status_label.config(text=text)
+
+    def _cancel_after(self, attr: str):
+        after_id = getattr(self, attr)
+        if after_id is None:
+            return
+        try:
+            self.after_cancel(after_id)
+        except TclError:
+            pass
+        setattr(self, attr, None)
@@ -0,0 +1,110 @@
+from tkinter.ttk import Frame, Label, Progressbar
+from typing import List, Optional, Tuple
+
+from pyguiadapterlite._messages import messages as msgs
+from pyguiadapterlite.components.runlist import format_duration
+from pyguiadapterlite.core.progresstasks import ProgressTaskInfo
+
+
+def format_task_detail(info: ProgressTaskInfo) -> str:
+    """任务的进度、速率、剩余时间和消息"""
+    if info.total > 0:
+        percent = min(100.0, max(0.0, info.value * 100.0 / info.total))
+        parts = [f"{info.value:g}/{info.total:g}", f"{percent:.0f}%"]
+    else:
+        parts = [f"{info.value:g}"]
+    if info.finished:
+        parts.append(format_duration(info.elapsed))
+    else:
+        if info.rate is not None:
+            parts.append(f"{info.rate:.1f}/s")
+        if info.eta is not None:
+            parts.append(f"ETA {format_duration(info.eta)}")
+    if info.message:
+        parts.append(info.message)
+    return "  ".join(parts)
+
+
+class _TaskRow(object):
+    """面板中的一行，行对象被重复使用，只在显示内容变化时才修改控件"""
+
+    def __init__(self, parent: Frame, row: int, name_width: int):
+        self.name_label = Label(parent, text="", width=name_width, anchor="w")
+        self.progressbar = Progressbar(parent, orient="horizontal", length=160)
+        self.detail_label = Label(parent, text="", anchor="w")
+        self._row = row
+        self._shown: Optional[Tuple] = None
+        self._visible = False
+
+    def show(self, info: ProgressTaskInfo):
+        name = "  " * info.depth + info.name
+        if info.subtasks:
+            name += f" [{info.finished_subtasks}/{info.subtasks}]"
+        if info.finished:
+            name = "✓ " + name
+        maximum = info.total if info.total > 0 else 1
+        value = min(info.value, maximum) if info.total > 0 else 0
+        if info.finished and info.total <= 0:
+            value = maximum
+        shown = (name, maximum, value, format_task_detail(info))
+        if shown != self._shown:
+            if self._shown is None or self._shown[0] != shown[0]:
+                self.name_label.config(text=shown[0])
+            self.progressbar.config(maximum=shown[1], value=shown[2])
+            if self._shown is None or self._shown[3] != shown[3]:
+                self.detail_label.config(text=shown[3])
+            self._shown = shown
+        if not self._visible:
+            self.name_label.grid(row=self._row, column=0, sticky="w", padx=(10, 4))
+            self.progressbar.grid(row=self._row, column=1, sticky="we", padx=4)
+            self.detail_label.grid(row=self._row, column=2, sticky="we", padx=(4, 10))
+            self._visible = True
+
+    def hide(self):
+        if self._visible:
+            self.name_label.grid_remove()
+            self.progressbar.grid_remove()
+            self.detail_label.grid_remove()
+            self._visible = False
+
+
+class ProgressTaskPanel(Frame):
+    """
+    以紧凑的列表显示多个（可嵌套的）进度任务，每个任务一行，包括名称、进度条、速率、剩余时间和消息。
+    最多显示max_rows行，其余任务以一行摘要代替。
+    """
+
+    def __init__(self, parent, max_rows: int = 8, name_width: int = 20, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._max_rows = max(1, max_rows)
+        self._name_width = name_width
+        self._rows: List[_TaskRow] = []
+        self._more_label = Label(self, text="", anchor="w")
+        self._more_visible = False
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_columnconfigure(2, weight=2)
+
+    def render(self, infos: List[ProgressTaskInfo]):
+        visible = infos[: self._max_rows]
+        while len(self._rows) < len(visible):
+            self._rows.append(_TaskRow(self, len(self._rows), self._name_width))
+        for row, info in zip(self._rows, visible):
+            row.show(info)
+        for row in self._rows[len(visible) :]:
+            row.hide()
+
+        hidden = len(infos) - len(visible)
+        if hidden > 0:
+            self._more_label.config(text=msgs().MSG_PROGRESS_TASKS_MORE.format(hidden))
+            if not self._more_visible:
+                self._more_label.grid(
+                    row=self._max_rows, column=0, columnspan=3, sticky="w", padx=10
+                )
+                self._more_visible = True
+        elif self._more_visible:
+            self._more_label.grid_remove()
+            self._more_visible = False
+
+        if not infos:
+            # 所有行都被移除后，grid不会自动收缩容器的大小
+            self.config(height=1)
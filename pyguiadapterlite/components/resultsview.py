@@ -0,0 +1,90 @@
+import dataclasses
+from tkinter.ttk import Frame, Treeview, Scrollbar
+from typing import Any, List, Tuple
+
+from pyguiadapterlite._messages import messages as msgs
+
+
+def _item_columns(item: Any) -> Tuple[str, ...]:
+    # 根据第一项确定表格的列：字典的键、dataclass的字段、元组的各个位置，其他值只有一列
+    if isinstance(item, dict) and item:
+        return tuple(str(key) for key in item.keys())
+    if dataclasses.is_dataclass(item) and not isinstance(item, type):
+        return tuple(f.name for f in dataclasses.fields(item))
+    if isinstance(item, tuple) and item:
+        return tuple(str(i) for i in range(len(item)))
+    return ()
+
+
+def _item_values(item: Any, columns: Tuple[str, ...]) -> List[str]:
+    if not columns:
+        return [repr(item)]
+    if isinstance(item, dict):
+        keys = {str(key): value for key, value in item.items()}
+        return [_cell(keys.get(column, "")) for column in columns]
+    if dataclasses.is_dataclass(item) and not isinstance(item, type):
+        return [_cell(getattr(item, column, "")) for column in columns]
+    if isinstance(item, tuple) and len(item) == len(columns):
+        return [_cell(value) for value in item]
+    # 与第一项的结构不同的项显示在第一列中
+    return [repr(item)] + [""] * (len(columns) - 1)
+
+
+def _cell(value: Any) -> str:
+    return value if isinstance(value, str) else repr(value)
+
+
+class ResultsTableView(Frame):
+    """以表格的形式显示生成器函数逐项产生的结果，表格的列由第一项的结构决定"""
+
+    def __init__(self, parent, max_rows: int = 10000, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._max_rows = max(0, max_rows)
+        self._columns: Tuple[str, ...] = ()
+        self._row_count = 0
+
+        self._tree = Treeview(self, show="headings", selectmode="extended")
+        yscrollbar = Scrollbar(self, orient="vertical", command=self._tree.yview)
+        xscrollbar = Scrollbar(self, orient="horizontal", command=self._tree.xview)
+        self._tree.config(yscrollcommand=yscrollbar.set, xscrollcommand=xscrollbar.set)
+        yscrollbar.pack(side="right", fill="y")
+        xscrollbar.pack(side="bottom", fill="x")
+        self._tree.pack(side="left", fill="both", expand=True)
+        self._setup_columns(())
+
+    def clear(self):
+        self._tree.delete(*self._tree.get_children())
+        self._row_count = 0
+        self._setup_columns(())
+
+    def append(self, start_index: int, items: List[Any]):
+        """追加逐项结果，start_index为items中第一项的序号"""
+        if not items:
+            return
+        if self._row_count == 0:
+            self._setup_columns(_item_columns(items[0]))
+        for offset, item in enumerate(items):
+            index = start_index + offset
+            self._tree.insert(
+                "",
+                "end",
+                values=[index] + _item_values(item, self._columns),
+            )
+        self._row_count += len(items)
+        if self._max_rows and self._row_count > self._max_rows:
+            children = self._tree.get_children()
+            overflow = len(children) - self._max_rows
+            self._tree.delete(*children[:overflow])
+            self._row_count -= overflow
+        self._tree.yview_moveto(1.0)
+
+    def _setup_columns(self, columns: Tuple[str, ...]):
+        self._columns = columns
+        headings = columns or (msgs().MSG_RESULTS_COLUMN_VALUE,)
+        tree_columns = ["index"] + [f"c{i}" for i in range(len(headings))]
+        self._tree.config(columns=tree_columns)
+        self._tree.heading("index", text="#")
+        self._tree.column("index", width=60, stretch=False)
+        for column_id, heading in zip(tree_columns[1:], headings):
+            self._tree.heading(column_id, text=heading)
+            self._tree.column(column_id, width=150, stretch=True)
@@ -0,0 +1,119 @@
+from tkinter.ttk import Frame, Treeview, Scrollbar, Button
+from typing import Optional, Callable, List
+
+from pyguiadapterlite._messages import messages as msgs
+
+
+def format_duration(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class RunListView(Frame):
+    """显示多次执行的列表，每一行对应一次执行，包括执行编号、状态、耗时和结果"""
+
+    _COLUMNS = ("run", "state", "duration", "result")
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._cancel_handler: Optional[Callable[[List[int]], None]] = None
+        self._close_finished_handler: Optional[Callable[[], None]] = None
+        self._activate_handler: Optional[Callable[[int], None]] = None
+
+        msgs_ = msgs()
+        tree_frame = Frame(self)
+        self._tree = Treeview(
+            tree_frame, columns=self._COLUMNS, show="headings", selectmode="extended"
+        )
+        self._tree.heading("run", text=msgs_.MSG_RUN_COLUMN_RUN)
+        self._tree.heading("state", text=msgs_.MSG_RUN_COLUMN_STATE)
+        self._tree.heading("duration", text=msgs_.MSG_RUN_COLUMN_DURATION)
+        self._tree.heading("result", text=msgs_.MSG_RUN_COLUMN_RESULT)
+        self._tree.column("run", width=80, stretch=False)
+        self._tree.column("state", width=100, stretch=False)
+        self._tree.column("duration", width=100, stretch=False)
+        self._tree.column("result", width=300, stretch=True)
+        scrollbar = Scrollbar(tree_frame, orient="vertical", command=self._tree.yview)
+        self._tree.config(yscrollcommand=scrollbar.set)
+        self._tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self._tree.bind("<Double-Button-1>", self._on_double_click)
+
+        button_frame = Frame(self)
+        self._cancel_button = Button(
+            button_frame,
+            text=msgs_.MSG_CANCEL_SELECTED_RUNS,
+            command=self._on_cancel_selected,
+        )
+        self._close_button = Button(
+            button_frame,
+            text=msgs_.MSG_CLOSE_FINISHED_RUNS,
+            command=self._on_close_finished,
+        )
+        self._cancel_button.pack(side="left", padx=2, pady=2)
+        self._close_button.pack(side="left", padx=2, pady=2)
+
+        button_frame.pack(side="bottom", fill="x")
+        tree_frame.pack(side="top", fill="both", expand=True)
+
+    def set_cancel_handler(self, handler: Callable[[List[int]], None]):
+        """点击“取消选中”按钮时回调，参数为选中的执行编号"""
+        self._cancel_handler = handler
+
+    def set_close_finished_handler(self, handler: Callable[[], None]):
+        self._close_finished_handler = handler
+
+    def set_activate_handler(self, handler: Callable[[int], None]):
+        """双击某一行时回调，参数为该行的执行编号"""
+        self._activate_handler = handler
+
+    def add_run(self, run_id: int, state: str, title: Optional[str] = None):
+        self._tree.insert(
+            "",
+            "end",
+            iid=str(run_id),
+            values=(title or f"#{run_id}", state, format_duration(0), ""),
+        )
+
+    def update_run(
+        self,
+        run_id: int,
+        state: Optional[str] = None,
+        duration: Optional[float] = None,
+        result: Optional[str] = None,
+    ):
+        iid = str(run_id)
+        if not self._tree.exists(iid):
+            return
+        if state is not None:
+            self._tree.set(iid, "state", state)
+        if duration is not None:
+            self._tree.set(iid, "duration", format_duration(duration))
+        if result is not None:
+            # 结果只显示第一行
+            self._tree.set(iid, "result", result.splitlines()[0] if result else "")
+
+    def remove_run(self, run_id: int):
+        iid = str(run_id)
+        if self._tree.exists(iid):
+            self._tree.delete(iid)
+
+    def selected_runs(self) -> List[int]:
+        return [int(iid) for iid in self._tree.selection()]
+
+    def _on_cancel_selected(self):
+        if self._cancel_handler:
+            self._cancel_handler(self.selected_runs())
+
+    def _on_close_finished(self):
+        if self._close_finished_handler:
+            self._close_finished_handler()
+
+    def _on_double_click(self, event):
+        iid = self._tree.identify_row(event.y)
+        if iid and self._activate_handler:
+            self._activate_handler(int(iid))
@@ -0,0 +1,183 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional, Union
+
+from pyguiadapterlite.components.ansi import ANSI_PATTERN, split_incomplete
+from pyguiadapterlite.utils import _exception
+
+_CMD_FLUSH = "flush"
+_CMD_TRUNCATE = "truncate"
+_CMD_CLOSE = "close"
+_CMD_COPY = "copy"
+
+
+class OutputSpool(object):
+    """
+    将输出内容完整地写入磁盘文件（去除ANSI转义序列）。
+    写入操作由后台线程带缓冲地完成，调用write()的线程只需将文本放入队列。
+    复制完整的输出（copy_to_async()）同样由后台线程分块完成，不会阻塞调用者。
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        encoding: str = "utf-8",
+        buffer_size: int = 64 * 1024,
+        copy_chunk_size: int = 1024 * 1024,
+    ):
+        if path:
+            self._path = Path(path)
+            self._temporary = False
+        else:
+            fd, tmp_path = tempfile.mkstemp(prefix="pyguiadapterlite-", suffix=".log")
+            os.close(fd)
+            self._path = Path(tmp_path)
+            self._temporary = True
+        self._encoding = encoding
+        self._buffer_size = buffer_size
+        self._copy_chunk_size = max(4096, copy_chunk_size)
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        # 以覆盖方式打开，保证每个spool文件只包含本次会话的输出
+        self._file = open(
+            self._path, "w", encoding=encoding, newline="", buffering=buffer_size
+        )
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, text: str):
+        if self._closed or not text:
+            return
+        self._queue.put(text)
+
+    def truncate(self):
+        if self._closed:
+            return
+        self._queue.put((_CMD_TRUNCATE, None, None))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待后台线程将已提交的内容全部写入磁盘，超时返回False"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put((_CMD_FLUSH, done, None))
+        return done.wait(timeout)
+
+    def copy_to_async(self, dest: Union[str, Path]) -> Future:
+        """
+        在后台线程中将此前提交的全部内容分块复制到dest，返回复制完成的Future，可在任意线程中调用。
+        复制排在已提交的内容之后进行，因此无需等待写入完成；复制期间提交的内容在复制完成后写入。
+        """
+        future = Future()
+        if self._closed:
+            self._copy_file(dest, future)
+        else:
+            self._queue.put((_CMD_COPY, None, (dest, future)))
+        return future
+
+    def copy_to(self, dest: Union[str, Path], timeout: Optional[float] = None):
+        """将全部内容复制到dest，超过timeout秒未完成时抛出TimeoutError（复制仍将在后台完成）"""
+        self.copy_to_async(dest).result(timeout)
+
+    def read_text(self, timeout: Optional[float] = None) -> str:
+        """读取全部内容。等待写入超过timeout秒时，只返回已写入磁盘的内容"""
+        self.flush(timeout)
+        with open(self._path, "r", encoding=self._encoding, newline="") as f:
+            return f.read()
+
+    def close(self, delete: Optional[bool] = None, timeout: Optional[float] = None):
+        """
+        关闭文件，delete为None时只删除临时文件。文件由后台线程在写入剩余内容后关闭（和删除），
+        最多等待timeout秒，返回是否已关闭。
+        """
+        if self._closed:
+            return True
+        self._closed = True
+        if delete is None:
+            delete = self._temporary
+        done = threading.Event()
+        self._queue.put((_CMD_CLOSE, done, delete))
+        return done.wait(timeout)
+
+    def _run(self):
+        carry = ""
+        while True:
+            items = [self._queue.get()]
+            # 一次性取出队列中已有的全部内容，合并后写入
+            try:
+                while True:
+                    items.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            chunks = []
+            for item in items:
+                if isinstance(item, str):
+                    chunks.append(item)
+                    continue
+                carry = self._write_chunks(chunks, carry)
+                chunks = []
+                cmd, done, arg = item
+                try:
+                    if cmd == _CMD_COPY:
+                        self._copy_file(*arg, flush=True)
+                    elif cmd == _CMD_FLUSH:
+                        self._file.flush()
+                    elif cmd == _CMD_TRUNCATE:
+                        carry = ""
+                        self._file.flush()
+                        self._file.seek(0)
+                        self._file.truncate()
+                    elif cmd == _CMD_CLOSE:
+                        if carry:
+                            self._file.write(carry)
+                        self._file.close()
+                        if arg:
+                            self._path.unlink()
+                except (OSError, ValueError) as e:
+                    _exception(e, f"spool command `{cmd}` failed")
+                if done is not None:
+                    done.set()
+                if cmd == _CMD_CLOSE:
+                    return
+            carry = self._write_chunks(chunks, carry)
+
+    def _copy_file(self, dest: Union[str, Path], future: Future, flush: bool = False):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            if flush:
+                self._file.flush()
+            with open(self._path, "rb") as src, open(dest, "wb") as dst:
+                shutil.copyfileobj(src, dst, self._copy_chunk_size)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+
+    def _write_chunks(self, chunks: list, carry: str) -> str:
+        if not chunks:
+            return carry
+        text, carry = split_incomplete(carry + "".join(chunks))
+        try:
+            self._file.write(ANSI_PATTERN.sub("", text))
+        except (OSError, ValueError) as e:
+            _exception(e, "failed to write to spool file")
+        return carry
@@ -1,4 +1,5 @@
 import re
+from concurrent.futures import Future
 from tkinter import (
     filedialog,
     Text,
@@ -11,11 +12,21 @@ from tkinter import (
     INSERT,
     messagebox,
 )
-from tkinter.ttk import Scrollbar, Frame
-from typing import Optional
+from tkinter.ttk import Scrollbar, Frame, Label, Button
+from pathlib import Path
+from typing import Optional, Union, Iterable, List, Tuple, Callable
 
 from pyguiadapterlite._messages import messages as msgs
 from pyguiadapterlite.components.common import get_default_widget_font
+from pyguiadapterlite.components.ansi import (
+    AnsiParser,
+    StyleTagCache,
+    ANSI_PATTERN,
+    SGR_PATTERN,
+)
+from pyguiadapterlite.components.linebuffer import LineBuffer
+from pyguiadapterlite.components.spool import OutputSpool
+from pyguiadapterlite.core.ucontext import UContext
 from pyguiadapterlite.utils import _warning
 
 
@@ -49,6 +60,14 @@ class TermView(Frame):
         font: tuple = get_default_widget_font(),
         default_context_menu=False,
         colormap: Optional[dict] = None,
+        scrollback_lines: int = 0,
+        scrollback_chars: int = 0,
+        show_truncation_notice: bool = True,
+        spool: bool = False,
+        spool_file: Union[str, Path, None] = None,
+        max_dynamic_tags: int = 256,
+        follow_tail: bool = True,
+        auto_scroll_interval: int = 16,
         **kwargs,
     ):
         super().__init__(parent, **kwargs)
@@ -60,6 +79,27 @@ class TermView(Frame):
         self._default_context_menu = default_context_menu
         self._colormap = colormap or self.colormap.copy()
 
+        # 回滚缓冲区上限，0表示不限制
+        self._scrollback_lines = max(0, scrollback_lines)
+        self._scrollback_chars = max(0, scrollback_chars)
+        self._show_truncation_notice = show_truncation_notice
+        # 当前控件中的字符数（不含ANSI转义序列）
+        self._char_count = 0
+        # 因超出回滚缓冲区上限而被丢弃的行数
+        self._dropped_lines = 0
+
+        # 与控件中的行一一对应的行索引，供搜索使用；只在第一次访问line_buffer（如创建搜索栏）时才创建，
+        # 未启用搜索时不会在控件之外重复保存一份输出
+        self._line_index: Optional[LineBuffer] = None
+        self._change_listeners: List[Callable[[], None]] = []
+        # 是否处于“只显示匹配行”的过滤模式
+        self._line_filter_active = False
+
+        # 完整输出的磁盘副本，控件中只显示其尾部
+        self._spool: Optional[OutputSpool] = None
+        if spool or spool_file:
+            self._spool = OutputSpool(spool_file)
+
         # 创建文本区域和滚动条
         self._text_widget = Text(
             self,
@@ -75,29 +115,53 @@ class TermView(Frame):
         v_scrollbar = Scrollbar(
             self, orient="vertical", command=self._text_widget.yview
         )
-        self._text_widget.configure(yscrollcommand=v_scrollbar.set)
+        self._v_scrollbar = v_scrollbar
+        self._text_widget.configure(yscrollcommand=self._on_yscroll)
 
         h_scrollbar = Scrollbar(
             self, orient="horizontal", command=self._text_widget.xview
         )
         self._text_widget.configure(xscrollcommand=h_scrollbar.set)
 
+        # 自动滚动：仅当视图位于底部时跟随新输出，且每帧最多滚动一次
+        self._follow_tail_enabled = follow_tail
+        self._following = True
+        self._auto_scroll_interval = max(1, auto_scroll_interval)
+        self._scroll_after_id: Optional[str] = None
+        # 用户离开底部后出现新输出时显示的“跳转到最新输出”按钮
+        self._jump_button = Button(
+            self, text=msgs().MSG_JUMP_TO_LATEST, command=self.scroll_to_bottom
+        )
+
+        # 截断提示，仅在有行被丢弃时显示
+        self._truncation_label = Label(self, text="", anchor="w")
+
         # 布局
-        self._text_widget.grid(row=0, column=0, sticky="nsew")
-        v_scrollbar.grid(row=0, column=1, sticky="ns")
-        h_scrollbar.grid(row=1, column=0, sticky="ew")
+        self._truncation_label.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self._truncation_label.grid_remove()
+        self._text_widget.grid(row=1, column=0, sticky="nsew")
+        v_scrollbar.grid(row=1, column=1, sticky="ns")
+        h_scrollbar.grid(row=2, column=0, sticky="ew")
 
-        self.grid_rowconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
 
         # ANSI转义序列处理
-        self.ansi_pattern = re.compile(r"\x1b\[([\d;]*)m")
-        self.current_fg = foreground
-        self.current_bg = background
-        self.current_style = "normal"
+        self._ansi_parser = AnsiParser()
+        self._style_tags = StyleTagCache(
+            self._text_widget,
+            colormap=self._colormap,
+            foreground=foreground,
+            background=background,
+            font=font,
+            max_dynamic_tags=max_dynamic_tags,
+        )
 
-        # 存储标签配置
-        self._tag_configs = {}
+        # 搜索相关的标签
+        self._text_widget.tag_config("filtered_out", elide=True)
+        self._text_widget.tag_config(
+            "search_match", background="#FFD54F", foreground="black"
+        )
 
         # 绑定事件
         self._text_widget.bind("<Key>", self._ignore_input)
@@ -111,9 +175,6 @@ class TermView(Frame):
             )  # Windows/Linux
             self._text_widget.bind("<Button-2>", self._show_context_menu)  # Mac
 
-        # 初始化标签
-        self._init_tags()
-
     def _create_context_menu(self):
         """创建右键上下文菜单"""
         self.context_menu = Menu(self._text_widget, tearoff=0)
@@ -169,20 +230,133 @@ class TermView(Frame):
 
     def scroll_to_top(self):
         """滚动到顶部"""
+        self._following = False
         self._text_widget.see("1.0")
 
     def scroll_to_bottom(self):
-        """滚动到底部"""
-        self._text_widget.see(END)
+        """滚动到底部，并恢复跟随最新输出"""
+        self._following = True
+        self._cancel_scheduled_scroll()
+        self._text_widget.yview_moveto(1.0)
+        self._jump_button.place_forget()
+
+    @property
+    def line_buffer(self) -> LineBuffer:
+        """
+        输出内容的行索引，行号与控件中的行对应（需减去first_line）。第一次访问时以控件中现有的文本创建。
+        索引中存放的是与控件相同的、已去除ANSI转义序列的文本，已被丢弃的行计入first_line。
+        """
+        if self._line_index is None:
+            self._line_index = LineBuffer(first_line=self._dropped_lines)
+            self._line_index.append(self._text_widget.get("1.0", "end-1c"))
+        return self._line_index
+
+    def add_change_listener(self, listener: Callable[[], None]):
+        """添加输出变化（写入、丢弃旧行或清空）时在主线程中调用的回调，如搜索栏的增量搜索"""
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[], None]):
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_change(self):
+        for listener in self._change_listeners:
+            listener()
+
+    def _text_line(self, index: int) -> int:
+        return index - self.line_buffer.first_line + 1
+
+    def goto_line(self, index: int):
+        """滚动到第index行（从0开始，包括已被丢弃的行）"""
+        line = self._text_line(index)
+        if line < 1:
+            return
+        self._following = False
+        self._cancel_scheduled_scroll()
+        self._text_widget.see(f"{line}.0")
+
+    def highlight_line(self, index: int, spans: List[Tuple[int, int]]):
+        """高亮第index行中的若干个范围（按去除ANSI转义序列后的列计算）"""
+        self.clear_highlight()
+        line = self._text_line(index)
+        if line < 1:
+            return
+        for start, stop in spans:
+            self._text_widget.tag_add(
+                "search_match", f"{line}.{start}", f"{line}.{stop}"
+            )
+        self._text_widget.tag_raise("search_match")
+
+    def clear_highlight(self):
+        self._text_widget.tag_remove("search_match", "1.0", END)
+
+    def set_line_filter(self, lines: Optional[Iterable[int]]):
+        """只显示指定的行，为None时取消过滤"""
+        if lines is None:
+            self._line_filter_active = False
+            self._text_widget.tag_remove("filtered_out", "1.0", END)
+            return
+        self._line_filter_active = True
+        self._text_widget.tag_add("filtered_out", "1.0", END)
+        self.extend_line_filter(lines)
+
+    def extend_line_filter(self, lines: Iterable[int]):
+        """在过滤模式下追加显示指定的行"""
+        if not self._line_filter_active:
+            return
+        for index in lines:
+            line = self._text_line(index)
+            if line >= 1:
+                self._text_widget.tag_remove(
+                    "filtered_out", f"{line}.0", f"{line + 1}.0"
+                )
+
+    @property
+    def is_following_tail(self) -> bool:
+        """视图当前是否跟随最新输出"""
+        return self._following
+
+    def _on_yscroll(self, first, last):
+        self._v_scrollbar.set(first, last)
+        # 自动滚动尚未执行时，视图离开底部是由新插入的文本造成的，不应视为用户滚动
+        if self._scroll_after_id is not None:
+            return
+        self._following = float(last) >= 1.0
+        if self._following:
+            self._jump_button.place_forget()
+
+    def _schedule_scroll(self):
+        if not self._follow_tail_enabled:
+            return
+        if not self._following:
+            self._jump_button.place(
+                in_=self._text_widget, relx=1.0, rely=1.0, x=-8, y=-8, anchor="se"
+            )
+            return
+        if self._scroll_after_id is None:
+            self._scroll_after_id = self.after(
+                self._auto_scroll_interval, self._do_scroll
+            )
+
+    def _do_scroll(self):
+        self._scroll_after_id = None
+        if self._following:
+            self._text_widget.yview_moveto(1.0)
+
+    def _cancel_scheduled_scroll(self):
+        if self._scroll_after_id is not None:
+            try:
+                self.after_cancel(self._scroll_after_id)
+            except TclError:
+                pass
+            self._scroll_after_id = None
 
     def save_to_file(self):
         """保存控制台内容到文件"""
 
         msgs_ = msgs()
 
-        # 获取所有文本（去除ANSI转义序列）
-        text_content = self._get_plain_text()
-
         # 选择保存文件
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
@@ -194,44 +368,77 @@ class TermView(Frame):
         )
 
         if file_path:
+            if self._spool:
+                # 由spool的后台线程分块复制磁盘上的完整输出，完成后在主线程中报告错误
+                future = self._spool.copy_to_async(file_path)
+                future.add_done_callback(
+                    lambda f: UContext.dispatch(self._on_spool_copied, f)
+                )
+                return
             try:
                 with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(text_content)
+                    file.write(self._get_plain_text())
             except Exception as e:
                 messagebox.showerror("错误", f"保存文件时出错: {str(e)}")
 
+    @staticmethod
+    def _on_spool_copied(future: Future):
+        e = future.exception()
+        if e is not None:
+            messagebox.showerror("错误", f"保存文件时出错: {str(e)}")
+
     def _get_plain_text(self):
         """获取纯文本内容（去除ANSI转义序列）"""
         text_content = self._text_widget.get("1.0", END)
         # 移除ANSI转义序列
-        clean_text = re.sub(r"\x1b\[[\d;]*m", "", text_content)
+        clean_text = ANSI_PATTERN.sub("", text_content)
         return clean_text
 
-    def _init_tags(self):
-        """初始化文本样式标签"""
-        # 前景色标签
-        for name, color in self._colormap.items():
-            tag_name = f"fg_{name}"
-            self._text_widget.tag_config(tag_name, foreground=color)
-            self._tag_configs[tag_name] = {"foreground": color}
-
-        # 背景色标签
-        for name, color in self._colormap.items():
-            tag_name = f"bg_{name}"
-            self._text_widget.tag_config(tag_name, background=color)
-            self._tag_configs[tag_name] = {"background": color}
-
-        # 样式标签
-        self._text_widget.tag_config(
-            "bold", font=(self._font[0], self._font[1], "bold")
-        )
-        self._text_widget.tag_config(
-            "italic", font=(self._font[0], self._font[1], "italic")
-        )
-        self._text_widget.tag_config("underline", underline=True)
-        self._tag_configs["bold"] = {"font": (self._font[0], self._font[1], "bold")}
-        self._tag_configs["italic"] = {"font": (self._font[0], self._font[1], "italic")}
-        self._tag_configs["underline"] = {"underline": True}
+    @property
+    def ansi_pattern(self) -> "re.Pattern":
+        """匹配SGR序列的正则表达式（只读，为兼容旧版本而保留，解析由AnsiParser完成）"""
+        return SGR_PATTERN
+
+    @property
+    def current_fg(self) -> str:
+        """当前的前景色（只读），即下一段输出将使用的颜色名称或"#rrggbb"形式的颜色值"""
+        fg, bg, _, _, _, reverse = self._ansi_parser.style
+        if reverse:
+            return bg or self._background
+        return fg or self._foreground
+
+    @property
+    def current_bg(self) -> str:
+        """当前的背景色（只读）"""
+        fg, bg, _, _, _, reverse = self._ansi_parser.style
+        if reverse:
+            return fg or self._foreground
+        return bg or self._background
+
+    @property
+    def current_style(self) -> str:
+        """当前的字体样式（只读）：bold、italic、underline或normal，同时设置多个样式时返回其中第一个"""
+        _, _, bold, italic, underline, _ = self._ansi_parser.style
+        if bold:
+            return "bold"
+        if italic:
+            return "italic"
+        if underline:
+            return "underline"
+        return "normal"
+
+    @property
+    def spool(self) -> Optional[OutputSpool]:
+        """完整输出的磁盘副本，未启用时为None"""
+        return self._spool
+
+    def destroy(self):
+        self._cancel_scheduled_scroll()
+        if self._spool:
+            # 正在进行的复制可能需要较长时间，不无限期地等待后台线程
+            self._spool.close(timeout=2.0)
+            self._spool = None
+        super().destroy()
 
     @staticmethod
     def _ignore_input(event):
@@ -241,144 +448,114 @@ class TermView(Frame):
 
     def _process_text(self, text):
         """处理文本和ANSI转义序列"""
-        # 简单的ANSI转义序列处理
-        parts = self.ansi_pattern.split(text)
-
-        # 如果没有ANSI序列，直接输出
-        if len(parts) == 1:
-            self._text_widget.insert(END, text)
-            self._text_widget.see(END)
-            return
-
-        # 处理包含ANSI序列的文本
-        i = 0
-        while i < len(parts):
-            if i % 2 == 0:
-                # 普通文本
-                if parts[i]:
-                    self._insert_with_current_style(parts[i])
-            else:
-                # ANSI序列
-                self._handle_ansi_sequence(parts[i])
-            i += 1
-
-        self._text_widget.see(END)
-
-    def _insert_with_current_style(self, text):
-        """使用当前样式插入文本"""
-        tags = []
-
-        # 添加前景色标签
-        if self.current_fg != self._foreground:
-            fg_tag = f"fg_{self.current_fg}"
-            if fg_tag in self._tag_configs:
-                tags.append(fg_tag)
-
-        # 添加背景色标签
-        if self.current_bg != self._background:
-            bg_tag = f"bg_{self.current_bg}"
-            if bg_tag in self._tag_configs:
-                tags.append(bg_tag)
-
-        # 添加样式标签
-        if self.current_style != "normal":
-            if self.current_style in self._tag_configs:
-                tags.append(self.current_style)
-
-        # 插入文本
+        if self._spool:
+            self._spool.write(text)
+        segments = self._ansi_parser.feed(text)
+        if self._line_index is not None:
+            # 与控件中的文本保持一致，只记录解析后的文本
+            self._line_index.append("".join(segment for segment, _ in segments))
+        start = self._text_widget.index("end-1c")
+        for segment, style in segments:
+            self._insert(segment, self._style_tags.tags_for(style))
+        if self._line_filter_active:
+            # 新输出默认隐藏，匹配的行由搜索结果重新显示
+            self._text_widget.tag_add("filtered_out", start, END)
+        self._trim_scrollback()
+        self._schedule_scroll()
+        self._notify_change()
+
+    def _insert(self, text, tags=None):
         if tags:
             self._text_widget.insert(END, text, tags)
         else:
             self._text_widget.insert(END, text)
+        self._char_count += len(text)
 
-    def _handle_ansi_sequence(self, sequence):
-        """处理ANSI转义序列"""
-        if not sequence:
-            # 重置所有属性
-            self.current_fg = self._foreground
-            self.current_bg = self._background
-            self.current_style = "normal"
+    def _trim_scrollback(self):
+        """按块删除超出回滚缓冲区上限的旧行，避免每次写入都触发删除"""
+        if not (self._scrollback_lines or self._scrollback_chars):
+            return
+        line_count = int(self._text_widget.index("end-1c").split(".")[0])
+        cut_line = 0
+
+        if self._scrollback_lines:
+            slack = self._scrollback_lines // 10 or 1
+            if line_count > self._scrollback_lines + slack:
+                cut_line = line_count - self._scrollback_lines
+
+        if self._scrollback_chars:
+            slack = self._scrollback_chars // 10 or 1
+            if self._char_count > self._scrollback_chars + slack:
+                excess = self._char_count - self._scrollback_chars
+                index = self._text_widget.index(f"1.0 + {excess} chars")
+                cut_line = max(cut_line, int(index.split(".")[0]))
+
+        # 至少保留最后一行
+        cut_line = min(cut_line, line_count - 1)
+        if cut_line <= 0:
+            return
+
+        cut_index = f"{cut_line + 1}.0"
+        deleted = self._text_widget.count("1.0", cut_index, "chars")
+        if isinstance(deleted, tuple):
+            deleted = deleted[0]
+        # 被删除文本上的标签范围会随文本一同被Tk移除，其余文本的标签保持不变
+        self._text_widget.delete("1.0", cut_index)
+        self._char_count = max(0, self._char_count - (deleted or 0))
+        self._dropped_lines += cut_line
+        if self._line_index is not None:
+            self._line_index.discard_before(self._line_index.first_line + cut_line)
+        self._update_truncation_notice()
+
+    def _update_truncation_notice(self):
+        if not self._show_truncation_notice:
+            return
+        if self._dropped_lines <= 0:
+            self._truncation_label.grid_remove()
             return
+        self._truncation_label.config(
+            text=msgs().MSG_OUTPUT_LINES_TRUNCATED.format(self._dropped_lines)
+        )
+        self._truncation_label.grid()
+
+    @property
+    def dropped_lines(self) -> int:
+        """因超出回滚缓冲区上限而被丢弃的行数"""
+        return self._dropped_lines
+
+    @property
+    def scrollback_lines(self) -> int:
+        return self._scrollback_lines
 
-        codes = sequence.split(";")
-        for code in codes:
-            if not code:
-                continue
-
-            c = int(code)
-
-            # 重置所有属性
-            if c == 0:
-                self.current_fg = self._foreground
-                self.current_bg = self._background
-                self.current_style = "normal"
-
-            # 样式设置
-            elif c == 1:
-                self.current_style = "bold"
-            elif c == 3:
-                self.current_style = "italic"
-            elif c == 4:
-                self.current_style = "underline"
-            elif c == 7:
-                # 反色 - 交换前景色和背景色
-                self.current_fg, self.current_bg = self.current_bg, self.current_fg
-
-            # 前景色
-            elif 30 <= c <= 37:
-                colors = [
-                    "black",
-                    "red",
-                    "green",
-                    "yellow",
-                    "blue",
-                    "magenta",
-                    "cyan",
-                    "white",
-                ]
-                self.current_fg = colors[c - 30]
-            elif 90 <= c <= 97:
-                colors = [
-                    "bright_black",
-                    "bright_red",
-                    "bright_green",
-                    "bright_yellow",
-                    "bright_blue",
-                    "bright_magenta",
-                    "bright_cyan",
-                    "bright_white",
-                ]
-                self.current_fg = colors[c - 90]
-
-            # 背景色
-            elif 40 <= c <= 47:
-                colors = [
-                    "black",
-                    "red",
-                    "green",
-                    "yellow",
-                    "blue",
-                    "magenta",
-                    "cyan",
-                    "white",
-                ]
-                self.current_bg = colors[c - 40]
-            elif 100 <= c <= 107:
-                colors = [
-                    "bright_black",
-                    "bright_red",
-                    "bright_green",
-                    "bright_yellow",
-                    "bright_blue",
-                    "bright_magenta",
-                    "bright_cyan",
-                    "bright_white",
-                ]
-                self.current_bg = colors[c - 100]
+    @property
+    def scrollback_chars(self) -> int:
+        return self._scrollback_chars
+
+    def set_scrollback_limit(
+        self, lines: Optional[int] = None, chars: Optional[int] = None
+    ):
+        """设置回滚缓冲区上限，0表示不限制"""
+        if lines is not None:
+            self._scrollback_lines = max(0, lines)
+        if chars is not None:
+            self._scrollback_chars = max(0, chars)
+        self._trim_scrollback()
+        self._notify_change()
 
     def clear(self):
         """清空控制台"""
         self._text_widget.delete(1.0, END)
+        self._ansi_parser.reset()
+        if self._line_index is not None:
+            self._line_index.clear()
+        self._following = True
+        self._jump_button.place_forget()
+        if self._spool:
+            self._spool.truncate()
+        self._char_count = 0
+        self._dropped_lines = 0
+        self._update_truncation_notice()
+        self._notify_change()
 
     def write(self, text):
         """向控制台输出文本，处理ANSI转义序列"""
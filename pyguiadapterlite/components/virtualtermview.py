@@ -0,0 +1,483 @@
+import re
+from tkinter import (
+    filedialog,
+    Text,
+    Menu,
+    SEL_FIRST,
+    SEL_LAST,
+    TclError,
+    SEL,
+    END,
+    messagebox,
+)
+from tkinter.font import Font
+from tkinter.ttk import Scrollbar, Frame, Button
+from array import array
+from bisect import bisect_left
+from typing import Optional, Dict, List, Tuple, Iterable, Callable
+
+from pyguiadapterlite._messages import messages as msgs
+from pyguiadapterlite.components.ansi import (
+    AnsiParser,
+    StyleTagCache,
+    StyleKey,
+    DEFAULT_STYLE,
+    ANSI_PATTERN,
+)
+from pyguiadapterlite.components.common import get_default_widget_font
+from pyguiadapterlite.components.linebuffer import LineBuffer
+from pyguiadapterlite.components.termview import TermView
+from pyguiadapterlite.utils import _warning
+
+# 在每个换行符之后切分，保留换行符
+_LINE_SPLIT = re.compile(r"(?<=\n)")
+
+
+class VirtualTermView(Frame):
+    """
+    虚拟化的模拟终端控件，适用于输出数百万行的场景。
+    所有输出保存在紧凑的LineBuffer中，Text控件只负责渲染当前可见的若干行，
+    滚动条由本控件根据可见区域在全部行中的位置自行计算。
+    """
+
+    colormap = TermView.colormap
+
+    def __init__(
+        self,
+        parent,
+        background: str = "black",
+        foreground: str = "white",
+        select_background: str = "lightgray",
+        font: tuple = get_default_widget_font(),
+        default_context_menu=False,
+        colormap: Optional[dict] = None,
+        max_dynamic_tags: int = 256,
+        follow_tail: bool = True,
+        render_interval: int = 16,
+        wheel_scroll_lines: int = 3,
+        **kwargs,
+    ):
+        super().__init__(parent, **kwargs)
+
+        self._background = background
+        self._foreground = foreground
+        self._font = font
+        self._default_context_menu = default_context_menu
+        self._colormap = colormap or self.colormap.copy()
+
+        self._buffer = LineBuffer()
+        self._change_listeners: List[Callable[[], None]] = []
+        # 起始样式不是默认样式的行：行号 -> 该行起始处的样式
+        self._line_styles: Dict[int, StyleKey] = {}
+        # 用于跟踪写入过程中的样式状态
+        self._write_parser = AnsiParser()
+        # 用于渲染可见行
+        self._render_parser = AnsiParser()
+
+        # 可见区域第一行的行号
+        self._top = 0
+        self._follow_tail_enabled = follow_tail
+        self._following = True
+        self._render_interval = max(1, render_interval)
+        self._render_after_id: Optional[str] = None
+        self._wheel_scroll_lines = max(1, wheel_scroll_lines)
+        # 过滤模式下只显示这些行（行号升序），为None时显示全部行
+        self._filter: Optional[array] = None
+        # 需要高亮的行及其中的匹配范围
+        self._highlight: Optional[Tuple[int, List[Tuple[int, int]]]] = None
+
+        self._text_widget = Text(
+            self,
+            bg=background,
+            fg=foreground,
+            font=font,
+            insertbackground=foreground,
+            selectbackground=select_background,
+            wrap="none",
+            tabs=("1c", "2c", "3c", "4c"),
+        )
+        self._linespace = max(1, Font(self, font=font).metrics("linespace"))
+
+        self._v_scrollbar = Scrollbar(
+            self, orient="vertical", command=self._on_scrollbar
+        )
+        h_scrollbar = Scrollbar(
+            self, orient="horizontal", command=self._text_widget.xview
+        )
+        self._text_widget.configure(xscrollcommand=h_scrollbar.set)
+
+        self._jump_button = Button(
+            self, text=msgs().MSG_JUMP_TO_LATEST, command=self.scroll_to_bottom
+        )
+
+        self._text_widget.grid(row=0, column=0, sticky="nsew")
+        self._v_scrollbar.grid(row=0, column=1, sticky="ns")
+        h_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._style_tags = StyleTagCache(
+            self._text_widget,
+            colormap=self._colormap,
+            foreground=foreground,
+            background=background,
+            font=font,
+            max_dynamic_tags=max_dynamic_tags,
+        )
+
+        self._text_widget.tag_config(
+            "search_match", background="#FFD54F", foreground="black"
+        )
+
+        # 绑定事件
+        self._text_widget.bind("<Configure>", lambda _: self._schedule_render())
+        self._text_widget.bind("<MouseWheel>", self._on_mouse_wheel)
+        self._text_widget.bind("<Button-4>", lambda _: self._scroll_by_lines(-1))
+        self._text_widget.bind("<Button-5>", lambda _: self._scroll_by_lines(1))
+        self._text_widget.bind("<Up>", lambda _: self._scroll_by(-1))
+        self._text_widget.bind("<Down>", lambda _: self._scroll_by(1))
+        self._text_widget.bind("<Prior>", lambda _: self._scroll_by_pages(-1))
+        self._text_widget.bind("<Next>", lambda _: self._scroll_by_pages(1))
+        self._text_widget.bind(
+            "<Control-Home>", lambda _: self._break(self.scroll_to_top)
+        )
+        self._text_widget.bind(
+            "<Control-End>", lambda _: self._break(self.scroll_to_bottom)
+        )
+        self._text_widget.bind("<Key>", self._ignore_input)
+
+        if self._default_context_menu:
+            self._create_context_menu()
+            self._text_widget.bind("<Button-3>", self._show_context_menu)
+            self._text_widget.bind("<Button-2>", self._show_context_menu)
+
+    @property
+    def line_buffer(self) -> LineBuffer:
+        return self._buffer
+
+    @property
+    def line_count(self) -> int:
+        return self._buffer.line_count
+
+    @property
+    def dropped_lines(self) -> int:
+        # 虚拟化视图保留全部输出，不会丢弃任何行
+        return 0
+
+    @property
+    def spool(self):
+        return None
+
+    @property
+    def is_following_tail(self) -> bool:
+        return self._following
+
+    def _create_context_menu(self):
+        """创建右键上下文菜单"""
+        self.context_menu = Menu(self._text_widget, tearoff=0)
+        msgs_ = msgs()
+        self.context_menu.add_command(
+            label=msgs_.MSG_COPY, command=self.copy_selected_text
+        )
+        self.context_menu.add_command(
+            label=msgs_.MSG_SELECT_ALL, command=self.select_all
+        )
+        self.context_menu.add_separator()
+        self.context_menu.add_command(label=msgs_.MSG_CLEAR_OUTPUT, command=self.clear)
+        self.context_menu.add_separator()
+        self.context_menu.add_command(
+            label=msgs_.MSG_SCROLL_TO_TOP, command=self.scroll_to_top
+        )
+        self.context_menu.add_command(
+            label=msgs_.MSG_SCROLL_TO_BOTTOM, command=self.scroll_to_bottom
+        )
+        self.context_menu.add_separator()
+        self.context_menu.add_command(
+            label=msgs_.MSG_SAVE_TO_FILE, command=self.save_to_file
+        )
+
+    def _show_context_menu(self, event):
+        """显示右键菜单"""
+        try:
+            self.context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            self.context_menu.grab_release()
+
+    def copy_selected_text(self, copy_to_clipboard=True) -> Optional[str]:
+        """复制选中的文本（仅限当前可见区域）"""
+        try:
+            selected_text = self._text_widget.get(SEL_FIRST, SEL_LAST)
+            if selected_text and copy_to_clipboard:
+                self.clipboard_clear()
+                self.clipboard_append(selected_text)
+            return selected_text
+        except TclError:
+            _warning("no text selected")
+            return None
+
+    def select_all(self):
+        """选中当前可见区域内的全部文本"""
+        self._text_widget.tag_add(SEL, "1.0", END)
+
+    def scroll_to_top(self):
+        """滚动到顶部"""
+        self._scroll_to(0)
+
+    def scroll_to_bottom(self):
+        """滚动到底部，并恢复跟随最新输出"""
+        self._scroll_to(self._max_top())
+
+    def goto_line(self, index: int):
+        """将第index行（从0开始）滚动到可见区域顶部"""
+        if self._filter is not None:
+            self._scroll_to(bisect_left(self._filter, index))
+        else:
+            self._scroll_to(index)
+
+    def highlight_line(self, index: int, spans: List[Tuple[int, int]]):
+        """高亮第index行中的若干个范围（按去除ANSI转义序列后的列计算）"""
+        self._highlight = (index, list(spans))
+        self._render()
+
+    def clear_highlight(self):
+        if self._highlight is not None:
+            self._highlight = None
+            self._schedule_render()
+
+    def set_line_filter(self, lines: Optional[Iterable[int]]):
+        """只显示指定的行（行号需升序排列），为None时取消过滤"""
+        self._filter = None if lines is None else array("Q", lines)
+        self._render()
+
+    def extend_line_filter(self, lines: Iterable[int]):
+        """向过滤结果中追加行（行号需大于已有的行号）"""
+        if self._filter is None:
+            return
+        self._filter.extend(lines)
+        self._schedule_render()
+
+    def save_to_file(self):
+        """将全部输出（去除ANSI转义序列）保存到文件"""
+        msgs_ = msgs()
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[
+                (msgs_.MSG_FILE_FILTER_TEXT, "*.txt"),
+                (msgs_.MSG_FILE_FILTER_ALL, "*.*"),
+            ],
+            title=msgs_.MSG_SAVE_TO_FILE,
+        )
+        if not file_path:
+            return
+        try:
+            self.save_to(file_path)
+        except Exception as e:
+            messagebox.showerror("错误", f"保存文件时出错: {str(e)}")
+
+    def save_to(self, file_path: str, batch_lines: int = 10000):
+        """按批次将全部输出写入文件，避免一次性构造完整的文本副本"""
+        total = self._buffer.line_count
+        with open(file_path, "w", encoding="utf-8") as file:
+            for start in range(0, total, batch_lines):
+                lines = self._buffer.get_lines(start, start + batch_lines)
+                text = "\n".join(lines)
+                if start + batch_lines < total:
+                    text += "\n"
+                file.write(ANSI_PATTERN.sub("", text))
+
+    @staticmethod
+    def _ignore_input(event):
+        """忽略用户输入"""
+        _ = event
+        return "break"
+
+    @staticmethod
+    def _break(func):
+        func()
+        return "break"
+
+    def write(self, text: str):
+        """向控制台输出文本，处理ANSI转义序列"""
+        if not text:
+            return
+        parser = self._write_parser
+        if (
+            "\x1b" not in text
+            and parser.style == DEFAULT_STYLE
+            and not parser.has_pending
+        ):
+            # 快速路径：不含转义序列且当前为默认样式，无需逐行记录起始样式
+            self._buffer.append(text)
+        else:
+            line_index = self._buffer.open_line_index
+            # 只按换行符切分，\r等其他控制字符留在行内交给解析器处理
+            for piece in _LINE_SPLIT.split(text):
+                if not piece:
+                    continue
+                parser.feed(piece)
+                self._buffer.append(piece)
+                if piece.endswith("\n"):
+                    line_index += 1
+                    if parser.style != DEFAULT_STYLE:
+                        self._line_styles[line_index] = parser.style
+        self._schedule_render()
+        self._notify_change()
+
+    def write_line(self, text: str):
+        """输出一行文本"""
+        self.write(text + "\n")
+
+    def write_after(self, text: str):
+        self.after(0, self.write, text)
+
+    def write_line_after(self, text: str):
+        self.write_after(text + "\n")
+
+    def set_text(self, text: str):
+        """设置控制台文本"""
+        self.clear()
+        self.write(text)
+
+    def set_text_after(self, text: str):
+        self.clear()
+        self.write_after(text)
+
+    def get_text(self) -> str:
+        """获取全部输出文本"""
+        return "\n".join(self._buffer.iter_lines())
+
+    def clear(self):
+        """清空控制台"""
+        self._buffer.clear()
+        self._line_styles.clear()
+        if self._filter is not None:
+            self._filter = array("Q")
+        self._highlight = None
+        self._write_parser.reset()
+        self._top = 0
+        self._following = True
+        self._jump_button.place_forget()
+        self._render()
+        self._notify_change()
+
+    def add_change_listener(self, listener: Callable[[], None]):
+        """添加输出变化（写入、丢弃旧行或清空）时在主线程中调用的回调，如搜索栏的增量搜索"""
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[], None]):
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_change(self):
+        for listener in self._change_listeners:
+            listener()
+
+    def destroy(self):
+        if self._render_after_id is not None:
+            try:
+                self.after_cancel(self._render_after_id)
+            except TclError:
+                pass
+            self._render_after_id = None
+        super().destroy()
+
+    def _visible_line_count(self) -> int:
+        return max(1, self._text_widget.winfo_height() // self._linespace)
+
+    def _max_top(self) -> int:
+        return max(0, self._row_count() - self._visible_line_count())
+
+    def _row_count(self) -> int:
+        """可显示的行数，过滤模式下为匹配的行数"""
+        if self._filter is not None:
+            return len(self._filter)
+        return self._buffer.line_count
+
+    def _scroll_to(self, top: int):
+        max_top = self._max_top()
+        self._top = min(max(0, int(top)), max_top)
+        self._following = self._top >= max_top
+        if self._following:
+            self._jump_button.place_forget()
+        self._render()
+
+    def _scroll_by(self, lines: int):
+        self._scroll_to(self._top + lines)
+        return "break"
+
+    def _scroll_by_lines(self, steps: int):
+        return self._scroll_by(steps * self._wheel_scroll_lines)
+
+    def _scroll_by_pages(self, pages: int):
+        return self._scroll_by(pages * self._visible_line_count())
+
+    def _on_mouse_wheel(self, event):
+        # Windows下delta为120的倍数，macOS下为较小的整数
+        steps = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        return self._scroll_by_lines(steps)
+
+    def _on_scrollbar(self, *args):
+        total = self._row_count()
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                self._scroll_by_pages(amount)
+            else:
+                self._scroll_by(amount)
+
+    def _schedule_render(self):
+        if self._render_after_id is None:
+            self._render_after_id = self.after(self._render_interval, self._render)
+
+    def _render(self):
+        """仅将可见的若干行渲染到Text控件中"""
+        if self._render_after_id is not None:
+            try:
+                self.after_cancel(self._render_after_id)
+            except TclError:
+                pass
+            self._render_after_id = None
+
+        total = self._row_count()
+        visible = self._visible_line_count()
+        max_top = max(0, total - visible)
+        if self._following and self._follow_tail_enabled:
+            self._top = max_top
+        elif self._top < max_top:
+            self._jump_button.place(
+                in_=self._text_widget, relx=1.0, rely=1.0, x=-8, y=-8, anchor="se"
+            )
+        self._top = min(self._top, max_top)
+
+        text_widget = self._text_widget
+        text_widget.delete("1.0", END)
+        parser = self._render_parser
+        end = min(self._top + visible, total)
+        line_filter = self._filter
+        for row in range(self._top, end):
+            index = line_filter[row] if line_filter is not None else row
+            parser.reset()
+            parser.set_style(self._line_styles.get(index, DEFAULT_STYLE))
+            for segment, style in parser.feed(self._buffer.get_line(index)):
+                tags = self._style_tags.tags_for(style)
+                if tags:
+                    text_widget.insert(END, segment, tags)
+                else:
+                    text_widget.insert(END, segment)
+            if self._highlight is not None and self._highlight[0] == index:
+                text_line = row - self._top + 1
+                for start, stop in self._highlight[1]:
+                    text_widget.tag_add(
+                        "search_match", f"{text_line}.{start}", f"{text_line}.{stop}"
+                    )
+                text_widget.tag_raise("search_match")
+            if row + 1 < end:
+                text_widget.insert(END, "\n")
+
+        if total <= 0:
+            self._v_scrollbar.set(0.0, 1.0)
+        else:
+            self._v_scrollbar.set(self._top / total, end / total)
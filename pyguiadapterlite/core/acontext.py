@@ -0,0 +1,79 @@
+"""
+context中各函数的可等待（awaitable）版本，供async def函数使用。
+不会阻塞调用线程的函数（如uprint()、进度条相关函数）直接调用；
+对话框等需要等待用户操作的函数直接等待其*_async版本返回的Future，不阻塞事件循环，也不占用线程；
+其余需要等待结果的函数（如run_subprocess()）将在线程池中执行。
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Future
+from typing import Any, Callable, Awaitable
+
+from pyguiadapterlite.core import context
+from pyguiadapterlite.core.workerpool import default_worker_pool
+
+
+def _awaitable(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(func)
+    async def _wrapper(*args, **kwargs):
+        future = default_worker_pool().submit(func, *args, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    return _wrapper
+
+
+def _future_awaitable(
+    async_func: Callable[..., Future],
+) -> Callable[..., Awaitable[Any]]:
+    # 等待*_async版本返回的Future，等待期间不占用线程池中的线程
+    @functools.wraps(async_func)
+    async def _wrapper(*args, **kwargs):
+        return await asyncio.wrap_future(async_func(*args, **kwargs))
+
+    return _wrapper
+
+
+def _immediate(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(func)
+    async def _wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return _wrapper
+
+
+auprint = _immediate(context.uprint)
+ais_cancel_requested = _immediate(context.is_cancel_requested)
+ashow_progressbar = _immediate(context.show_progressbar)
+ahide_progressbar = _immediate(context.hide_progressbar)
+astart_progressbar = _immediate(context.start_progressbar)
+aupdate_progressbar = _immediate(context.update_progressbar)
+astop_progressbar = _immediate(context.stop_progressbar)
+aopen_progress_task = _immediate(context.open_progress_task)
+ashow_toast = _immediate(context.show_toast)
+
+ais_progressbar_enabled = _awaitable(context.is_progressbar_enabled)
+ais_progress_label_enabled = _awaitable(context.is_progress_label_enabled)
+arun_subprocess = _awaitable(context.run_subprocess)
+ashow_info_messagebox = _future_awaitable(context.show_info_messagebox_async)
+ashow_warning_messagebox = _future_awaitable(context.show_warning_messagebox_async)
+ashow_critical_messagebox = _future_awaitable(context.show_critical_messagebox_async)
+ashow_error_messagebox = ashow_critical_messagebox
+ashow_question_messagebox = _future_awaitable(context.show_question_messagebox_async)
+ashow_ok_cancel_messagebox = _future_awaitable(context.show_ok_cancel_messagebox_async)
+ashow_retry_cancel_messagebox = _future_awaitable(
+    context.show_retry_cancel_messagebox_async
+)
+ashow_yes_no_cancel_messagebox = _future_awaitable(
+    context.show_yes_no_cancel_messagebox_async
+)
+ashow_yes_no_messagebox = _future_awaitable(context.show_yes_no_messagebox_async)
+aget_string_input = _future_awaitable(context.get_string_input_async)
+aget_string_input2 = _future_awaitable(context.get_string_input2_async)
+aget_int_input = _future_awaitable(context.get_int_input_async)
+aget_float_input = _future_awaitable(context.get_float_input_async)
+aget_path_input = _future_awaitable(context.get_path_input_async)
+aget_file_path_input = _future_awaitable(context.get_file_path_input_async)
+aget_dir_path_input = _future_awaitable(context.get_dir_path_input_async)
+aget_text_input = _future_awaitable(context.get_text_input_async)
+ashow_custom_dialog = _future_awaitable(context.show_custom_dialog_async)
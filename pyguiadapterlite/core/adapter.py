@@ -2,7 +2,7 @@ import dataclasses
 from collections import OrderedDict
 from dataclasses import replace
 from tkinter import Tk
-from typing import Callable, Optional, Dict, Union, Tuple, Type, List, Any
+from typing import Callable, Optional, Dict, Union, Tuple, Type, List, Any, Iterable
 
 from pyguiadapterlite.components.menus import Menu, Separator
 from pyguiadapterlite.components.valuewidget import (
@@ -10,6 +10,9 @@ from pyguiadapterlite.components.valuewidget import (
     BaseParameterWidget,
     is_parameter_widget_class,
 )
+from pyguiadapterlite.core.batch import BatchRunner, BatchItemResult, uses_processes
+from pyguiadapterlite.core.cache import ResultCache, function_identity
+from pyguiadapterlite.core.fingerprint import path_parameter_names
 from pyguiadapterlite.core.fn import FnInfo, ParameterInfo, BaseFunctionExecutor
 from pyguiadapterlite.core.fnparser import FnParser, UNSET
 from pyguiadapterlite.core.paramgroup import ParametersGroupBase, group_name_hash
@@ -57,6 +60,9 @@ class GUIAdapter(object):
         ] = None,
         capture_system_exit_exception: bool = True,
         function_executor_class: Type[BaseFunctionExecutor] = ThreadedExecutor,
+        cache: Union[bool, ResultCache, None] = None,
+        timeout: Optional[float] = None,
+        hard_timeout: Optional[float] = None,
         ignore_self_parameter: bool = True,
         enable_progressbar: bool = False,
         enable_progress_label: bool = False,
@@ -121,6 +127,9 @@ class GUIAdapter(object):
             capture_system_exit_exception=capture_system_exit_exception,
             window_config=window_config,
             executor=function_executor_class,
+            cache=self._create_cache(cache),
+            timeout=self._check_timeout(timeout),
+            hard_timeout=self._check_timeout(hard_timeout),
             parameters_validator=parameters_validator,
             parameter_infos=params,
             before_execute_callback=before_execute_callback,
@@ -162,6 +171,9 @@ class GUIAdapter(object):
         ] = None,
         capture_system_exit_exception: bool = True,
         function_executor_class: Type[BaseFunctionExecutor] = ThreadedExecutor,
+        cache: Union[bool, ResultCache, None] = None,
+        timeout: Optional[float] = None,
+        hard_timeout: Optional[float] = None,
         enable_progressbar: bool = False,
         enable_progress_label: bool = False,
         before_execute_callback: Optional[
@@ -232,6 +244,9 @@ class GUIAdapter(object):
             capture_system_exit_exception=capture_system_exit_exception,
             window_config=window_config,
             executor=function_executor_class,
+            cache=self._create_cache(cache),
+            timeout=self._check_timeout(timeout),
+            hard_timeout=self._check_timeout(hard_timeout),
             parameters_validator=parameters_validator,
             parameter_infos=parameter_infos.copy(),
             before_execute_callback=before_execute_callback,
@@ -254,6 +269,9 @@ class GUIAdapter(object):
         ] = None,
         capture_system_exit_exception: bool = True,
         function_executor_class: Type[BaseFunctionExecutor] = ThreadedExecutor,
+        cache: Union[bool, ResultCache, None] = None,
+        timeout: Optional[float] = None,
+        hard_timeout: Optional[float] = None,
         enable_progressbar: bool = False,
         enable_progress_label: bool = False,
         before_execute_callback: Optional[
@@ -357,6 +375,9 @@ class GUIAdapter(object):
             capture_system_exit_exception=capture_system_exit_exception,
             window_config=window_config,
             executor=function_executor_class,
+            cache=self._create_cache(cache),
+            timeout=self._check_timeout(timeout),
+            hard_timeout=self._check_timeout(hard_timeout),
             parameters_validator=parameters_validator,
             parameter_infos=parameter_infos.copy(),
             before_execute_callback=before_execute_callback,
@@ -372,6 +393,49 @@ class GUIAdapter(object):
     def exists(self, fn: Callable) -> bool:
         return fn in self._functions
 
+    def run_batch(
+        self,
+        fn: Callable,
+        items: Iterable[Dict[str, Any]],
+        *,
+        max_workers: int = 4,
+        use_processes: Optional[bool] = None,
+        mp_context: Optional[str] = None,
+        on_item_finished: Optional[Callable[[BatchItemResult], None]] = None,
+    ) -> List[BatchItemResult]:
+        """
+        不显示窗口，使用多组参数批量执行一个已添加的函数，阻塞直到所有项执行结束，返回各项的结果。
+        每组参数中未给出的参数将使用其控件配置中的默认值。函数中uprint()的输出将被打印到标准输出。
+        use_processes为None时，若函数的执行器为ProcessExecutor则在工作进程中执行；函数的timeout和hard_timeout对每一项分别生效。
+        """
+        fn_info = self._functions.get(fn, None)
+        if fn_info is None:
+            raise ValueError(f"function not added: {fn}")
+        defaults = {}
+        if not fn_info.parameters_grouped:
+            defaults = {
+                name: config.default_value
+                for name, config in fn_info.parameter_configs.items()
+            }
+        runner = BatchRunner(
+            fn,
+            ({**defaults, **item} for item in items),
+            max_workers=max_workers,
+            use_processes=(
+                uses_processes(fn_info.executor)
+                if use_processes is None
+                else use_processes
+            ),
+            mp_context=mp_context,
+            cache=fn_info.cache,
+            cache_name=function_identity(fn_info.fn),
+            cache_path_parameters=path_parameter_names(fn_info),
+            on_item_finished=on_item_finished,
+            timeout=fn_info.timeout,
+            hard_timeout=fn_info.hard_timeout,
+        )
+        return runner.run()
+
     # 这个方法会启动一个mainloop，这意味着这是一个阻塞方法
     # 该方法将一直阻塞到根窗口关闭
     def run(
@@ -430,6 +494,22 @@ class GUIAdapter(object):
         )
         self._execute_window.move_to_center()
 
+    @staticmethod
+    def _check_timeout(timeout: Optional[float]) -> Optional[float]:
+        # timeout：软超时，到期后请求取消（is_cancel_requested()返回True），由函数自行退出；
+        # hard_timeout：硬超时，到期后放弃执行函数的线程或终止工作进程，并以ExecutionTimeoutError报告执行结束
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"timeout must be positive: {timeout}")
+        return timeout
+
+    @staticmethod
+    def _create_cache(cache: Union[bool, ResultCache, None]) -> Optional[ResultCache]:
+        if cache is True:
+            return ResultCache()
+        if isinstance(cache, ResultCache):
+            return cache
+        return None
+
     def _merge_widget_configs(
         self,
         parameters: Dict[str, ParameterInfo],
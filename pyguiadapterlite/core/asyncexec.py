@@ -0,0 +1,271 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import inspect
+import threading
+from functools import partial
+from typing import Dict, Any, Optional, Coroutine
+
+from pyguiadapterlite.core.fn import BaseFunctionExecutor, FnInfo, ExecuteStateListener
+from pyguiadapterlite.core.stdcapture import StdCapture
+from pyguiadapterlite.core.streaming import consume_generator, consume_async_generator
+from pyguiadapterlite.core.threaded import ThreadRunningException
+from pyguiadapterlite.core.ucontext import UContext, RunContext
+from pyguiadapterlite.core.watchdog import WatchHandle, ExecutionTimeoutError
+from pyguiadapterlite.utils import _exception
+
+
+async def _run_in_thread(func, *args, **kwargs) -> Any:
+    # 与asyncio.to_thread()（Python 3.9+）相同：在事件循环的默认线程池中执行func，并传递当前的contextvars上下文
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(None, partial(ctx.run, func, *args, **kwargs))
+
+
+class EventLoopThread(object):
+    """在后台线程中运行的长期存在的asyncio事件循环"""
+
+    def __init__(self, name: str = "AsyncioExecutorLoop"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取事件循环，第一次访问时启动后台线程"""
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(ready,), name=self._name, daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """在事件循环中调度协程，可在任意线程中调用"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        with self._lock:
+            loop = self._loop
+            self._loop = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def _run(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+
+_default_loop_thread: Optional[EventLoopThread] = None
+_default_loop_thread_lock = threading.Lock()
+
+
+def default_loop_thread() -> EventLoopThread:
+    """所有AsyncioExecutor共享的事件循环线程"""
+    global _default_loop_thread
+    with _default_loop_thread_lock:
+        if _default_loop_thread is None:
+            _default_loop_thread = EventLoopThread()
+        return _default_loop_thread
+
+
+class AsyncioExecutor(BaseFunctionExecutor):
+    """
+    在后台asyncio事件循环中执行目标函数，适用于IO密集型的async def函数，
+    多次执行共享同一个事件循环，无需为每次执行创建线程。
+    取消时除了设置取消标志外，还会调用Task.cancel()。普通函数将在事件循环的默认线程池中执行。
+    """
+
+    def __init__(
+        self,
+        listener: Optional[ExecuteStateListener] = None,
+        loop_thread: Optional[EventLoopThread] = None,
+    ):
+        super().__init__(listener)
+        self._loop_thread = loop_thread or default_loop_thread()
+        self._is_executing = False
+        self._cancel_event = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._current_run: Optional[RunContext] = None
+        self._unfinished_run: Optional[RunContext] = None
+        self._watch: Optional[WatchHandle] = None
+        self._state_lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop_thread.loop
+
+    def execute(self, fn_info: FnInfo, arguments: Optional[Dict[str, Any]] = None):
+        with self._state_lock:
+            if self._is_executing:
+                raise ThreadRunningException("a function is already executing")
+            self._is_executing = True
+            self._cancel_event = threading.Event()
+
+        if not UContext.app_instance():
+            raise RuntimeError("tkinter is not initialized yet")
+
+        arguments = (arguments or {}).copy()
+        run = self.create_run_context(fn_info, arguments, self._cancel_event)
+        self._current_run = run
+        self._unfinished_run = run
+        if self._listener:
+            self._listener.before_execute(fn_info, arguments)
+
+        self._watch = self.watch_timeouts(
+            fn_info, run, partial(self._on_hard_timeout, fn_info, arguments, run)
+        )
+        self._loop_thread.submit(self._run(fn_info, arguments, run))
+
+    @property
+    def current_run(self) -> Optional[RunContext]:
+        return self._current_run
+
+    @property
+    def is_cancelled(self) -> bool:
+        with self._state_lock:
+            if not self._is_executing:
+                return False
+            return self._cancel_event.is_set()
+
+    @property
+    def is_executing(self) -> bool:
+        with self._state_lock:
+            return self._is_executing
+
+    def try_cancel(self):
+        with self._state_lock:
+            if not self._is_executing or self._cancel_event.is_set():
+                return
+            self._cancel_event.set()
+            task = self._task
+        if task is not None:
+            self.loop.call_soon_threadsafe(task.cancel)
+
+    async def _run(self, fn_info: FnInfo, arguments: Dict[str, Any], run: RunContext):
+        # 注意该方法在事件循环线程中执行
+        task = asyncio.current_task()
+        with self._state_lock:
+            if self._unfinished_run is run:
+                self._task = task
+            cancelled = run.cancel_event.is_set()
+        if cancelled:
+            # 在调度之前已请求取消
+            task.cancel()
+
+        # 每个Task拥有独立的contextvars上下文，在其中绑定的执行上下文会传递给函数创建的子任务，
+        # 以及在事件循环的默认线程池中执行的函数
+        UContext.bind_run(run)
+        self._on_start(fn_info, arguments)
+        try:
+            with self._output_capture(fn_info, run):
+                result = await self._call(fn_info, arguments, run)
+            self._on_finish(fn_info, arguments, result, None, run)
+        except asyncio.CancelledError as e:
+            self._on_finish(fn_info, arguments, None, e, run)
+        except SystemExit as e:
+            _exception(e, "SystemExit caught in asyncio executor")
+            if fn_info.capture_system_exit_exception:
+                self._on_finish(fn_info, arguments, None, e, run)
+            else:
+                tk_instance = UContext.app_instance()
+                if tk_instance:
+                    UContext.dispatch(tk_instance.quit)
+        except BaseException as e:
+            self._on_finish(fn_info, arguments, None, e, run)
+
+    async def _call(
+        self, fn_info: FnInfo, arguments: Dict[str, Any], run: RunContext
+    ) -> Any:
+        fn = fn_info.fn
+        if inspect.iscoroutinefunction(fn):
+            result = await fn(**arguments)
+        elif inspect.isasyncgenfunction(fn):
+            result = fn(**arguments)
+        else:
+            # 普通函数在线程中执行，避免阻塞事件循环
+            result = await _run_in_thread(fn, **arguments)
+            if inspect.isawaitable(result):
+                result = await result
+        if inspect.isasyncgen(result):
+            stream = self.create_result_stream(fn_info, run)
+            return await consume_async_generator(result, stream, run.cancel_event)
+        if inspect.isgenerator(result):
+            # 普通生成器同样在线程中消费
+            stream = self.create_result_stream(fn_info, run)
+            return await _run_in_thread(
+                consume_generator, result, stream, run.cancel_event
+            )
+        return result
+
+    @staticmethod
+    def _output_capture(fn_info: FnInfo, run: RunContext):
+        # 捕获按contextvars上下文路由，只对本次执行的Task（及其在线程池中执行的普通函数）生效，
+        # 共享事件循环线程的其他执行不受影响
+        if not getattr(fn_info.window_config, "capture_output", False):
+            return contextlib.nullcontext()
+        channel = run.output
+        if channel is None:
+            return contextlib.nullcontext()
+        return StdCapture(channel.write)
+
+    def _on_hard_timeout(
+        self, fn_info: FnInfo, arguments: Dict[str, Any], run: RunContext
+    ):
+        # 注意该方法在监视线程中被调用。取消Task并立即报告超时，
+        # 在事件循环的默认线程池中执行的普通函数所在的线程将被放弃
+        run.cancel_event.set()
+        with self._state_lock:
+            task = self._task if self._unfinished_run is run else None
+        # 先报告超时，Task被取消后产生的CancelledError将被忽略
+        error = ExecutionTimeoutError(fn_info.hard_timeout)
+        self._on_finish(fn_info, arguments, None, error, run)
+        if task is not None:
+            self.loop.call_soon_threadsafe(task.cancel)
+
+    def _on_finish(
+        self,
+        fn_info: FnInfo,
+        arguments: Dict[str, Any],
+        return_value: Any,
+        exception: Optional[BaseException],
+        run: RunContext,
+    ):
+        with self._state_lock:
+            if self._unfinished_run is not run:
+                # 本次执行已经报告过结束（例如已因硬超时被放弃）
+                return
+            self._unfinished_run = None
+            watch, self._watch = self._watch, None
+        if watch is not None:
+            watch.cancel()
+
+        def _callback():
+            with self._state_lock:
+                self._is_executing = False
+                self._task = None
+                self._current_run = None
+            if self._listener:
+                self._listener.on_execute_finish(
+                    fn_info, arguments, return_value, exception
+                )
+
+        UContext.dispatch(_callback)
+
+    def _on_start(self, fn_info: FnInfo, arguments: Dict[str, Any]):
+        if self._listener:
+            UContext.dispatch(self._listener.on_execute_start, fn_info, arguments)
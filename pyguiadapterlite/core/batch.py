@@ -0,0 +1,470 @@
+import concurrent.futures
+import dataclasses
+import inspect
+import itertools
+import threading
+import time
+from functools import partial
+from typing import (
+    Callable,
+    Iterable,
+    Dict,
+    Any,
+    Optional,
+    List,
+    Literal,
+    Tuple,
+    Sequence,
+    Type,
+)
+
+from pyguiadapterlite.core.asyncexec import default_loop_thread
+from pyguiadapterlite.core.cache import ResultCache, function_identity
+from pyguiadapterlite.core.fn import BaseFunctionExecutor
+from pyguiadapterlite.core.process import ProcessWorkerPool, ProcessExecutor
+from pyguiadapterlite.core.stdcapture import StdCapture
+from pyguiadapterlite.core.streaming import (
+    ResultStream,
+    is_result_stream,
+    consume_generator,
+    consume_async_generator,
+)
+from pyguiadapterlite.core.ucontext import UContext, RunContext
+from pyguiadapterlite.core.watchdog import (
+    WatchHandle,
+    ExecutionTimeoutError,
+    default_watchdog,
+)
+from pyguiadapterlite.core.workerpool import WorkerPool
+from pyguiadapterlite.utils import _exception
+
+BatchItemState = Literal["pending", "running", "done", "failed", "cancelled"]
+
+
+class BatchCancelledError(Exception):
+    """批量执行中的某一项在开始执行前被取消"""
+
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchItemResult(object):
+    index: int
+    """该项在批量执行中的序号（从0开始）"""
+
+    arguments: Dict[str, Any]
+    """该项的参数"""
+
+    state: BatchItemState
+    """该项的状态"""
+
+    return_value: Any = None
+    """函数的返回值"""
+
+    exception: Optional[BaseException] = None
+    """函数抛出的异常，未抛出异常时为None"""
+
+    duration: float = 0.0
+    """执行耗时（秒）"""
+
+    @property
+    def ok(self) -> bool:
+        return self.state == "done"
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchProgress(object):
+    total: int
+    """总项数"""
+
+    finished: int
+    """已结束的项数（包括成功、失败和取消的项）"""
+
+    failed: int
+    """失败的项数"""
+
+    cancelled: int
+    """被取消的项数"""
+
+    running: int
+    """正在执行的项数"""
+
+    elapsed: float
+    """批量执行开始以来经过的时间（秒）"""
+
+    eta: Optional[float]
+    """预计剩余时间（秒），根据已完成项的平均吞吐量估算，尚无法估算时为None"""
+
+    @property
+    def succeeded(self) -> int:
+        return self.finished - self.failed - self.cancelled
+
+    @property
+    def percent(self) -> float:
+        if self.total <= 0:
+            return 100.0
+        return self.finished * 100.0 / self.total
+
+
+def parameter_grid(**axes: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    生成参数网格（笛卡尔积），例如：
+    parameter_grid(path=["a.txt", "b.txt"], threshold=[0.1, 0.5, 0.9])将得到6组参数。
+    """
+    names = list(axes.keys())
+    values = [list(v) for v in axes.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def uses_processes(executor: Optional[Type[BaseFunctionExecutor]]) -> bool:
+    """函数配置的执行器是否在工作进程中执行函数，此时批量执行同样应使用工作进程"""
+    return isinstance(executor, type) and issubclass(executor, ProcessExecutor)
+
+
+class _BatchItem(object):
+    __slots__ = (
+        "index",
+        "arguments",
+        "state",
+        "cancel_event",
+        "started_at",
+        "result",
+        "future",
+        "async_future",
+        "watch",
+    )
+
+    def __init__(self, index: int, arguments: Dict[str, Any]):
+        self.index = index
+        self.arguments = arguments
+        self.state: BatchItemState = "pending"
+        self.cancel_event = threading.Event()
+        self.started_at: Optional[float] = None
+        self.result: Optional[BatchItemResult] = None
+        # 线程池中执行该项的任务
+        self.future: Optional[concurrent.futures.Future] = None
+        # 在共享事件循环中执行的协程（async def函数或异步生成器）
+        self.async_future: Optional[concurrent.futures.Future] = None
+        self.watch: Optional[WatchHandle] = None
+
+
+class BatchRunner(object):
+    """
+    使用多组参数批量执行同一个函数。
+    各项在有上限的线程池（或工作进程池，use_processes=True）中并行执行，每一项拥有独立的执行上下文和取消标志，
+    因此函数中可以使用uprint()、is_cancel_requested()等函数。某一项失败或被取消不会影响其他项。
+    async def函数和异步生成器函数在AsyncioExecutor共享的事件循环中执行。
+    timeout和hard_timeout与单次执行时的含义相同，对每一项分别计时：软超时到期时请求取消该项，
+    硬超时到期时该项以ExecutionTimeoutError失败，执行它的线程被放弃（工作进程将被终止），其余项继续执行。
+    on_item_start和on_item_finished回调在执行该项的线程中被调用，需要更新界面时应自行切换到主线程。
+    cache_name为缓存键中的函数标识，默认为function_identity(fn)；cache_path_parameters为文件、目录类型的参数名称，启用缓存时这些参数按文件内容计算缓存键。
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        items: Iterable[Dict[str, Any]],
+        max_workers: int = 4,
+        use_processes: bool = False,
+        mp_context: Optional[str] = None,
+        window: Any = None,
+        output_channel: Any = None,
+        capture_output: bool = False,
+        cache: Optional[ResultCache] = None,
+        cache_name: Optional[str] = None,
+        cache_path_parameters: Sequence[str] = (),
+        on_item_start: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+        on_item_finished: Optional[Callable[[BatchItemResult], None]] = None,
+        timeout: Optional[float] = None,
+        hard_timeout: Optional[float] = None,
+    ):
+        self._fn = fn
+        self._items = [_BatchItem(i, dict(args)) for i, args in enumerate(items)]
+        self._max_workers = max(1, max_workers)
+        self._use_processes = use_processes
+        self._mp_context = mp_context
+        self._window = window
+        self._output_channel = output_channel
+        self._capture_output = capture_output
+        self._cache = cache
+        self._cache_name = cache_name or function_identity(fn)
+        self._cache_path_parameters = tuple(cache_path_parameters)
+        self._on_item_start = on_item_start
+        self._on_item_finished = on_item_finished
+        self._timeout = timeout
+        self._hard_timeout = hard_timeout
+
+        self._lock = threading.Lock()
+        self._all_done = threading.Event()
+        self._cancelled = False
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._finished = 0
+        self._failed = 0
+        self._cancelled_items = 0
+        self._running = 0
+        self._pool: Optional[WorkerPool] = None
+        self._process_pool: Optional[ProcessWorkerPool] = None
+
+    @property
+    def total(self) -> int:
+        return len(self._items)
+
+    @property
+    def is_running(self) -> bool:
+        return self._started_at is not None and not self._all_done.is_set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def start(self) -> "BatchRunner":
+        """开始批量执行，立即返回"""
+        if self._started_at is not None:
+            raise RuntimeError("batch has already been started")
+        self._started_at = time.monotonic()
+        if not self._items:
+            self._finish()
+            return self
+        workers = min(self._max_workers, len(self._items))
+        self._pool = WorkerPool(max_workers=workers, min_workers=0, name="BatchWorker")
+        if self._use_processes:
+            self._process_pool = ProcessWorkerPool(
+                max_idle=workers, mp_context=self._mp_context
+            )
+        for item in self._items:
+            item.future = self._pool.submit(self._run_item, item)
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> List[BatchItemResult]:
+        """等待所有项执行结束，返回各项的结果"""
+        if not self._all_done.wait(timeout):
+            raise TimeoutError("batch is still running")
+        return [item.result for item in self._items]
+
+    def run(self) -> List[BatchItemResult]:
+        """开始批量执行并等待其结束"""
+        return self.start().wait()
+
+    def cancel(self):
+        """取消整个批量执行：尚未开始的项将被跳过，正在执行的项将收到取消请求"""
+        with self._lock:
+            self._cancelled = True
+            items = list(self._items)
+        for item in items:
+            self._cancel(item)
+
+    def cancel_item(self, index: int):
+        """取消其中一项"""
+        if 0 <= index < len(self._items):
+            self._cancel(self._items[index])
+
+    def item_state(self, index: int) -> BatchItemState:
+        return self._items[index].state
+
+    def results(self) -> List[Optional[BatchItemResult]]:
+        """各项当前的结果，尚未结束的项为None"""
+        return [item.result for item in self._items]
+
+    def progress(self) -> BatchProgress:
+        with self._lock:
+            finished = self._finished
+            failed = self._failed
+            cancelled = self._cancelled_items
+            running = self._running
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+        remaining = len(self._items) - finished
+        eta: Optional[float] = None
+        if remaining == 0:
+            eta = 0.0
+        elif finished > 0 and elapsed > 0:
+            eta = remaining * elapsed / finished
+        return BatchProgress(
+            total=len(self._items),
+            finished=finished,
+            failed=failed,
+            cancelled=cancelled,
+            running=running,
+            elapsed=elapsed,
+            eta=eta,
+        )
+
+    def _run_item(self, item: _BatchItem):
+        # 注意该方法在线程池中执行
+        if item.cancel_event.is_set():
+            self._item_finished(
+                item, "cancelled", None, BatchCancelledError("item was cancelled")
+            )
+            return
+        cache_key, hit, cached_value = self._lookup_cache(item)
+        if hit:
+            self._item_finished(item, "done", cached_value, None)
+            return
+        with self._lock:
+            item.state = "running"
+            item.started_at = time.monotonic()
+            self._running += 1
+        if self._on_item_start is not None:
+            self._call_callback(self._on_item_start, item.index, item.arguments)
+
+        run = RunContext(
+            run_id=UContext.next_run_id(),
+            window=self._window,
+            cancel_event=item.cancel_event,
+            output_channel=self._output_channel,
+        )
+        if self._timeout is not None or self._hard_timeout is not None:
+            item.watch = default_watchdog().watch(
+                self._timeout,
+                self._hard_timeout,
+                on_soft=item.cancel_event.set,
+                on_hard=partial(self._on_hard_timeout, item),
+                name=f"{getattr(self._fn, '__name__', 'batch')}[{item.index}]#{run.run_id}",
+            )
+        try:
+            with UContext.run_bound(run):
+                return_value = self._call(item, run)
+        except BaseException as e:
+            state = "cancelled" if item.cancel_event.is_set() else "failed"
+            self._item_finished(item, state, None, e)
+        else:
+            # 函数响应取消请求而提前返回时，该项同样视为被取消
+            state = "cancelled" if item.cancel_event.is_set() else "done"
+            if state == "done" and cache_key is not None:
+                self._cache.put(cache_key, return_value)
+            self._item_finished(item, state, return_value, None)
+
+    def _lookup_cache(self, item: _BatchItem) -> Tuple[Optional[str], bool, Any]:
+        if self._cache is None:
+            return None, False, None
+        try:
+            key = self._cache.make_key(
+                self._cache_name, item.arguments, self._cache_path_parameters
+            )
+        except BaseException as e:
+            _exception(e, "failed to compute cache key, cache will be bypassed")
+            return None, False, None
+        hit, value = self._cache.lookup(key)
+        return key, hit, value
+
+    def _cancel(self, item: _BatchItem):
+        item.cancel_event.set()
+        future = item.async_future
+        if future is not None:
+            # 与AsyncioExecutor相同，同时取消事件循环中的Task
+            future.cancel()
+
+    def _on_hard_timeout(self, item: _BatchItem):
+        # 注意该方法在监视线程中被调用。与单次执行相同：立即报告超时，放弃执行该项的线程，
+        # 线程池随即启动新的线程执行其余的项；该项之后产生的结果将被忽略
+        self._cancel(item)
+        self._item_finished(
+            item, "failed", None, ExecutionTimeoutError(self._hard_timeout)
+        )
+        if item.future is not None and self._pool is not None:
+            self._pool.abandon(item.future)
+
+    def _call(self, item: _BatchItem, run: RunContext) -> Any:
+        if self._process_pool is not None:
+            output = run.output
+            return self._process_pool.call(
+                self._fn,
+                item.arguments,
+                cancel_event=item.cancel_event,
+                on_output=output.write if output is not None else None,
+                capture_output=self._capture_output,
+                run_id=run.run_id,
+            )
+        if self._capture_output and run.output is not None:
+            with StdCapture(run.output.write):
+                return self._consume(item, self._fn(**item.arguments), run)
+        return self._consume(item, self._fn(**item.arguments), run)
+
+    def _consume(self, item: _BatchItem, value: Any, run: RunContext) -> Any:
+        # async def函数的协程在共享的事件循环中执行，生成器函数的结果被收集为列表（或生成器的返回值）
+        if inspect.isawaitable(value):
+            value = self._await(item, value)
+        if not is_result_stream(value):
+            return value
+        stream = ResultStream()
+        if inspect.isasyncgen(value):
+            return self._await(
+                item, consume_async_generator(value, stream, run.cancel_event)
+            )
+        return consume_generator(value, stream, run.cancel_event)
+
+    @staticmethod
+    def _await(item: _BatchItem, awaitable: Any) -> Any:
+        # 在当前线程中等待事件循环中的协程结束。协程在调度时复制当前的contextvars上下文，因此可以访问该项的执行上下文
+        loop_thread = default_loop_thread()
+        if loop_thread.in_loop_thread():
+            raise RuntimeError("cannot wait for a coroutine in the event loop thread")
+
+        async def _run():
+            return await awaitable
+
+        future = loop_thread.submit(_run())
+        item.async_future = future
+        if item.cancel_event.is_set():
+            future.cancel()
+        try:
+            return future.result()
+        finally:
+            item.async_future = None
+
+    def _item_finished(
+        self,
+        item: _BatchItem,
+        state: BatchItemState,
+        return_value: Any,
+        exception: Optional[BaseException],
+    ):
+        watch, item.watch = item.watch, None
+        if watch is not None:
+            watch.cancel()
+        now = time.monotonic()
+        duration = now - item.started_at if item.started_at is not None else 0.0
+        result = BatchItemResult(
+            index=item.index,
+            arguments=item.arguments,
+            state=state,
+            return_value=return_value,
+            exception=exception,
+            duration=duration,
+        )
+        with self._lock:
+            if item.result is not None:
+                # 该项已经报告过结束（例如已因硬超时被放弃）
+                return
+            if item.state == "running":
+                self._running -= 1
+            item.state = state
+            item.result = result
+            self._finished += 1
+            if state == "failed":
+                self._failed += 1
+            elif state == "cancelled":
+                self._cancelled_items += 1
+            all_done = self._finished == len(self._items)
+        if self._on_item_finished is not None:
+            self._call_callback(self._on_item_finished, result)
+        if all_done:
+            self._finish()
+
+    def _finish(self):
+        self._finished_at = time.monotonic()
+        if self._pool is not None:
+            self._pool.shutdown()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+        self._all_done.set()
+
+    @staticmethod
+    def _call_callback(callback: Callable[..., Any], *args):
+        try:
+            callback(*args)
+        except BaseException as e:
+            _exception(e, "exception raised in batch callback")
@@ -0,0 +1,391 @@
+import dataclasses
+import enum
+import hashlib
+import os
+import pickle
+import threading
+import types
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path, PurePath
+from typing import Any, Dict, Optional, Tuple, Union, Callable, Sequence
+
+from pyguiadapterlite.core.fingerprint import FileFingerprinter, default_fingerprinter
+from pyguiadapterlite.core.workerpool import WorkerPool
+from pyguiadapterlite.utils import _exception, _warning
+
+_MISSING = object()
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats(object):
+    hits: int
+    """命中次数（包括从磁盘命中的次数）"""
+
+    disk_hits: int
+    """从磁盘命中的次数"""
+
+    misses: int
+    """未命中次数"""
+
+    evictions: int
+    """被淘汰的条目数（内存和磁盘）"""
+
+    entries: int
+    """内存中的条目数"""
+
+    size: int
+    """内存中条目的总大小（字节，按pickle后的大小估算）"""
+
+    disk_entries: int
+    """磁盘上的条目数"""
+
+    disk_size: int
+    """磁盘上条目的总大小（字节）"""
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_value(value: Any) -> Any:
+    """
+    将参数值转换为与对象标识、字典顺序等无关的规范形式，使得相等的参数得到相同的缓存键。
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, enum.Enum):
+        return ("enum", type(value).__qualname__, value.name)
+    if isinstance(value, PurePath):
+        return ("path", value.as_posix())
+    if isinstance(value, dict):
+        items = [(normalize_value(k), normalize_value(v)) for k, v in value.items()]
+        return ("dict", tuple(sorted(items, key=repr)))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(normalize_value(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted((normalize_value(v) for v in value), key=repr)))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+        return ("dataclass", type(value).__qualname__, normalize_value(fields))
+    if hasattr(value, "__dict__"):
+        # 例如参数分组（ParametersGroupBase）的实例
+        return ("object", type(value).__qualname__, normalize_value(vars(value)))
+    return ("repr", type(value).__qualname__, repr(value))
+
+
+def _code_digest(code: types.CodeType, h) -> None:
+    # 代码对象的repr中包含内存地址，嵌套的代码对象（如内部函数、lambda）需要递归处理
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_digest(const, h)
+        elif isinstance(const, frozenset):
+            # 集合的顺序与字符串的哈希种子有关，每次启动都可能不同
+            h.update(repr(sorted(repr(v) for v in const)).encode("utf-8"))
+        else:
+            h.update(repr(const).encode("utf-8"))
+
+
+def function_identity(fn: Callable[..., Any]) -> str:
+    """
+    函数的标识：模块名、限定名以及函数代码的摘要，用作缓存键的一部分。
+    不同模块中的同名函数不会共享缓存，函数的代码被修改后，持久化的旧结果也不会被误命中。
+    """
+    target = getattr(fn, "__func__", fn)
+    module = getattr(target, "__module__", None) or type(target).__module__
+    qualname = getattr(target, "__qualname__", None) or type(target).__qualname__
+    identity = f"{module}.{qualname}"
+    code = getattr(target, "__code__", None)
+    if isinstance(code, types.CodeType):
+        h = hashlib.sha256()
+        _code_digest(code, h)
+        identity += f":{h.hexdigest()[:16]}"
+    return identity
+
+
+def make_cache_key(fn_name: str, arguments: Dict[str, Any]) -> str:
+    normalized = (fn_name, normalize_value(arguments))
+    return hashlib.sha256(repr(normalized).encode("utf-8")).hexdigest()
+
+
+class ResultCache(object):
+    """
+    函数返回值的缓存，键为函数的标识（参见function_identity()）和规范化后的参数的哈希值。
+    内存中的条目按LRU顺序淘汰，条目数超过max_entries或总大小超过max_size（字节）时淘汰最久未使用的条目，0表示不限制。
+    指定persist_dir时，条目同时以pickle文件的形式保存在该目录中，重启后仍可命中；磁盘上的条目总大小超过max_disk_size时按最后访问时间淘汰。
+    不能被pickle的返回值只保存在内存中。只有指定了persist_dir或max_size时，返回值才会被pickle（用于保存或估算大小），
+    此时应通过put_async()在后台线程中写入，以免较大的返回值阻塞界面。
+    content_keys为True时，文件、目录类型的参数按其规范化的路径和内容（而非只按路径字符串）计算缓存键，文件内容改变后缓存不会被误命中；
+    内容摘要由fingerprinter计算，未指定时使用共享的default_fingerprinter()。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_size: int = 0,
+        persist_dir: Union[str, Path, None] = None,
+        max_disk_size: int = 0,
+        key_func: Optional[Callable[[str, Dict[str, Any]], str]] = None,
+        content_keys: bool = True,
+        fingerprinter: Optional[FileFingerprinter] = None,
+    ):
+        self._max_entries = max(0, max_entries)
+        self._max_size = max(0, max_size)
+        self._max_disk_size = max(0, max_disk_size)
+        self._key_func = key_func or make_cache_key
+        self._content_keys = content_keys
+        self._fingerprinter = fingerprinter
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._persist_dir: Optional[Path] = None
+        # 磁盘上的条目：键 -> 文件大小，按最后访问时间排列
+        self._disk_entries: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+        if persist_dir is not None:
+            self._persist_dir = Path(persist_dir)
+            self._load_disk_index()
+
+    @property
+    def persist_dir(self) -> Optional[Path]:
+        return self._persist_dir
+
+    @property
+    def fingerprinter(self) -> FileFingerprinter:
+        if self._fingerprinter is None:
+            self._fingerprinter = default_fingerprinter()
+        return self._fingerprinter
+
+    def make_key(
+        self,
+        fn_name: str,
+        arguments: Dict[str, Any],
+        path_parameters: Sequence[str] = (),
+    ) -> str:
+        """
+        计算缓存键。path_parameters为其值是文件、目录路径（或路径列表）的参数名称，
+        这些参数的值在计算缓存键前被替换为文件或目录的规范化路径和内容摘要，因此该方法可能需要读取文件，不应在主线程中调用。
+        """
+        if self._content_keys and path_parameters:
+            arguments = self.fingerprinter.fingerprint_arguments(
+                arguments, path_parameters
+            )
+        return self._key_func(fn_name, arguments)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """查找缓存，返回(是否命中, 缓存的值)，并更新命中和未命中的统计"""
+        value = self._lookup(key)
+        if value is _MISSING:
+            return False, None
+        return True, value
+
+    @property
+    def needs_serialization(self) -> bool:
+        """写入条目时是否需要pickle返回值（保存到磁盘或按大小淘汰）"""
+        return self._persist_dir is not None or self._max_size > 0
+
+    def put(self, key: str, value: Any):
+        data = None
+        if self.needs_serialization:
+            try:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                _warning(
+                    f"result is not picklable and will only be cached in memory: {e}"
+                )
+        size = len(data) if data is not None else 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            self._evict_memory()
+        if data is not None and self._persist_dir is not None:
+            self._write_disk(key, data)
+
+    def put_async(self, key: str, value: Any) -> Future:
+        """
+        写入条目。需要pickle返回值时在后台线程中写入，否则直接写入，返回写入完成的Future。
+        """
+        if not self.needs_serialization:
+            future = Future()
+            try:
+                self.put(key, value)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+            return future
+        return _writer_pool().submit(self.put, key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            disk_keys = list(self._disk_entries.keys())
+            self._disk_entries.clear()
+            self._disk_size = 0
+        for key in disk_keys:
+            self._remove_file(key)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size=self._size,
+                disk_entries=len(self._disk_entries),
+                disk_size=self._disk_size,
+            )
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries or key in self._disk_entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            on_disk = key in self._disk_entries
+            if not on_disk:
+                self._misses += 1
+                return _MISSING
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is _MISSING:
+                self._misses += 1
+                return _MISSING
+            self._hits += 1
+            self._disk_hits += 1
+            size = self._disk_entries.get(key, 0)
+            if key in self._disk_entries:
+                self._disk_entries.move_to_end(key)
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._size += size
+                self._evict_memory()
+        return value
+
+    def _evict_memory(self):
+        # 调用时必须已持有self._lock
+        while self._entries and (
+            (self._max_entries and len(self._entries) > self._max_entries)
+            or (self._max_size and self._size > self._max_size)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+            self._evictions += 1
+
+    def _file_path(self, key: str) -> Path:
+        return self._persist_dir / f"{key}.pkl"
+
+    def _load_disk_index(self):
+        try:
+            self._persist_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (entry for entry in os.scandir(self._persist_dir) if entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime,
+            )
+        except OSError as e:
+            _exception(e, "failed to load result cache directory")
+            self._persist_dir = None
+            return
+        for entry in files:
+            if not entry.name.endswith(".pkl"):
+                continue
+            size = entry.stat().st_size
+            self._disk_entries[entry.name[:-4]] = size
+            self._disk_size += size
+
+    def _read_disk(self, key: str) -> Any:
+        path = self._file_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            # 更新访问时间，供重启后按最后访问时间排序
+            os.utime(path)
+            return value
+        except Exception as e:
+            _exception(e, f"failed to read cached result: {path}")
+            with self._lock:
+                size = self._disk_entries.pop(key, None)
+                if size is not None:
+                    self._disk_size -= size
+            return _MISSING
+
+    def _write_disk(self, key: str, data: bytes):
+        path = self._file_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            _exception(e, f"failed to write cached result: {path}")
+            return
+        with self._lock:
+            old = self._disk_entries.pop(key, None)
+            if old is not None:
+                self._disk_size -= old
+            self._disk_entries[key] = len(data)
+            self._disk_size += len(data)
+            evicted = []
+            while self._max_disk_size and self._disk_size > self._max_disk_size:
+                if len(self._disk_entries) <= 1:
+                    break
+                old_key, old_size = self._disk_entries.popitem(last=False)
+                self._disk_size -= old_size
+                self._evictions += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._remove_file(old_key)
+
+    def _remove_file(self, key: str):
+        if self._persist_dir is None:
+            return
+        try:
+            self._file_path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            _exception(e, "failed to remove cached result")
+
+
+_default_writer_pool: Optional[WorkerPool] = None
+_default_writer_pool_lock = threading.Lock()
+
+
+def _writer_pool() -> WorkerPool:
+    # 所有缓存共享的写入线程，只有一个线程，因此同一个缓存的写入按提交的顺序进行
+    global _default_writer_pool
+    with _default_writer_pool_lock:
+        if _default_writer_pool is None:
+            _default_writer_pool = WorkerPool(
+                max_workers=1, min_workers=0, name="ResultCacheWriter"
+            )
+        return _default_writer_pool
@@ -1,6 +1,11 @@
-from concurrent.futures import Future
+import codecs
+import locale
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from tkinter import messagebox, simpledialog
-from typing import Any, Callable, Literal, Optional, Type, Tuple, List
+from typing import Any, Callable, Literal, Optional, Type, Tuple, List, Union, Sequence
 
 from pyguiadapterlite._messages import messages as msgs
 from pyguiadapterlite.components import toast
@@ -11,61 +16,204 @@ from pyguiadapterlite.components.dialog import (
     PathInputDialog,
     TextViewDialog,
 )
+from pyguiadapterlite.core.outputchannel import OutputChannelStats
+from pyguiadapterlite.core.progresschannel import ProgressChannel, ProgressStats
+from pyguiadapterlite.core.progresstasks import (
+    ProgressTask,
+    ProgressTaskBoard,
+    current_task,
+)
 from pyguiadapterlite.core.ucontext import UContext
+from pyguiadapterlite.utils import _warning
 from pyguiadapterlite.windows.fnexecwindow import FnExecuteWindow
 
 
 def is_cancel_requested() -> bool:
-    if UContext.current_cancel_event() is not None:
-        return UContext.current_cancel_event().is_set()
+    cancel_event = UContext.current_cancel_event()
+    if cancel_event is not None:
+        return cancel_event.is_set()
     return False
 
 
-def uprint(*messages: Any, sep=" ", end="\n"):
-    exec_window = UContext.current_execute_window()
-    if not exec_window:
-        print(*messages, sep=sep, end=end)
-        return
+def current_run_id() -> Optional[int]:
+    """当前执行的编号，不在函数执行期间调用时返回None"""
+    run = UContext.current_run()
+    return run.run_id if run is not None else None
+
+
+def copy_run_context(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    返回func的包装函数，无论在哪个线程中调用，它都将在当前执行上下文中执行func，
+    因此func中的uprint()、is_cancel_requested()等函数会作用于当前这次执行。
+    适用于将任务提交给自行创建的线程池等场景。
+    """
+    return UContext.run_context_wrapper(func)
+
+
+def spawn_thread(
+    target: Callable[..., Any],
+    *args: Any,
+    name: Optional[str] = None,
+    daemon: Optional[bool] = None,
+    **kwargs: Any,
+) -> threading.Thread:
+    """创建并启动一个继承当前执行上下文的线程"""
+    thread = threading.Thread(
+        target=copy_run_context(target),
+        args=args,
+        kwargs=kwargs,
+        name=name,
+        daemon=daemon,
+    )
+    thread.start()
+    return thread
 
-    if len(messages) == 0:
-        exec_window.output_view.write_after(end)
-        return
 
-    if len(messages) == 1:
-        exec_window.output_view.write_after(f"{messages[0]}{end}")
+def uprint(*messages: Any, sep=" ", end="\n"):
+    channel = UContext.current_output_channel()
+    if channel is None:
+        print(*messages, sep=sep, end=end)
         return
+    # 输出内容先进入当前执行的输出缓冲通道，由主线程定期批量刷新到输出控件中
+    channel.write(sep.join(str(m) for m in messages) + end)
 
-    def do_print_many():
-        for message in messages:
-            exec_window.output_view.write(f"{message}{sep}")
-        if end:
-            exec_window.output_view.write(end)
 
-    exec_window.parent.after(0, do_print_many)
+def get_output_stats() -> OutputChannelStats:
+    channel = UContext.current_output_channel()
+    if channel is None:
+        raise RuntimeError("fn execute_window is not set")
+    return channel.stats()
+
+
+def run_subprocess(
+    cmd: Union[str, Sequence[str]],
+    *,
+    cwd: Optional[str] = None,
+    env: Optional[dict] = None,
+    shell: bool = False,
+    encoding: Optional[str] = None,
+    errors: str = "replace",
+    stderr_color: Optional[str] = "\033[91m",
+    max_pending_chars: int = 1024 * 1024,
+    poll_interval: float = 0.1,
+    terminate_timeout: float = 3.0,
+) -> int:
+    """
+    启动子进程，并将其stdout、stderr的输出实时显示在当前函数执行窗口的输出区域中，返回子进程的退出码。
+    当输出区域积压的内容超过max_pending_chars时，读取子进程输出的线程将暂停读取，直到积压内容被刷新。
+    当函数被请求取消时，子进程将被终止，若在terminate_timeout秒内未退出，则将被强制结束。
+    子进程退出后，最多再等待terminate_timeout秒以读取剩余的输出（子进程派生的进程可能仍持有输出管道）。
+    """
+    channel = UContext.current_output_channel()
+    encoding = encoding or locale.getpreferredencoding(False)
+
+    def _write(text: str):
+        if channel is None:
+            print(text, end="", flush=True)
+            return
+        channel.wait_for_capacity(max_pending_chars)
+        channel.write(text)
+
+    def _pump(stream, color: Optional[str]):
+        decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        # 上一块末尾的"\r"，它可能与下一块开头的"\n"组成"\r\n"，因此留到下一块一起处理
+        carry = ""
+        try:
+            while True:
+                data = stream.read1(64 * 1024)
+                text = carry + decoder.decode(data, final=not data)
+                carry = ""
+                if data and text.endswith("\r"):
+                    text, carry = text[:-1], "\r"
+                if text:
+                    text = text.replace("\r\n", "\n")
+                    _write(f"{color}{text}\033[0m" if color else text)
+                if not data:
+                    break
+        finally:
+            stream.close()
+
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        shell=shell,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stdout, None), daemon=True),
+        threading.Thread(target=_pump, args=(proc.stderr, stderr_color), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    cancelled = False
+    while True:
+        try:
+            proc.wait(timeout=poll_interval)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+        if is_cancel_requested():
+            cancelled = True
+            _warning(f"cancel requested, terminating subprocess(pid={proc.pid})")
+            proc.terminate()
+            try:
+                proc.wait(timeout=terminate_timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+            break
+
+    # 子进程退出后，其派生的进程可能仍持有管道，因此只等待读取线程terminate_timeout秒，不再无限期等待
+    deadline = time.monotonic() + terminate_timeout
+    for reader in readers:
+        reader.join(max(0.0, deadline - time.monotonic()))
+    if any(reader.is_alive() for reader in readers):
+        _warning(
+            f"output pipes of subprocess(pid={proc.pid}) are still open"
+            f"{' after cancellation' if cancelled else ''}, stop waiting for them"
+        )
+    return proc.returncode
 
 
 def _call_func(
     func: Callable[[FnExecuteWindow, list, dict], Any],
     window: FnExecuteWindow,
-    future: Future,
     *args,
     **kwargs,
 ):
-    try:
-        future.set_result(func(window, *args, **kwargs))
-    except Exception as e:
-        future.set_exception(e)
+    return func(window, *args, **kwargs)
 
 
-def _run_ui_on_thread(
+def _ui_request(
     func: Callable[[FnExecuteWindow, list, dict], Any], *args, **kwargs
-) -> Any:
+) -> Future:
+    # 在主线程中以当前窗口为参数调用func，返回其结果的Future
     exec_window = UContext.current_execute_window()
     if not exec_window:
         raise RuntimeError("fn execute_window is not set")
-    future = Future()
-    exec_window.parent.after(0, _call_func, func, exec_window, future, args, kwargs)
-    return future.result()
+    return UContext.dispatch_call(_call_func, func, exec_window, args, kwargs)
+
+
+def _wait_ui_request(future: Future, timeout: Optional[float] = None) -> Any:
+    """
+    等待界面请求的结果。超过timeout秒时抛出TimeoutError：若对话框等尚未显示，则不会再显示；
+    若已经显示，则其结果将被丢弃。窗口关闭或主循环退出时，尚未执行的请求被取消，抛出CancelledError。
+    """
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+
+def _run_ui_on_thread(
+    func: Callable[[FnExecuteWindow, list, dict], Any], *args, **kwargs
+) -> Any:
+    return _wait_ui_request(_ui_request(func, *args, **kwargs))
 
 
 def is_progressbar_enabled() -> bool:
@@ -84,18 +232,31 @@ def is_progress_label_enabled() -> bool:
     return _run_ui_on_thread(_func)
 
 
+def _progress_channel(exec_window) -> Optional[ProgressChannel]:
+    # 工作进程中的窗口代理对象没有进度通道
+    return getattr(exec_window, "progress_channel", None)
+
+
 def show_progressbar():
     exec_window = UContext.current_execute_window()
     if not exec_window:
         raise RuntimeError("fn execute_window is not set")
-    exec_window.parent.after(0, exec_window.show_progressbar)
+    channel = _progress_channel(exec_window)
+    if channel is not None:
+        channel.post(exec_window.show_progressbar)
+        return
+    UContext.dispatch(exec_window.show_progressbar)
 
 
 def hide_progressbar():
     exec_window = UContext.current_execute_window()
     if not exec_window:
         raise RuntimeError("fn execute_window is not set")
-    exec_window.parent.after(0, exec_window.hide_progressbar)
+    channel = _progress_channel(exec_window)
+    if channel is not None:
+        channel.post(exec_window.hide_progressbar)
+        return
+    UContext.dispatch(exec_window.hide_progressbar)
 
 
 def start_progressbar(
@@ -107,8 +268,12 @@ def start_progressbar(
     exec_window = UContext.current_execute_window()
     if not exec_window:
         raise RuntimeError("fn execute_window is not set")
-    exec_window.parent.after(
-        0, exec_window.start_progressbar, total, mode, initial_value, initial_msg
+    channel = _progress_channel(exec_window)
+    if channel is not None:
+        channel.start_progressbar(total, mode, initial_value, initial_msg)
+        return
+    UContext.dispatch(
+        exec_window.start_progressbar, total, mode, initial_value, initial_msg
     )
 
 
@@ -116,14 +281,62 @@ def update_progressbar(value: int, msg: Optional[str] = None):
     exec_window = UContext.current_execute_window()
     if not exec_window:
         raise RuntimeError("fn execute_window is not set")
-    exec_window.parent.after(0, exec_window.update_progressbar, value, msg)
+    channel = _progress_channel(exec_window)
+    if channel is not None:
+        # 只记录最新的进度，由主线程在每个刷新周期内最多更新一次进度条
+        channel.update(value, msg)
+        return
+    UContext.dispatch(exec_window.update_progressbar, value, msg)
 
 
 def stop_progressbar(hide_after_stop: bool = True):
     exec_window = UContext.current_execute_window()
     if not exec_window:
         raise RuntimeError("fn execute_window is not set")
-    exec_window.parent.after(0, exec_window.stop_progressbar, hide_after_stop)
+    channel = _progress_channel(exec_window)
+    if channel is not None:
+        channel.stop_progressbar(hide_after_stop)
+        return
+    UContext.dispatch(exec_window.stop_progressbar, hide_after_stop)
+
+
+def get_progress_stats() -> Optional[ProgressStats]:
+    """当前窗口的进度值、速率和预计剩余时间，未启用进度条时返回None"""
+    exec_window = UContext.current_execute_window()
+    if not exec_window:
+        raise RuntimeError("fn execute_window is not set")
+    channel = _progress_channel(exec_window)
+    return channel.stats() if channel is not None else None
+
+
+def open_progress_task(
+    name: str,
+    total: float = 0,
+    msg: Optional[str] = None,
+    parent: Optional[ProgressTask] = None,
+) -> ProgressTask:
+    """
+    创建一个具名的进度任务，它将显示在执行窗口的多任务进度面板中（需启用`enable_progress_tasks`）。
+    parent为None时，若当前处于另一个任务的with语句中，则新任务成为该任务的子任务。
+    返回的任务可在任意线程中更新，更新将被合并，每个刷新周期最多刷新一次面板。
+    """
+    parent = parent or current_task()
+    if parent is not None and not parent.is_finished:
+        return parent.subtask(name, total, msg)
+    exec_window = UContext.current_execute_window()
+    if not exec_window:
+        raise RuntimeError("fn execute_window is not set")
+    board = getattr(exec_window, "progress_tasks", None)
+    if board is None:
+        _warning("progress tasks not enabled, progress will not be displayed")
+        # 未启用时返回一个不显示的任务，函数无需区分两种情况
+        board = ProgressTaskBoard()
+    return board.open(name, total, msg=msg, run_id=current_run_id())
+
+
+def current_progress_task() -> Optional[ProgressTask]:
+    """当前上下文中通过with语句进入的最内层进度任务"""
+    return current_task()
 
 
 def show_toast(
@@ -155,12 +368,12 @@ def show_toast(
             alpha=alpha,
         )
 
-    exec_window.parent.after(0, _show_toast, exec_window)
+    UContext.dispatch(_show_toast, exec_window)
 
 
-def show_info_messagebox(
+def show_info_messagebox_async(
     message: str, title: Optional[str] = None, **messagebox_kwargs
-) -> str:
+) -> "Future[str]":
     title = title or msgs().MSG_INFO_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -170,12 +383,24 @@ def show_info_messagebox(
         )
         return ret
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def show_warning_messagebox(
-    message: str, title: Optional[str] = None, **messagebox_kwargs
+def show_info_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
 ) -> str:
+    return _wait_ui_request(
+        show_info_messagebox_async(message=message, title=title, **messagebox_kwargs),
+        timeout,
+    )
+
+
+def show_warning_messagebox_async(
+    message: str, title: Optional[str] = None, **messagebox_kwargs
+) -> "Future[str]":
     title = title or msgs().MSG_WARNING_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -188,12 +413,26 @@ def show_warning_messagebox(
         )
         return ret
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def show_critical_messagebox(
-    message: str, title: Optional[str] = None, **messagebox_kwargs
+def show_warning_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
 ) -> str:
+    return _wait_ui_request(
+        show_warning_messagebox_async(
+            message=message, title=title, **messagebox_kwargs
+        ),
+        timeout,
+    )
+
+
+def show_critical_messagebox_async(
+    message: str, title: Optional[str] = None, **messagebox_kwargs
+) -> "Future[str]":
     title = title or msgs().MSG_CRITICAL_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -206,15 +445,30 @@ def show_critical_messagebox(
         )
         return ret
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
+
+
+def show_critical_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
+) -> str:
+    return _wait_ui_request(
+        show_critical_messagebox_async(
+            message=message, title=title, **messagebox_kwargs
+        ),
+        timeout,
+    )
 
 
 show_error_messagebox = show_critical_messagebox
+show_error_messagebox_async = show_critical_messagebox_async
 
 
-def show_question_messagebox(
+def show_question_messagebox_async(
     message: str, title: Optional[str] = None, **messagebox_kwargs
-) -> str:
+) -> "Future[str]":
     title = title or msgs().MSG_QUESTION_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -223,12 +477,26 @@ def show_question_messagebox(
             title=title, message=message, parent=window.parent, **messagebox_kwargs
         )
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def show_ok_cancel_messagebox(
+def show_question_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
+) -> str:
+    return _wait_ui_request(
+        show_question_messagebox_async(
+            message=message, title=title, **messagebox_kwargs
+        ),
+        timeout,
+    )
+
+
+def show_ok_cancel_messagebox_async(
     message: str, title: Optional[str] = None, **messagebox_kwargs
-) -> bool:
+) -> "Future[bool]":
     title = title or msgs().MSG_QUESTION_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -238,12 +506,26 @@ def show_ok_cancel_messagebox(
         )
         return ret
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def show_retry_cancel_messagebox(
+def show_ok_cancel_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
+) -> bool:
+    return _wait_ui_request(
+        show_ok_cancel_messagebox_async(
+            message=message, title=title, **messagebox_kwargs
+        ),
+        timeout,
+    )
+
+
+def show_retry_cancel_messagebox_async(
     message: str, title: Optional[str] = None, **messagebox_kwargs
-) -> Literal["ok", "retry", "cancel"]:
+) -> "Future[Literal['ok', 'retry', 'cancel']]":
     title = title or msgs().MSG_QUESTION_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -253,12 +535,26 @@ def show_retry_cancel_messagebox(
         )
         return ret
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def show_yes_no_cancel_messagebox(
+def show_retry_cancel_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
+) -> Literal["ok", "retry", "cancel"]:
+    return _wait_ui_request(
+        show_retry_cancel_messagebox_async(
+            message=message, title=title, **messagebox_kwargs
+        ),
+        timeout,
+    )
+
+
+def show_yes_no_cancel_messagebox_async(
     message: str, title: Optional[str] = None, **messagebox_kwargs
-) -> Optional[bool]:
+) -> "Future[Optional[bool]]":
     title = title or msgs().MSG_QUESTION_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -268,12 +564,26 @@ def show_yes_no_cancel_messagebox(
         )
         return ret
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def show_yes_no_messagebox(
+def show_yes_no_cancel_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
+) -> Optional[bool]:
+    return _wait_ui_request(
+        show_yes_no_cancel_messagebox_async(
+            message=message, title=title, **messagebox_kwargs
+        ),
+        timeout,
+    )
+
+
+def show_yes_no_messagebox_async(
     message: str, title: Optional[str] = None, **messagebox_kwargs
-) -> bool:
+) -> "Future[bool]":
     title = title or msgs().MSG_QUESTION_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -283,12 +593,24 @@ def show_yes_no_messagebox(
         )
         return ret
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def get_string_input(
+def show_yes_no_messagebox(
+    message: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **messagebox_kwargs,
+) -> bool:
+    return _wait_ui_request(
+        show_yes_no_messagebox_async(message=message, title=title, **messagebox_kwargs),
+        timeout,
+    )
+
+
+def get_string_input_async(
     prompt: str, title: Optional[str] = None, **dialog_kwargs
-) -> Optional[str]:
+) -> "Future[Optional[str]]":
     title = title or msgs().MSG_INPUT_DIALOG_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -297,12 +619,23 @@ def get_string_input(
             title=title, prompt=prompt, parent=window.parent, **dialog_kwargs
         )
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def get_int_input(
+def get_string_input(
+    prompt: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **dialog_kwargs,
+) -> Optional[str]:
+    return _wait_ui_request(
+        get_string_input_async(prompt=prompt, title=title, **dialog_kwargs), timeout
+    )
+
+
+def get_int_input_async(
     prompt: str, title: Optional[str] = None, **dialog_kwargs
-) -> Optional[int]:
+) -> "Future[Optional[int]]":
     title = title or msgs().MSG_INPUT_DIALOG_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -311,12 +644,23 @@ def get_int_input(
             title=title, prompt=prompt, parent=window.parent, **dialog_kwargs
         )
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def get_float_input(
+def get_int_input(
+    prompt: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **dialog_kwargs,
+) -> Optional[int]:
+    return _wait_ui_request(
+        get_int_input_async(prompt=prompt, title=title, **dialog_kwargs), timeout
+    )
+
+
+def get_float_input_async(
     prompt: str, title: Optional[str] = None, **dialog_kwargs
-) -> Optional[float]:
+) -> "Future[Optional[float]]":
     title = title or msgs().MSG_INPUT_DIALOG_TITLE
 
     def _call(window: FnExecuteWindow, *args, **kwargs):
@@ -325,12 +669,23 @@ def get_float_input(
             title=title, prompt=prompt, parent=window.parent, **dialog_kwargs
         )
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def show_custom_dialog(
+def get_float_input(
+    prompt: str,
+    title: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **dialog_kwargs,
+) -> Optional[float]:
+    return _wait_ui_request(
+        get_float_input_async(prompt=prompt, title=title, **dialog_kwargs), timeout
+    )
+
+
+def show_custom_dialog_async(
     dialog_class: Type[BaseDialog], title: str, **dialog_kwargs
-) -> Any:
+) -> "Future[Any]":
     def _call(window: FnExecuteWindow, *args, **kwargs):
         _ = args, kwargs  # unused
         dialog = dialog_class(title=title, parent=window.parent, **dialog_kwargs)
@@ -338,10 +693,21 @@ def show_custom_dialog(
             return None
         return dialog.result
 
-    return _run_ui_on_thread(_call)
+    return _ui_request(_call)
 
 
-def get_string_input2(
+def show_custom_dialog(
+    dialog_class: Type[BaseDialog], title: str, **dialog_kwargs
+) -> Any:
+    # dialog_kwargs中的参数均传给对话框，需要超时时间时请使用show_custom_dialog_async(...).result(timeout)
+    return _wait_ui_request(
+        show_custom_dialog_async(
+            dialog_class=dialog_class, title=title, **dialog_kwargs
+        )
+    )
+
+
+def get_string_input2_async(
     title: Optional[str] = None,
     size: tuple = (300, 100),
     resizable: bool = False,
@@ -350,13 +716,13 @@ def get_string_input2(
     label_text: Optional[str] = None,
     initial_value: str = "",
     echo_char: Optional[str] = None,
-):
+) -> Future:
     msgs_ = msgs()
     title = title or msgs_.MSG_INPUT_DIALOG_TITLE
     ok_text = ok_text or msgs_.MSG_DIALOG_BUTTON_OK
     cancel_text = cancel_text or msgs_.MSG_DIALOG_BUTTON_CANCEL
     label_text = label_text or msgs_.MSG_DIALOG_INPUT_PROMPT
-    return show_custom_dialog(
+    return show_custom_dialog_async(
         dialog_class=StringInputDialog,
         title=title,
         size=size,
@@ -369,7 +735,33 @@ def get_string_input2(
     )
 
 
-def get_path_input(
+def get_string_input2(
+    title: Optional[str] = None,
+    size: tuple = (300, 100),
+    resizable: bool = False,
+    ok_text: Optional[str] = None,
+    cancel_text: Optional[str] = None,
+    label_text: Optional[str] = None,
+    initial_value: str = "",
+    echo_char: Optional[str] = None,
+    timeout: Optional[float] = None,
+):
+    return _wait_ui_request(
+        get_string_input2_async(
+            title=title,
+            size=size,
+            resizable=resizable,
+            ok_text=ok_text,
+            cancel_text=cancel_text,
+            label_text=label_text,
+            initial_value=initial_value,
+            echo_char=echo_char,
+        ),
+        timeout,
+    )
+
+
+def get_path_input_async(
     title: Optional[str] = None,
     size: tuple = (420, 130),
     resizable: bool = False,
@@ -384,7 +776,7 @@ def get_path_input(
     cancel_text: Optional[str] = None,
     label_text: Optional[str] = None,
     initial_value: str = "",
-):
+) -> Future:
     msgs_ = msgs()
 
     if not (dir_button_text and file_button_text):
@@ -398,7 +790,7 @@ def get_path_input(
     cancel_text = cancel_text or msgs_.MSG_DIALOG_BUTTON_CANCEL
     label_text = label_text or msgs_.MSG_INPUT_PATH_PROMPT
 
-    return show_custom_dialog(
+    return show_custom_dialog_async(
         dialog_class=PathInputDialog,
         title=title,
         size=size,
@@ -417,7 +809,7 @@ def get_path_input(
     )
 
 
-def get_file_path_input(
+def get_path_input(
     title: Optional[str] = None,
     size: tuple = (420, 130),
     resizable: bool = False,
@@ -425,12 +817,50 @@ def get_file_path_input(
     file_types: List[Tuple[str, str]] = None,
     file_dialog_title: Optional[str] = None,
     file_dialog_action: Literal["open", "save"] = "open",
+    dir_button_text: Optional[str] = None,
+    dir_dialog_title: Optional[str] = None,
     start_dir: str = "",
     ok_text: Optional[str] = None,
     cancel_text: Optional[str] = None,
     label_text: Optional[str] = None,
     initial_value: str = "",
+    timeout: Optional[float] = None,
 ):
+    return _wait_ui_request(
+        get_path_input_async(
+            title=title,
+            size=size,
+            resizable=resizable,
+            file_button_text=file_button_text,
+            file_types=file_types,
+            file_dialog_title=file_dialog_title,
+            file_dialog_action=file_dialog_action,
+            dir_button_text=dir_button_text,
+            dir_dialog_title=dir_dialog_title,
+            start_dir=start_dir,
+            ok_text=ok_text,
+            cancel_text=cancel_text,
+            label_text=label_text,
+            initial_value=initial_value,
+        ),
+        timeout,
+    )
+
+
+def get_file_path_input_async(
+    title: Optional[str] = None,
+    size: tuple = (420, 130),
+    resizable: bool = False,
+    file_button_text: Optional[str] = None,
+    file_types: List[Tuple[str, str]] = None,
+    file_dialog_title: Optional[str] = None,
+    file_dialog_action: Literal["open", "save"] = "open",
+    start_dir: str = "",
+    ok_text: Optional[str] = None,
+    cancel_text: Optional[str] = None,
+    label_text: Optional[str] = None,
+    initial_value: str = "",
+) -> Future:
     msgs_ = msgs()
     title = title or msgs_.MSG_INPUT_DIALOG_TITLE
     file_button_text = file_button_text or msgs_.MSG_PATH_DIALOG_FILE_BUTTON_TEXT
@@ -439,7 +869,7 @@ def get_file_path_input(
     cancel_text = cancel_text or msgs_.MSG_DIALOG_BUTTON_CANCEL
     label_text = label_text or msgs_.MSG_INPUT_FILE_PROMPT
 
-    return show_custom_dialog(
+    return show_custom_dialog_async(
         dialog_class=PathInputDialog,
         title=title,
         size=size,
@@ -458,7 +888,41 @@ def get_file_path_input(
     )
 
 
-def get_dir_path_input(
+def get_file_path_input(
+    title: Optional[str] = None,
+    size: tuple = (420, 130),
+    resizable: bool = False,
+    file_button_text: Optional[str] = None,
+    file_types: List[Tuple[str, str]] = None,
+    file_dialog_title: Optional[str] = None,
+    file_dialog_action: Literal["open", "save"] = "open",
+    start_dir: str = "",
+    ok_text: Optional[str] = None,
+    cancel_text: Optional[str] = None,
+    label_text: Optional[str] = None,
+    initial_value: str = "",
+    timeout: Optional[float] = None,
+):
+    return _wait_ui_request(
+        get_file_path_input_async(
+            title=title,
+            size=size,
+            resizable=resizable,
+            file_button_text=file_button_text,
+            file_types=file_types,
+            file_dialog_title=file_dialog_title,
+            file_dialog_action=file_dialog_action,
+            start_dir=start_dir,
+            ok_text=ok_text,
+            cancel_text=cancel_text,
+            label_text=label_text,
+            initial_value=initial_value,
+        ),
+        timeout,
+    )
+
+
+def get_dir_path_input_async(
     title: Optional[str] = None,
     size: tuple = (420, 130),
     resizable: bool = False,
@@ -469,7 +933,7 @@ def get_dir_path_input(
     cancel_text: Optional[str] = None,
     label_text: Optional[str] = None,
     initial_value: str = "",
-):
+) -> Future:
     msgs_ = msgs()
     title = title or msgs_.MSG_INPUT_DIALOG_TITLE
     dir_button_text = dir_button_text or msgs_.MSG_PATH_DIALOG_DIR_BUTTON_TEXT
@@ -478,7 +942,7 @@ def get_dir_path_input(
     cancel_text = cancel_text or msgs_.MSG_DIALOG_BUTTON_CANCEL
     label_text = label_text or msgs_.MSG_INPUT_DIR_PROMPT
 
-    return show_custom_dialog(
+    return show_custom_dialog_async(
         dialog_class=PathInputDialog,
         title=title,
         size=size,
@@ -497,7 +961,37 @@ def get_dir_path_input(
     )
 
 
-def get_text_input(
+def get_dir_path_input(
+    title: Optional[str] = None,
+    size: tuple = (420, 130),
+    resizable: bool = False,
+    dir_button_text: Optional[str] = None,
+    dir_dialog_title: Optional[str] = None,
+    start_dir: str = "",
+    ok_text: Optional[str] = None,
+    cancel_text: Optional[str] = None,
+    label_text: Optional[str] = None,
+    initial_value: str = "",
+    timeout: Optional[float] = None,
+):
+    return _wait_ui_request(
+        get_dir_path_input_async(
+            title=title,
+            size=size,
+            resizable=resizable,
+            dir_button_text=dir_button_text,
+            dir_dialog_title=dir_dialog_title,
+            start_dir=start_dir,
+            ok_text=ok_text,
+            cancel_text=cancel_text,
+            label_text=label_text,
+            initial_value=initial_value,
+        ),
+        timeout,
+    )
+
+
+def get_text_input_async(
     title: Optional[str] = None,
     size: tuple = (500, 450),
     resizable: bool = True,
@@ -509,14 +1003,14 @@ def get_text_input(
     default_menu: bool = True,
     wrap: Literal["none", "char", "word"] = "word",
     font: tuple = get_default_widget_font(),
-):
+) -> Future:
     msgs_ = msgs()
     title = title or msgs_.MSG_INPUT_DIALOG_TITLE
     ok_text = ok_text or msgs_.MSG_DIALOG_BUTTON_OK
     cancel_text = cancel_text or msgs_.MSG_DIALOG_BUTTON_CANCEL
     label_text = label_text or msgs_.MSG_DIALOG_INPUT_PROMPT
 
-    return show_custom_dialog(
+    return show_custom_dialog_async(
         TextViewDialog,
         title=title,
         size=size,
@@ -532,5 +1026,37 @@ def get_text_input(
     )
 
 
+def get_text_input(
+    title: Optional[str] = None,
+    size: tuple = (500, 450),
+    resizable: bool = True,
+    ok_text: Optional[str] = None,
+    cancel_text: Optional[str] = None,
+    label_text: Optional[str] = None,
+    initial_value: str = "",
+    textview_height: int = 20,
+    default_menu: bool = True,
+    wrap: Literal["none", "char", "word"] = "word",
+    font: tuple = get_default_widget_font(),
+    timeout: Optional[float] = None,
+):
+    return _wait_ui_request(
+        get_text_input_async(
+            title=title,
+            size=size,
+            resizable=resizable,
+            ok_text=ok_text,
+            cancel_text=cancel_text,
+            label_text=label_text,
+            initial_value=initial_value,
+            textview_height=textview_height,
+            default_menu=default_menu,
+            wrap=wrap,
+            font=font,
+        ),
+        timeout,
+    )
+
+
 # 定义别名
 is_function_cancelled = is_cancel_requested
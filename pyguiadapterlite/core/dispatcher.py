@@ -0,0 +1,238 @@
+import dataclasses
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from tkinter import Misc, TclError
+from typing import Optional, Callable, Any
+
+from pyguiadapterlite.utils import _exception
+
+
+@dataclasses.dataclass(frozen=True)
+class UIDispatcherStats(object):
+    dispatched: int
+    """已执行的界面操作数"""
+
+    pending: int
+    """队列中等待执行的界面操作数（近似值）"""
+
+    max_pending: int
+    """每次处理队列时观察到的最大队列长度"""
+
+    ticks: int
+    """处理队列的次数"""
+
+    overruns: int
+    """因超出单次处理的时间预算而未能处理完队列的次数"""
+
+    last_latency: float
+    """最近一次界面操作从提交到开始执行的时间（秒）"""
+
+    avg_latency: float
+    """提交到开始执行的平均时间（秒，指数平滑）"""
+
+    max_latency: float
+    """提交到开始执行的最长时间（秒）"""
+
+
+class FutureCall(object):
+    """在主线程中执行的函数调用，其结果通过future返回；future在开始执行前被取消时不再执行"""
+
+    __slots__ = ("future", "func", "args", "kwargs")
+
+    def __init__(self, func: Callable[..., Any], *args, **kwargs):
+        self.future = Future()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            self.future.set_result(self.func(*self.args, **self.kwargs))
+        except BaseException as e:
+            self.future.set_exception(e)
+
+
+class UIDispatcher(object):
+    """
+    跨线程的界面操作队列。
+    任意线程通过submit()提交的操作进入同一个queue.SimpleQueue，不会在工作线程中调用任何Tk方法；
+    主线程中的周期性任务每隔interval毫秒取出所有待执行的操作并依次执行，
+    单次处理的时间超过budget秒时剩余的操作留到下一次（1毫秒后）处理，以免界面失去响应。
+    队列持续为空时，处理的间隔逐渐加倍，直到idle_interval毫秒，以减少空闲时对主线程的唤醒，
+    有新的操作后恢复为interval毫秒。
+    操作按提交的顺序执行。
+    """
+
+    def __init__(
+        self,
+        interval: int = 10,
+        budget: float = 0.012,
+        smoothing: float = 0.1,
+        idle_interval: int = 50,
+    ):
+        self._interval = max(1, int(interval))
+        self._idle_interval = max(self._interval, int(idle_interval))
+        # 下一次处理的间隔（毫秒）
+        self._delay = self._interval
+        self._budget = max(0.001, budget)
+        self._smoothing = min(1.0, max(0.01, smoothing))
+        self._queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._widget: Optional[Misc] = None
+        self._tick_id: Optional[str] = None
+        self._main_thread: Optional[threading.Thread] = None
+        # 以fork方式创建的子进程会继承该对象，但其中没有主循环处理队列
+        self._pid: Optional[int] = None
+
+        self._dispatched = 0
+        self._max_pending = 0
+        self._ticks = 0
+        self._overruns = 0
+        self._last_latency = 0.0
+        self._avg_latency = 0.0
+        self._max_latency = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._widget is not None and self._pid == os.getpid()
+
+    def is_main_thread(self) -> bool:
+        return self._main_thread is threading.current_thread()
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> None:
+        """提交一个界面操作，可在任意线程中调用"""
+        self._queue.put((time.perf_counter(), func, args, kwargs))
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """提交一个界面操作，返回其结果的Future。队列被停止时尚未执行的操作的Future将被取消"""
+        call = FutureCall(func, *args, **kwargs)
+        self.submit(call)
+        return call.future
+
+    def start(self, widget: Misc) -> None:
+        """启动周期性处理任务，必须在主线程中调用"""
+        if self._widget is not None:
+            return
+        self._widget = widget
+        self._main_thread = threading.current_thread()
+        self._pid = os.getpid()
+        self._delay = self._interval
+        self._schedule_tick(self._interval)
+
+    def stop(self, drain: bool = False) -> None:
+        """停止周期性处理任务，drain为True时先执行队列中剩余的操作，否则将其丢弃"""
+        if self._widget is None:
+            return
+        if self._tick_id is not None:
+            try:
+                self._widget.after_cancel(self._tick_id)
+            except TclError:
+                pass
+            self._tick_id = None
+        if drain:
+            self.pump(budget=None)
+        else:
+            self._discard()
+        self._widget = None
+        self._main_thread = None
+        self._pid = None
+
+    def pump(self, budget: Optional[float] = -1) -> bool:
+        """
+        执行队列中的操作，必须在主线程中调用。budget为-1时使用默认的时间预算，为None时不限制时间。
+        返回队列中是否还有未执行的操作。
+        """
+        if budget == -1:
+            budget = self._budget
+        pending = self._queue.qsize()
+        if pending > self._max_pending:
+            self._max_pending = pending
+        self._ticks += 1
+        start = time.perf_counter()
+        get = self._queue.get_nowait
+        while True:
+            try:
+                submitted, func, args, kwargs = get()
+            except queue.Empty:
+                return False
+            now = time.perf_counter()
+            self._record_latency(now - submitted)
+            try:
+                func(*args, **kwargs)
+            except BaseException as e:
+                _exception(e, "exception raised in ui dispatcher callback")
+            self._dispatched += 1
+            if budget is not None and time.perf_counter() - start >= budget:
+                if self._queue.empty():
+                    return False
+                self._overruns += 1
+                return True
+
+    def stats(self) -> UIDispatcherStats:
+        return UIDispatcherStats(
+            dispatched=self._dispatched,
+            pending=self._queue.qsize(),
+            max_pending=self._max_pending,
+            ticks=self._ticks,
+            overruns=self._overruns,
+            last_latency=self._last_latency,
+            avg_latency=self._avg_latency,
+            max_latency=self._max_latency,
+        )
+
+    def _record_latency(self, latency: float):
+        self._last_latency = latency
+        if latency > self._max_latency:
+            self._max_latency = latency
+        if self._dispatched == 0:
+            self._avg_latency = latency
+        else:
+            self._avg_latency += self._smoothing * (latency - self._avg_latency)
+
+    def _discard(self):
+        # 取消等待结果的操作，避免等待它们的线程永远阻塞
+        try:
+            while True:
+                _, func, _, _ = self._queue.get_nowait()
+                if isinstance(func, FutureCall):
+                    func.future.cancel()
+        except queue.Empty:
+            pass
+
+    def _schedule_tick(self, delay: int):
+        self._tick_id = self._widget.after(delay, self._tick)
+
+    def _tick(self):
+        self._tick_id = None
+        if self._widget is None:
+            return
+        dispatched = self._dispatched
+        more = self.pump()
+        if self._widget is None:
+            return
+        if more:
+            self._delay = self._interval
+            self._schedule_tick(1)
+            return
+        if self._dispatched != dispatched:
+            self._delay = self._interval
+        else:
+            self._delay = min(self._delay * 2, self._idle_interval)
+        self._schedule_tick(self._delay)
+
+
+_default_dispatcher: Optional[UIDispatcher] = None
+_default_dispatcher_lock = threading.Lock()
+
+
+def default_ui_dispatcher() -> UIDispatcher:
+    """所有窗口和执行器共享的界面操作队列，由GUIAdapter.run()在主循环开始前启动"""
+    global _default_dispatcher
+    with _default_dispatcher_lock:
+        if _default_dispatcher is None:
+            _default_dispatcher = UIDispatcher()
+        return _default_dispatcher
@@ -0,0 +1,410 @@
+import atexit
+import hashlib
+import json
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path, PurePath
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    Union,
+    Iterable,
+    List,
+    Tuple,
+    Sequence,
+    Callable,
+)
+
+from pyguiadapterlite.core.workerpool import WorkerPool
+from pyguiadapterlite.types.extendtypes import (
+    file_t,
+    dir_t,
+    path_list_t,
+    dir_list_t,
+    file_list_t,
+)
+from pyguiadapterlite.utils import _exception
+
+PathLike = Union[str, PurePath]
+
+# 其值为文件或目录路径（或路径列表）的参数类型
+_PATH_TYPES = (file_t, dir_t, path_list_t, dir_list_t, file_list_t)
+_PATH_TYPENAMES = {
+    "file_t",
+    "dir_t",
+    "directory_t",
+    "path_list_t",
+    "path_list",
+    "paths_t",
+    "dir_list_t",
+    "dir_list",
+    "dirs_t",
+    "file_list_t",
+    "file_list",
+    "files_t",
+}
+
+MISSING_DIGEST = "missing"
+
+
+def path_parameter_names(fn_info) -> Tuple[str, ...]:
+    """返回函数中类型为文件、目录或路径列表的参数的名称"""
+    names = []
+    for name, info in fn_info.parameter_infos.items():
+        typ = info.type
+        if isinstance(typ, type) and issubclass(typ, _PATH_TYPES):
+            names.append(name)
+        elif info.typename in _PATH_TYPENAMES:
+            names.append(name)
+    return tuple(names)
+
+
+class FileFingerprinter(object):
+    """
+    计算文件和目录的内容摘要。
+    文件内容在后台线程池中计算摘要，结果记录在(路径, 大小, 修改时间) -> 摘要的索引中，未改变的文件不会被重复计算；
+    索引最多保留max_index_entries个最近使用的文件，已不存在的文件会被移除。
+    指定index_path时该索引将被保存到磁盘上（最多每save_interval秒一次，以及程序退出时），重启后依然有效。
+    目录的摘要由其中各个条目的名称、类型和摘要计算得到（类似Merkle树），任何文件的增删改都会改变目录的摘要。
+    """
+
+    def __init__(
+        self,
+        index_path: Union[str, Path, None] = None,
+        max_workers: int = 4,
+        algorithm: str = "sha256",
+        chunk_size: int = 1024 * 1024,
+        save_interval: float = 30.0,
+        max_index_entries: int = 10000,
+    ):
+        hashlib.new(algorithm)
+        self._algorithm = algorithm
+        self._chunk_size = max(4096, chunk_size)
+        self._pool = WorkerPool(
+            max_workers=max_workers, min_workers=0, name="FingerprintWorker"
+        )
+        # 执行submit()提交的请求（如计算缓存键），与计算摘要的线程池分开，以免请求占满线程池后等待自身提交的摘要计算
+        self._request_pool = WorkerPool(
+            max_workers=2, min_workers=0, name="FingerprintRequest"
+        )
+        self._lock = threading.Lock()
+        # 绝对路径 -> (大小, 修改时间（纳秒）, 摘要)，按最近使用的顺序排列
+        self._index: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._max_index_entries = max(1, max_index_entries)
+        self._index_path = Path(index_path) if index_path is not None else None
+        # 磁盘上的索引在第一次使用时才加载，避免在主线程中读取
+        self._loaded = self._index_path is None
+        self._dirty = False
+        self._save_interval = save_interval
+        self._last_save = 0.0
+
+        self._hashed_files = 0
+        self._hashed_bytes = 0
+        self._index_hits = 0
+
+        if self._index_path is not None:
+            atexit.register(self.save)
+
+    @property
+    def algorithm(self) -> str:
+        return self._algorithm
+
+    @property
+    def index_path(self) -> Optional[Path]:
+        return self._index_path
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "indexed_files": len(self._index),
+                "hashed_files": self._hashed_files,
+                "hashed_bytes": self._hashed_bytes,
+                "index_hits": self._index_hits,
+            }
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """在独立的小线程池中执行需要计算摘要的操作（如计算缓存键），不占用执行用户函数的共享线程池"""
+        return self._request_pool.submit(fn, *args, **kwargs)
+
+    def fingerprint(self, path: PathLike) -> str:
+        """返回文件或目录的摘要，路径不存在时返回MISSING_DIGEST"""
+        return self.fingerprint_many([path])[self._normalize(path)]
+
+    def fingerprint_many(self, paths: Iterable[PathLike]) -> Dict[str, str]:
+        """并行计算多个文件或目录的摘要，返回规范化的绝对路径 -> 摘要"""
+        self._ensure_loaded()
+        roots = [self._normalize(p) for p in paths]
+        # 先收集所有需要计算摘要的文件，然后并行计算
+        trees: Dict[str, Any] = {}
+        files: List[Tuple[str, os.stat_result]] = []
+        for root in roots:
+            if root not in trees:
+                trees[root] = self._scan(root, files)
+        digests = self._hash_files(files)
+        result = {root: self._tree_digest(trees[root], digests) for root in roots}
+        self._maybe_save()
+        return result
+
+    def snapshot(self, paths: Iterable[PathLike]) -> Dict[str, str]:
+        """记录一组路径当前的摘要，可在之后传给changed_paths()以检测变化"""
+        return self.fingerprint_many(paths)
+
+    def changed_paths(self, snapshot: Dict[str, str]) -> List[str]:
+        """返回与snapshot相比内容发生了变化（包括被删除或新建）的路径"""
+        current = self.fingerprint_many(snapshot.keys())
+        return [path for path, digest in snapshot.items() if current[path] != digest]
+
+    def fingerprint_arguments(
+        self, arguments: Dict[str, Any], path_parameters: Sequence[str]
+    ) -> Dict[str, Any]:
+        """
+        将参数中的文件、目录路径替换为("content", 规范化的路径, 内容摘要)，用于计算与内容相关的缓存键。
+        键中保留路径，因此内容相同、路径不同的文件得到不同的缓存键。
+        """
+        paths = []
+        for name in path_parameters:
+            value = arguments.get(name, None)
+            for p in self._iter_paths(value):
+                paths.append(p)
+        if not paths:
+            return arguments
+        digests = self.fingerprint_many(paths)
+
+        def _key(path: PathLike) -> tuple:
+            normalized = self._normalize(path)
+            return "content", normalized, digests[normalized]
+
+        result = dict(arguments)
+        for name in path_parameters:
+            value = arguments.get(name, None)
+            if isinstance(value, (str, PurePath)):
+                if str(value):
+                    result[name] = _key(value)
+            elif isinstance(value, (list, tuple)):
+                result[name] = tuple(
+                    _key(v) if isinstance(v, (str, PurePath)) and str(v) else v
+                    for v in value
+                )
+        return result
+
+    def save(self):
+        """将索引写入磁盘"""
+        if self._index_path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {path: list(entry) for path, entry in self._index.items()}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp_path = self._index_path.with_suffix(".tmp")
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"algorithm": self._algorithm, "files": data}, f)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            _exception(e, "failed to save fingerprint index")
+
+    def shutdown(self):
+        self.save()
+        self._pool.shutdown()
+        self._request_pool.shutdown()
+
+    @staticmethod
+    def _normalize(path: PathLike) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    @staticmethod
+    def _iter_paths(value: Any) -> Iterable[PathLike]:
+        if isinstance(value, (str, PurePath)):
+            if str(value):
+                yield value
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                if isinstance(v, (str, PurePath)) and str(v):
+                    yield v
+
+    def _scan(self, path: str, files: List[Tuple[str, os.stat_result]]) -> Any:
+        # 返回路径对应的树：文件为("F", 路径)，目录为("D", [(名称, 子树), ...])，
+        # 符号链接目录为("L", 链接目标)，不存在的路径为None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if stat.S_ISDIR(st.st_mode):
+            children = []
+            try:
+                entries = sorted(os.scandir(path), key=lambda e: e.name)
+            except OSError as e:
+                _exception(e, f"failed to list directory: {path}")
+                return ("D", children)
+            for entry in entries:
+                try:
+                    if entry.is_symlink() and entry.is_dir():
+                        # 不跟随指向目录的符号链接，避免循环
+                        children.append((entry.name, ("L", os.readlink(entry.path))))
+                    elif entry.is_dir():
+                        children.append((entry.name, self._scan(entry.path, files)))
+                    elif entry.is_file():
+                        files.append((entry.path, entry.stat()))
+                        children.append((entry.name, ("F", entry.path)))
+                except OSError:
+                    continue
+            return ("D", children)
+        files.append((path, st))
+        return ("F", path)
+
+    def _hash_files(self, files: List[Tuple[str, os.stat_result]]) -> Dict[str, str]:
+        digests: Dict[str, str] = {}
+        pending = []
+        with self._lock:
+            for path, st in files:
+                if path in digests:
+                    continue
+                entry = self._index.get(path, None)
+                if (
+                    entry is not None
+                    and entry[0] == st.st_size
+                    and entry[1] == st.st_mtime_ns
+                ):
+                    digests[path] = entry[2]
+                    self._index.move_to_end(path)
+                    self._index_hits += 1
+                else:
+                    digests[path] = ""
+                    pending.append((path, st))
+        futures = [
+            (path, st, self._pool.submit(self._hash_file, path)) for path, st in pending
+        ]
+        for path, st, future in futures:
+            try:
+                digest = future.result()
+            except OSError as e:
+                _exception(e, f"failed to read file: {path}")
+                digests[path] = MISSING_DIGEST
+                with self._lock:
+                    if self._index.pop(path, None) is not None:
+                        self._dirty = True
+                continue
+            digests[path] = digest
+            with self._lock:
+                self._index.pop(path, None)
+                self._index[path] = (st.st_size, st.st_mtime_ns, digest)
+                while len(self._index) > self._max_index_entries:
+                    self._index.popitem(last=False)
+                self._dirty = True
+                self._hashed_files += 1
+                self._hashed_bytes += st.st_size
+        return digests
+
+    def _hash_file(self, path: str) -> str:
+        h = hashlib.new(self._algorithm)
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(self._chunk_size)
+                if not chunk:
+                    break
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _tree_digest(self, tree: Any, digests: Dict[str, str]) -> str:
+        if tree is None:
+            return MISSING_DIGEST
+        kind, value = tree
+        if kind == "F":
+            return digests.get(value, MISSING_DIGEST)
+        if kind == "L":
+            return hashlib.new(
+                self._algorithm, f"L:{value}".encode("utf-8")
+            ).hexdigest()
+        h = hashlib.new(self._algorithm, b"D")
+        for name, child in value:
+            child_digest = self._tree_digest(child, digests)
+            child_kind = child[0] if child is not None else "?"
+            h.update(f"{name}\0{child_kind}\0{child_digest}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load_index()
+            self._loaded = True
+
+    def _load_index(self):
+        # 调用时必须已持有self._lock
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            _exception(e, "failed to load fingerprint index")
+            return
+        if not isinstance(data, dict) or data.get("algorithm") != self._algorithm:
+            return
+        files = data.get("files", {})
+        if not isinstance(files, dict):
+            return
+        # 文件按最近使用的顺序保存，只加载最近使用的max_index_entries个，并移除已不存在或已被修改的文件
+        for path, entry in list(files.items())[-self._max_index_entries :]:
+            try:
+                size, mtime_ns, digest = int(entry[0]), int(entry[1]), str(entry[2])
+            except (TypeError, ValueError, IndexError):
+                self._dirty = True
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._dirty = True
+                continue
+            if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                self._dirty = True
+                continue
+            self._index[path] = (size, mtime_ns, digest)
+        if len(files) > len(self._index):
+            self._dirty = True
+
+    def _maybe_save(self):
+        if self._index_path is None or not self._dirty:
+            return
+        if time.monotonic() - self._last_save >= self._save_interval:
+            self.save()
+
+
+_default_fingerprinter: Optional[FileFingerprinter] = None
+_default_fingerprinter_lock = threading.Lock()
+
+
+_default_index_path: Optional[Path] = None
+
+
+def set_fingerprint_index_path(index_path: Union[str, Path, None]) -> None:
+    """
+    设置共享的文件摘要服务（default_fingerprinter()）保存索引的路径，None（默认）表示索引只保存在内存中。
+    应在第一次执行函数之前调用；已创建的共享服务将保存其索引，之后default_fingerprinter()返回新创建的服务。
+    """
+    global _default_fingerprinter, _default_index_path
+    with _default_fingerprinter_lock:
+        _default_index_path = Path(index_path) if index_path is not None else None
+        old, _default_fingerprinter = _default_fingerprinter, None
+    if old is not None:
+        # 已创建的缓存可能仍在使用它，因此不关闭其线程池
+        old.save()
+
+
+def default_fingerprinter() -> FileFingerprinter:
+    """共享的文件摘要服务，默认不将索引保存到磁盘上，参见set_fingerprint_index_path()"""
+    global _default_fingerprinter
+    with _default_fingerprinter_lock:
+        if _default_fingerprinter is None:
+            _default_fingerprinter = FileFingerprinter(index_path=_default_index_path)
+        return _default_fingerprinter
@@ -1,18 +1,58 @@
+import asyncio
 import dataclasses
+import inspect
+import threading
 from abc import abstractmethod
-from typing import Callable, Any, Type, Dict, Optional, List
+from typing import Callable, Any, Type, Dict, Optional, List, TYPE_CHECKING
 
 from pyguiadapterlite.windows.basewindow import BaseWindowConfig, BaseWindow
 from pyguiadapterlite.components.valuewidget import BaseParameterWidgetConfig
+from pyguiadapterlite.core.streaming import (
+    ResultStream,
+    result_stream_path,
+    consume_generator,
+    consume_async_generator,
+)
+from pyguiadapterlite.core.ucontext import RunContext, UContext
+from pyguiadapterlite.core.watchdog import WatchHandle, default_watchdog
+
+if TYPE_CHECKING:
+    from pyguiadapterlite.core.cache import ResultCache
 
 
 class ExecuteStateListener(object):
+    def create_run_context(
+        self,
+        fn_info: "FnInfo",
+        arguments: Dict[str, Any],
+        cancel_event: threading.Event,
+    ) -> RunContext:
+        """在执行器开始一次执行时调用，返回本次执行的上下文。该方法在主线程中执行"""
+        _ = fn_info, arguments
+        return RunContext(
+            run_id=UContext.next_run_id(),
+            window=UContext.current_execute_window(),
+            cancel_event=cancel_event,
+        )
+
     def before_execute(self, fn_info: "FnInfo", arguments: Dict[str, Any]) -> None:
         pass
 
     def on_execute_start(self, fn_info: "FnInfo", arguments: Dict[str, Any]) -> None:
         pass
 
+    def on_execute_result_items(
+        self,
+        fn_info: "FnInfo",
+        stream: ResultStream,
+        start_index: int,
+        items: List[Any],
+    ) -> None:
+        """
+        生成器函数产生新的结果时调用，items为上次回调以来产生的各项，start_index为其中第一项的序号。该方法在主线程中执行
+        """
+        pass
+
     def on_execute_finish(
         self,
         fn_info: "FnInfo",
@@ -33,6 +73,70 @@ class BaseFunctionExecutor(object):
     def listener(self) -> Optional[ExecuteStateListener]:
         return self._listener
 
+    def create_run_context(
+        self,
+        fn_info: "FnInfo",
+        arguments: Optional[Dict[str, Any]],
+        cancel_event: threading.Event,
+    ) -> RunContext:
+        listener = self._listener or ExecuteStateListener()
+        return listener.create_run_context(fn_info, arguments or {}, cancel_event)
+
+    def create_result_stream(self, fn_info: "FnInfo", run: RunContext) -> ResultStream:
+        """为生成器函数的本次执行创建结果流，产生的结果将在主线程中分批转交给监听者"""
+        config = fn_info.window_config
+        directory = getattr(config, "result_stream_dir", None)
+        path = None
+        if directory != "":
+            path = result_stream_path(
+                directory, fn_info.get_function_name(), run.run_id
+            )
+        listener = self._listener
+        on_items = None
+        if listener is not None:
+
+            def on_items(stream: ResultStream, start_index: int, items: List[Any]):
+                listener.on_execute_result_items(fn_info, stream, start_index, items)
+
+        return ResultStream(
+            path,
+            on_items=on_items,
+            schedule=UContext.dispatch,
+            collect=getattr(config, "collect_streamed_results", True),
+            max_collected=getattr(config, "max_collected_results", 1000),
+        )
+
+    def consume_result_stream(
+        self, fn_info: "FnInfo", run: RunContext, generator: Any
+    ) -> Any:
+        """在当前线程中逐项消费生成器或异步生成器，返回函数的最终结果"""
+        stream = self.create_result_stream(fn_info, run)
+        if inspect.isasyncgen(generator):
+            return asyncio.run(
+                consume_async_generator(generator, stream, run.cancel_event)
+            )
+        return consume_generator(generator, stream, run.cancel_event)
+
+    @staticmethod
+    def watch_timeouts(
+        fn_info: "FnInfo",
+        run: RunContext,
+        on_hard_timeout: Callable[[], None],
+    ) -> Optional[WatchHandle]:
+        """
+        若函数设置了超时时间，则在共享的监视线程中登记本次执行：软超时到期时设置取消标志（is_cancel_requested()将返回True），
+        硬超时到期时调用on_hard_timeout，由执行器放弃或终止本次执行。执行结束后应取消返回的句柄。
+        """
+        if fn_info.timeout is None and fn_info.hard_timeout is None:
+            return None
+        return default_watchdog().watch(
+            fn_info.timeout,
+            fn_info.hard_timeout,
+            on_soft=run.cancel_event.set,
+            on_hard=on_hard_timeout,
+            name=f"{fn_info.get_function_name()}#{run.run_id}",
+        )
+
     @abstractmethod
     def execute(self, fn_info: "FnInfo", arguments: Optional[Dict[str, Any]] = None):
         pass
@@ -86,6 +190,9 @@ class FnInfo(object):
         Callable[[BaseWindow, Any, Optional[Exception]], None]
     ] = None
     parameters_grouped: bool = False
+    cache: Optional["ResultCache"] = None
+    timeout: Optional[float] = None
+    hard_timeout: Optional[float] = None
 
     def get_function_name(self) -> str:
         if self.fn_name:
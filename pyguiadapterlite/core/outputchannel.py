@@ -0,0 +1,319 @@
+import dataclasses
+import threading
+import time
+from collections import deque
+from tkinter import Misc, TclError
+from typing import Callable, Optional, Literal, Deque
+
+from pyguiadapterlite._messages import messages as msgs
+from pyguiadapterlite.core.ucontext import UContext
+from pyguiadapterlite.utils import _exception
+
+OutputPolicy = Literal["unbounded", "block", "drop_oldest", "sample"]
+"""
+待刷新的文本超过上限时的处理策略：
+- unbounded：不限制
+- block：阻塞写入的工作线程，直到刷新后有足够的空间（主线程中的写入不会被阻塞）
+- drop_oldest：丢弃最早的待刷新文本，并在输出中插入提示行
+- sample：保留已缓冲的文本，丢弃本刷新周期内此后写入的文本，并在输出中插入摘要行
+"""
+
+_OUTPUT_POLICIES = ("unbounded", "block", "drop_oldest", "sample")
+
+
+@dataclasses.dataclass(frozen=True)
+class OutputChannelStats(object):
+    pending_chunks: int
+    """当前等待刷新的文本块数量（队列深度）"""
+
+    pending_chars: int
+    """当前等待刷新的字符数"""
+
+    total_chunks: int
+    """累计写入的文本块数量"""
+
+    total_flushes: int
+    """累计刷新次数"""
+
+    last_flush_latency: float
+    """最近一次刷新时，最早的待刷新文本块在队列中等待的时间（秒）"""
+
+    max_flush_latency: float
+    """刷新延迟的历史最大值（秒）"""
+
+    last_flush_duration: float
+    """最近一次刷新本身（写入控件）所耗费的时间（秒）"""
+
+    policy: str
+    """当前的输出策略"""
+
+    written_chars: int
+    """生产者累计写入的字符数（包括被丢弃的部分）"""
+
+    dropped_chunks: int
+    """因输出策略而被丢弃的文本块数量"""
+
+    dropped_chars: int
+    """因输出策略而被丢弃的字符数"""
+
+    dropped_lines: int
+    """因输出策略而被丢弃的行数"""
+
+    blocked_count: int
+    """生产者因block策略而被阻塞的次数"""
+
+    blocked_time: float
+    """生产者因block策略而被阻塞的累计时间（秒）"""
+
+
+class OutputChannel(object):
+    """
+    线程安全的输出缓冲通道。工作线程通过write()追加文本（仅需一次加锁的列表追加），
+    主线程中的刷新任务一次性取出所有待输出的文本，合并后批量写入输出控件。
+    刷新任务只在有待输出的文本时才被安排，没有输出时不会周期性地唤醒主线程。
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[str], None],
+        flush_interval: int = 16,
+        policy: OutputPolicy = "unbounded",
+        max_pending_chars: int = 1024 * 1024,
+    ):
+        if policy not in _OUTPUT_POLICIES:
+            raise ValueError(f"unknown output policy: {policy}")
+        self._sink = sink
+        self._flush_interval = max(1, int(flush_interval))
+        self._policy = policy
+        self._max_pending_chars = max(1, int(max_pending_chars))
+        self._lock = threading.Lock()
+        # 刷新后通知因背压而等待的生产者
+        self._flushed = threading.Condition(self._lock)
+        self._pending: Deque[str] = deque()
+        self._pending_chars = 0
+        # 自上次刷新以来被丢弃的行数，刷新时以提示行的形式输出
+        self._suppressed_lines = 0
+        # 队列中最早的文本块的入队时间
+        self._pending_since: Optional[float] = None
+
+        self._total_chunks = 0
+        self._total_flushes = 0
+        self._last_flush_latency = 0.0
+        self._max_flush_latency = 0.0
+        self._last_flush_duration = 0.0
+
+        self._written_chars = 0
+        self._dropped_chunks = 0
+        self._dropped_chars = 0
+        self._dropped_lines = 0
+        self._blocked_count = 0
+        self._blocked_time = 0.0
+
+        self._widget: Optional[Misc] = None
+        self._tick_id: Optional[str] = None
+        # 是否已安排（或已请求安排）刷新任务
+        self._armed = False
+
+    @property
+    def flush_interval(self) -> int:
+        return self._flush_interval
+
+    @property
+    def is_running(self) -> bool:
+        return self._widget is not None
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @property
+    def max_pending_chars(self) -> int:
+        return self._max_pending_chars
+
+    def write(self, text: str) -> None:
+        """追加文本到通道中，可在任意线程中调用。超出上限时按输出策略处理"""
+        if not text:
+            return
+        policy = self._policy
+        size = len(text)
+        arm = False
+        with self._lock:
+            self._written_chars += size
+            self._total_chunks += 1
+            if policy != "unbounded" and self._pending_chars >= self._max_pending_chars:
+                if policy == "sample":
+                    self._drop(text)
+                    return
+                if policy == "block" and not self._in_main_thread():
+                    self._wait_for_room()
+
+            if not self._pending:
+                self._pending_since = time.perf_counter()
+            if not self._armed:
+                self._armed = arm = True
+            self._pending.append(text)
+            self._pending_chars += size
+
+            if policy == "drop_oldest":
+                pending = self._pending
+                while (
+                    self._pending_chars > self._max_pending_chars and len(pending) > 1
+                ):
+                    dropped = pending.popleft()
+                    self._pending_chars -= len(dropped)
+                    self._drop(dropped)
+        if arm:
+            self._request_tick()
+
+    def _drop(self, text: str):
+        lines = text.count("\n") or 1
+        self._dropped_chunks += 1
+        self._dropped_chars += len(text)
+        self._dropped_lines += lines
+        self._suppressed_lines += lines
+
+    def _wait_for_room(self):
+        # 调用时必须已持有self._lock
+        self._blocked_count += 1
+        start = time.perf_counter()
+        self._flushed.wait_for(
+            lambda: self._pending_chars < self._max_pending_chars or not self.is_running
+        )
+        self._blocked_time += time.perf_counter() - start
+
+    @staticmethod
+    def _in_main_thread() -> bool:
+        return threading.current_thread() is threading.main_thread()
+
+    def start(self, widget: Misc) -> None:
+        """启动周期性刷新任务，必须在主线程中调用"""
+        if self._widget is not None:
+            return
+        self._widget = widget
+        # 处理启动前已写入的文本
+        self._armed = True
+        self._schedule_tick()
+
+    def stop(self, flush: bool = True) -> None:
+        """停止周期性刷新任务，必须在主线程中调用"""
+        if self._widget is None:
+            return
+        if self._tick_id is not None:
+            try:
+                self._widget.after_cancel(self._tick_id)
+            except TclError:
+                pass
+            self._tick_id = None
+        if flush:
+            self.flush()
+        self._widget = None
+        with self._lock:
+            self._flushed.notify_all()
+
+    def wait_for_capacity(
+        self, max_pending_chars: int, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        阻塞当前线程，直到待刷新的字符数低于max_pending_chars。用于生产者侧的背压控制，不可在主线程中调用。
+        超时返回False。
+        """
+        with self._flushed:
+            return self._flushed.wait_for(
+                lambda: self._pending_chars < max_pending_chars or not self.is_running,
+                timeout,
+            )
+
+    def discard(self) -> None:
+        """丢弃所有尚未刷新的文本"""
+        with self._lock:
+            self._pending = deque()
+            self._pending_chars = 0
+            self._pending_since = None
+            self._suppressed_lines = 0
+            self._flushed.notify_all()
+
+    def flush(self) -> None:
+        """将所有待输出文本一次性写入输出控件，必须在主线程中调用"""
+        with self._lock:
+            if not self._pending and not self._suppressed_lines:
+                return
+            chunks = self._pending
+            since = self._pending_since
+            suppressed = self._suppressed_lines
+            self._pending = deque()
+            self._pending_chars = 0
+            self._pending_since = None
+            self._suppressed_lines = 0
+            self._flushed.notify_all()
+
+        text = "".join(chunks)
+        if suppressed:
+            notice = self._suppressed_notice(suppressed)
+            if self._policy == "drop_oldest":
+                # 被丢弃的是最早的文本，提示行位于本次输出之前
+                text = notice + text
+            else:
+                if text and not text.endswith("\n"):
+                    text += "\n"
+                text += notice
+
+        start = time.perf_counter()
+        try:
+            self._sink(text)
+        except TclError as e:
+            _exception(e, "failed to flush output channel")
+        end = time.perf_counter()
+
+        latency = end - since if since is not None else 0.0
+        self._total_flushes += 1
+        self._last_flush_latency = latency
+        self._max_flush_latency = max(self._max_flush_latency, latency)
+        self._last_flush_duration = end - start
+
+    def stats(self) -> OutputChannelStats:
+        with self._lock:
+            return OutputChannelStats(
+                pending_chunks=len(self._pending),
+                pending_chars=self._pending_chars,
+                total_chunks=self._total_chunks,
+                total_flushes=self._total_flushes,
+                last_flush_latency=self._last_flush_latency,
+                max_flush_latency=self._max_flush_latency,
+                last_flush_duration=self._last_flush_duration,
+                policy=self._policy,
+                written_chars=self._written_chars,
+                dropped_chunks=self._dropped_chunks,
+                dropped_chars=self._dropped_chars,
+                dropped_lines=self._dropped_lines,
+                blocked_count=self._blocked_count,
+                blocked_time=self._blocked_time,
+            )
+
+    @staticmethod
+    def _suppressed_notice(lines: int) -> str:
+        return (
+            "\x1b[90m" + msgs().MSG_OUTPUT_LINES_SUPPRESSED.format(lines) + "\x1b[0m\n"
+        )
+
+    def _request_tick(self):
+        # 待刷新的文本由空变为非空时调用，可在任意线程中调用
+        if self._widget is None:
+            return
+        if self._in_main_thread():
+            self._schedule_tick()
+        else:
+            UContext.dispatch(self._schedule_tick)
+
+    def _schedule_tick(self):
+        if self._widget is None or self._tick_id is not None:
+            return
+        self._tick_id = self._widget.after(self._flush_interval, self._tick)
+
+    def _tick(self):
+        self._tick_id = None
+        if self._widget is None:
+            return
+        # 先清除标志再刷新，刷新后写入的文本会重新安排刷新任务
+        with self._lock:
+            self._armed = False
+        self.flush()
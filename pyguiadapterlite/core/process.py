@@ -0,0 +1,725 @@
+import asyncio
+import atexit
+import inspect
+import multiprocessing
+import multiprocessing.util
+import pickle
+import queue
+import threading
+import time
+from functools import partial
+from typing import Dict, Any, Optional, List, Callable, Iterator
+
+from pyguiadapterlite.core.fn import BaseFunctionExecutor, FnInfo, ExecuteStateListener
+from pyguiadapterlite.core.progresstasks import ProgressTaskBoard, ProgressTask
+from pyguiadapterlite.core.stdcapture import StdCapture
+from pyguiadapterlite.core.streaming import (
+    ResultStream,
+    StreamedResult,
+    is_result_stream,
+    consume_generator,
+    consume_async_generator,
+)
+from pyguiadapterlite.core.threaded import ThreadRunningException
+from pyguiadapterlite.core.ucontext import UContext, RunContext
+from pyguiadapterlite.core.watchdog import WatchHandle, ExecutionTimeoutError
+from pyguiadapterlite.utils import _exception, _warning
+
+# 子进程中允许转发到窗口的方法
+_FORWARDED_CALLS = (
+    "show_progressbar",
+    "hide_progressbar",
+    "start_progressbar",
+    "update_progressbar",
+    "stop_progressbar",
+    "open_worker_progress_task",
+    "update_worker_progress_task",
+    "finish_worker_progress_task",
+)
+
+
+class ProcessTerminatedError(RuntimeError):
+    """工作进程被强制终止或意外退出"""
+
+    pass
+
+
+class _WorkerOutput(object):
+    """子进程中代替OutputChannel的对象，将输出转发给主进程"""
+
+    def __init__(self, results):
+        self._results = results
+
+    def write(self, text: str):
+        if text:
+            self._results.put(("output", text))
+
+    def wait_for_capacity(self, max_pending_chars: int, timeout=None) -> bool:
+        _ = max_pending_chars, timeout
+        return True
+
+
+class _WorkerTaskBoard(ProgressTaskBoard):
+    """子进程中的进度任务集合，将任务的创建、更新和结束转发给主进程中的窗口，更新按间隔节流"""
+
+    def __init__(self, window: "_WorkerWindow", run_id: int):
+        super().__init__()
+        self._window = window
+        self._run_id = run_id
+        self._pending: Dict[int, ProgressTask] = {}
+        self._last_sent = 0.0
+
+    def _opened(self, task: ProgressTask) -> None:
+        parent_id = task.parent.task_id if task.parent is not None else None
+        self._window._forward(
+            "open_worker_progress_task",
+            self._run_id,
+            task.task_id,
+            parent_id,
+            task.name,
+            task.total,
+            task._latest[1],
+        )
+
+    def _touched(self, task: ProgressTask) -> None:
+        with self._window.progress_lock:
+            self._pending[task.task_id] = task
+            delay = self._window.progress_interval - (
+                time.monotonic() - self._last_sent
+            )
+        if delay <= 0:
+            self.flush_pending()
+        else:
+            self._window.schedule_progress_flush(delay)
+
+    def _finished(self, task: ProgressTask) -> None:
+        self.flush_pending()
+        super()._finished(task)
+        with self._lock:
+            # 子进程中不需要保留已结束的任务
+            self._tasks = {
+                task_id: t for task_id, t in self._tasks.items() if not t.is_finished
+            }
+        self._window._forward(
+            "finish_worker_progress_task", self._run_id, task.task_id, task._latest[1]
+        )
+
+    def flush_pending(self):
+        with self._window.progress_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            self._last_sent = time.monotonic()
+            for task_id, task in pending.items():
+                value, msg, total, _ = task._latest
+                self._window._forward(
+                    "update_worker_progress_task",
+                    self._run_id,
+                    task_id,
+                    value,
+                    msg,
+                    total,
+                )
+
+
+class _WorkerWindow(object):
+    """
+    子进程中代替FnExecuteWindow的对象。
+    uprint()以及进度条相关的函数通过它将调用转发给主进程中的窗口，对话框等需要访问Tk的函数在子进程中不可用。
+    """
+
+    # 向主进程发送进度更新的最小间隔（秒），间隔内的多次更新只发送最新的一次，
+    # 被推迟的更新由定时器在间隔到期后发送，因此最新的进度最多延迟一个间隔
+    progress_interval: float = 0.016
+
+    def __init__(self, results, state: Dict[str, Any]):
+        self._results = results
+        self._state = state
+        self.output_channel = _WorkerOutput(results)
+        self._pending_progress: Optional[tuple] = None
+        self._last_progress_sent = 0.0
+        # 保护待发送的进度，它们可能同时被执行函数的线程和定时器线程访问
+        self.progress_lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self.progress_tasks = _WorkerTaskBoard(self, state.get("run_id", 0))
+
+    @property
+    def parent(self) -> "_WorkerWindow":
+        return self
+
+    def after(self, delay: int, func, *args):
+        # 子进程中没有事件循环，直接调用
+        _ = delay
+        return func(*args)
+
+    def is_progressbar_enabled(self) -> bool:
+        return self._state.get("enable_progressbar", False)
+
+    def is_progress_label_enabled(self) -> bool:
+        return self._state.get("enable_progress_label", False)
+
+    def _forward(self, name: str, *args):
+        self._results.put(("call", name, args))
+
+    def show_progressbar(self, show: bool = True):
+        self.flush_progress()
+        self._forward("show_progressbar", show)
+
+    def hide_progressbar(self):
+        self.flush_progress()
+        self._forward("hide_progressbar")
+
+    def start_progressbar(self, *args):
+        self.flush_progress()
+        self._forward("start_progressbar", *args)
+
+    def update_progressbar(self, value: int, msg: Optional[str] = None):
+        with self.progress_lock:
+            self._pending_progress = (value, msg)
+            delay = self.progress_interval - (
+                time.monotonic() - self._last_progress_sent
+            )
+        if delay <= 0:
+            self.flush_progress()
+        else:
+            self.schedule_progress_flush(delay)
+
+    def stop_progressbar(self, hide_after_stop: bool = False):
+        self.flush_progress()
+        self._forward("stop_progressbar", hide_after_stop)
+
+    def flush_progress(self):
+        """发送尚未发送的最新进度"""
+        with self.progress_lock:
+            pending, self._pending_progress = self._pending_progress, None
+            if pending is not None:
+                self._last_progress_sent = time.monotonic()
+                self._forward("update_progressbar", *pending)
+            self.progress_tasks.flush_pending()
+
+    def schedule_progress_flush(self, delay: float):
+        """delay秒后发送被推迟的进度，已有等待中的定时器时不重复创建"""
+        with self.progress_lock:
+            if self._flush_timer is not None:
+                return
+            timer = threading.Timer(delay, self._on_flush_timer)
+            timer.daemon = True
+            self._flush_timer = timer
+        timer.start()
+
+    def _on_flush_timer(self):
+        with self.progress_lock:
+            self._flush_timer = None
+            self.flush_progress()
+
+
+def _picklable_exception(e: BaseException) -> BaseException:
+    try:
+        pickle.dumps(e)
+        return e
+    except Exception:
+        return RuntimeError(f"{type(e).__name__}: {e}")
+
+
+def _picklable_item(item: Any) -> Any:
+    try:
+        pickle.dumps(item)
+        return item
+    except Exception:
+        return repr(item)
+
+
+def _stream_items(generator, results, cancel_event) -> Any:
+    # 生成器产生的各项被逐个发送给主进程，由主进程写入结果流并收集，返回生成器的返回值
+    results.put(("stream",))
+
+    def _send(_, start_index: int, items: List[Any]):
+        _ = start_index
+        results.put(("items", [_picklable_item(item) for item in items]))
+
+    stream = ResultStream(on_items=_send, collect=False)
+    if inspect.isasyncgen(generator):
+        coro = consume_async_generator(generator, stream, cancel_event)
+        return_value = asyncio.run(coro)
+    else:
+        return_value = consume_generator(generator, stream, cancel_event)
+    return None if isinstance(return_value, StreamedResult) else return_value
+
+
+def _call_function(fn: Callable[..., Any], arguments: Dict[str, Any]) -> Any:
+    # async def函数的协程在工作进程中通过asyncio.run()执行
+    return_value = fn(**arguments)
+    if inspect.iscoroutine(return_value):
+        return_value = asyncio.run(return_value)
+    return return_value
+
+
+def _dump_task(fn: Callable[..., Any], arguments: Dict[str, Any], state: dict) -> bytes:
+    # 任务只序列化一次，序列化的错误由调用者在发送前得到，工作进程收到的是序列化后的字节
+    return pickle.dumps((fn, arguments, state))
+
+
+def _worker_main(tasks, results, cancel_event):
+    # 工作进程的入口，循环执行主进程发送过来的任务
+    while True:
+        payload = tasks.get()
+        if payload is None:
+            return
+        try:
+            fn, arguments, state = pickle.loads(payload)
+        except Exception as e:
+            # 例如以spawn方式启动时，工作进程无法导入函数所在的模块
+            results.put(("finished", None, _picklable_exception(e)))
+            continue
+        window = _WorkerWindow(results, state)
+        run = RunContext(
+            run_id=state.get("run_id", 0), window=window, cancel_event=cancel_event
+        )
+        token = UContext.bind_run(run)
+        results.put(("started",))
+        return_value, exception = None, None
+        try:
+            if state.get("capture_output", False):
+                with StdCapture(window.output_channel.write):
+                    return_value = _call_function(fn, arguments)
+                    if is_result_stream(return_value):
+                        return_value = _stream_items(
+                            return_value, results, cancel_event
+                        )
+            else:
+                return_value = _call_function(fn, arguments)
+                if is_result_stream(return_value):
+                    return_value = _stream_items(return_value, results, cancel_event)
+        except BaseException as e:
+            exception = _picklable_exception(e)
+        finally:
+            UContext.unbind_run(token)
+            window.flush_progress()
+
+        try:
+            pickle.dumps(return_value)
+        except Exception as e:
+            return_value = None
+            exception = RuntimeError(f"failed to pickle the return value: {e}")
+        results.put(("finished", return_value, exception))
+
+
+class _Worker(object):
+    def __init__(self, context):
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+        self.cancel_event = context.Event()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self.tasks, self.results, self.cancel_event),
+            name="ProcessExecutorWorker",
+        )
+        self.process.start()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, timeout: float = 1.0):
+        if self.is_alive():
+            try:
+                self.tasks.put(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout)
+        self.kill()
+
+    def kill(self):
+        if self.is_alive():
+            self.process.terminate()
+            self.process.join(1.0)
+        for q in (self.tasks, self.results):
+            q.cancel_join_thread()
+            q.close()
+
+
+class ProcessWorkerPool(object):
+    """
+    可复用的工作进程池。
+    进程在第一次使用时创建，任务完成后回到池中等待下一次任务，池中最多保留max_idle个空闲进程。
+    """
+
+    def __init__(self, max_idle: int = 2, mp_context: Optional[str] = None):
+        self._max_idle = max(0, max_idle)
+        self._context = multiprocessing.get_context(mp_context)
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def prestart(self, count: int = 1):
+        """预先启动count个工作进程，以减少第一次执行时的延迟"""
+        with self._lock:
+            while len(self._idle) < min(count, self._max_idle):
+                self._idle.append(_Worker(self._context))
+
+    def acquire(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("process worker pool is shut down")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+                worker.kill()
+            return _Worker(self._context)
+
+    def release(self, worker: _Worker):
+        with self._lock:
+            if not self._closed and worker.is_alive():
+                if len(self._idle) < self._max_idle:
+                    self._idle.append(worker)
+                    return
+        worker.stop()
+
+    def discard(self, worker: _Worker):
+        worker.kill()
+
+    def receive(
+        self,
+        worker: _Worker,
+        get_deadline: Callable[[], Optional[float]],
+        poll_interval: float = 0.1,
+    ) -> Iterator[tuple]:
+        """
+        逐条返回工作进程发送的消息，直到（包括）表示执行结束的"finished"消息，此时工作进程被放回池中。
+        每次等待消息前调用get_deadline()，返回的时间已到时终止工作进程并抛出ProcessTerminatedError；
+        工作进程意外退出时同样抛出ProcessTerminatedError，无法接收消息时抛出EOFError或OSError，这些情况下工作进程均被丢弃。
+        """
+        while True:
+            deadline = get_deadline()
+            if deadline is not None and time.monotonic() >= deadline:
+                _warning("function did not exit in time, terminating worker process")
+                self.discard(worker)
+                raise ProcessTerminatedError("worker process was terminated")
+            try:
+                message = worker.results.get(timeout=poll_interval)
+            except queue.Empty:
+                if not worker.is_alive():
+                    self.discard(worker)
+                    raise ProcessTerminatedError(
+                        f"worker process exited unexpectedly (exitcode={worker.process.exitcode})"
+                    )
+                continue
+            except (EOFError, OSError):
+                self.discard(worker)
+                raise
+            if message[0] == "finished":
+                self.release(worker)
+                yield message
+                return
+            yield message
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        arguments: Dict[str, Any],
+        cancel_event: Optional[threading.Event] = None,
+        on_output: Optional[Callable[[str], None]] = None,
+        capture_output: bool = False,
+        run_id: int = 0,
+        grace_period: float = 3.0,
+        poll_interval: float = 0.1,
+    ) -> Any:
+        """
+        在工作进程中执行fn(**arguments)，阻塞直到执行结束，返回函数的返回值或抛出函数的异常。
+        cancel_event被设置后，工作进程中的is_cancel_requested()将返回True，超过grace_period秒仍未退出时强制终止工作进程。
+        该方法不会与窗口交互，函数的输出将传给on_output，进度条相关的调用将被忽略。
+        """
+        state = {"capture_output": capture_output, "run_id": run_id}
+        payload = _dump_task(fn, arguments, state)
+        worker = self.acquire()
+        worker.cancel_event.clear()
+        worker.tasks.put(payload)
+        deadline: Optional[float] = None
+
+        def _get_deadline() -> Optional[float]:
+            nonlocal deadline
+            if deadline is None and cancel_event is not None and cancel_event.is_set():
+                worker.cancel_event.set()
+                deadline = time.monotonic() + grace_period
+            return deadline
+
+        # 生成器函数产生的各项
+        streamed_items: Optional[List[Any]] = None
+        for message in self.receive(worker, _get_deadline, poll_interval):
+            kind = message[0]
+            if kind == "output":
+                if on_output is not None:
+                    on_output(message[1])
+            elif kind == "stream":
+                streamed_items = []
+            elif kind == "items":
+                streamed_items.extend(message[1])
+            elif kind == "finished":
+                _, return_value, exception = message
+                if exception is not None:
+                    raise exception
+                if streamed_items is not None and return_value is None:
+                    return streamed_items
+                return return_value
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+        for worker in idle:
+            worker.stop()
+
+
+_default_pool: Optional[ProcessWorkerPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def default_process_pool() -> ProcessWorkerPool:
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ProcessWorkerPool()
+            # multiprocessing.util已在模块导入时注册了它的退出函数（该函数会等待所有非守护子进程结束），
+            # 此处后注册的shutdown()将先于它执行，从而使空闲的工作进程先退出
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
+
+
+class ProcessExecutor(BaseFunctionExecutor):
+    """
+    在工作进程中执行目标函数，适用于CPU密集型的函数。
+    目标函数、参数和返回值必须可以被pickle；使用spawn方式启动进程时（Windows、macOS的默认方式），
+    主脚本需要放在`if __name__ == "__main__":`中。
+    工作进程中可以使用uprint()、is_cancel_requested()以及进度条相关的函数，对话框等需要访问界面的函数不可用。
+    """
+
+    # 请求取消后等待函数自行退出的时间（秒），超时后强制终止工作进程
+    grace_period: float = 3.0
+    # 轮询工作进程状态的间隔（秒）
+    poll_interval: float = 0.1
+
+    def __init__(
+        self,
+        listener: Optional[ExecuteStateListener] = None,
+        pool: Optional[ProcessWorkerPool] = None,
+    ):
+        super().__init__(listener)
+        self._pool = pool
+        self._is_executing = False
+        self._worker: Optional[_Worker] = None
+        self._current_run: Optional[RunContext] = None
+        self._cancel_deadline: Optional[float] = None
+        # 硬超时已到期，工作进程将被立即终止
+        self._hard_timeout_expired = False
+        self._watch: Optional[WatchHandle] = None
+        self._state_lock = threading.Lock()
+
+    @property
+    def pool(self) -> ProcessWorkerPool:
+        if self._pool is None:
+            self._pool = default_process_pool()
+        return self._pool
+
+    def execute(self, fn_info: FnInfo, arguments: Optional[Dict[str, Any]] = None):
+        with self._state_lock:
+            if self._is_executing:
+                raise ThreadRunningException("a function is already executing")
+            self._is_executing = True
+            self._cancel_deadline = None
+            self._hard_timeout_expired = False
+
+        if not UContext.app_instance():
+            raise RuntimeError("tkinter is not initialized yet")
+
+        arguments = (arguments or {}).copy()
+        state = self._window_state(fn_info)
+        # 工作进程中的取消标志由监视线程根据该标志设置
+        run = self.create_run_context(fn_info, arguments, threading.Event())
+        state["run_id"] = run.run_id
+        with self._state_lock:
+            self._worker = None
+            self._current_run = run
+
+        if self._listener:
+            self._listener.before_execute(fn_info, arguments)
+
+        self._watch = self.watch_timeouts(
+            fn_info, run, partial(self._on_hard_timeout, run)
+        )
+        # 序列化任务、取得（可能需要新建）工作进程以及发送任务都在监视线程中进行，不阻塞主线程
+        threading.Thread(
+            target=self._monitor, args=(run, fn_info, arguments, state), daemon=True
+        ).start()
+
+    @property
+    def current_run(self) -> Optional[RunContext]:
+        return self._current_run
+
+    @property
+    def is_cancelled(self) -> bool:
+        with self._state_lock:
+            if not self._is_executing or self._current_run is None:
+                return False
+            return self._current_run.cancel_event.is_set()
+
+    @property
+    def is_executing(self) -> bool:
+        with self._state_lock:
+            return self._is_executing
+
+    def try_cancel(self):
+        with self._state_lock:
+            if not self._is_executing or self._current_run is None:
+                return
+            if self._current_run.cancel_event.is_set():
+                return
+            # 先设置取消标志，由函数自行退出；超过宽限期后强制终止工作进程
+            self._set_cancel_flags(self._current_run)
+            self._cancel_deadline = time.monotonic() + self.grace_period
+
+    def _on_hard_timeout(self, run: RunContext):
+        # 注意该方法在监视线程中被调用，由监视工作进程的线程负责终止进程并报告超时
+        with self._state_lock:
+            if self._current_run is not run:
+                return
+            self._set_cancel_flags(run)
+            self._hard_timeout_expired = True
+            self._cancel_deadline = time.monotonic()
+
+    def _set_cancel_flags(self, run: RunContext):
+        # 需持有_state_lock。工作进程尚未取得时，由监视线程在发送任务前设置其取消标志
+        run.cancel_event.set()
+        if self._worker is not None:
+            self._worker.cancel_event.set()
+
+    def _get_deadline(self, run: RunContext, worker: _Worker) -> Optional[float]:
+        # 将软超时等设置的取消标志同步到工作进程，返回强制终止工作进程的时间
+        if run.cancel_event.is_set() and not worker.cancel_event.is_set():
+            worker.cancel_event.set()
+        return self._cancel_deadline
+
+    @staticmethod
+    def _window_state(fn_info: FnInfo) -> Dict[str, Any]:
+        # 子进程无法访问窗口，预先取得函数执行期间可能被查询的状态
+        state = {
+            "capture_output": bool(
+                getattr(fn_info.window_config, "capture_output", False)
+            )
+        }
+        window = UContext.current_execute_window()
+        if window is not None:
+            state["enable_progressbar"] = window.is_progressbar_enabled()
+            state["enable_progress_label"] = window.is_progress_label_enabled()
+        return state
+
+    def _monitor(
+        self,
+        run: RunContext,
+        fn_info: FnInfo,
+        arguments: Dict[str, Any],
+        state: Dict[str, Any],
+    ):
+        # 注意该方法会在子线程中被调用
+        try:
+            payload = _dump_task(fn_info.fn, arguments, state)
+            worker = self.pool.acquire()
+            worker.cancel_event.clear()
+            with self._state_lock:
+                self._worker = worker
+                if run.cancel_event.is_set():
+                    worker.cancel_event.set()
+            worker.tasks.put(payload)
+        except Exception as e:
+            _exception(e, "failed to start function in worker process")
+            self._on_finish(fn_info, arguments, None, e)
+            return
+
+        stream: Optional[ResultStream] = None
+        try:
+            for message in self.pool.receive(
+                worker, partial(self._get_deadline, run, worker), self.poll_interval
+            ):
+                kind = message[0]
+                if kind == "output":
+                    self._forward_output(run, message[1])
+                elif kind == "call":
+                    self._forward_call(run, message[1], message[2])
+                elif kind == "started":
+                    self._on_start(fn_info, arguments)
+                elif kind == "stream":
+                    stream = self.create_result_stream(fn_info, run)
+                elif kind == "items":
+                    for item in message[1]:
+                        stream.append(item)
+                elif kind == "finished":
+                    _, return_value, exception = message
+                    if isinstance(exception, SystemExit):
+                        _exception(exception, "SystemExit caught in worker process")
+                        if not fn_info.capture_system_exit_exception:
+                            tk_instance = UContext.app_instance()
+                            if tk_instance:
+                                UContext.dispatch(tk_instance.quit)
+                            return
+                    if stream is not None and exception is None:
+                        stream.close()
+                        return_value = stream.result(return_value)
+                    self._on_finish(fn_info, arguments, return_value, exception)
+        except ProcessTerminatedError as e:
+            error = e
+            if self._hard_timeout_expired:
+                error = ExecutionTimeoutError(fn_info.hard_timeout)
+            self._on_finish(fn_info, arguments, None, error)
+        except (EOFError, OSError) as e:
+            _exception(e, "failed to receive message from worker process")
+            self._on_finish(fn_info, arguments, None, e)
+        finally:
+            if stream is not None:
+                stream.close()
+
+    @staticmethod
+    def _forward_output(run: RunContext, text: str):
+        channel = run.output
+        if channel is not None:
+            channel.write(text)
+
+    @staticmethod
+    def _forward_call(run: RunContext, name: str, args: tuple):
+        if name not in _FORWARDED_CALLS:
+            _warning(f"unsupported call from worker process: {name}")
+            return
+        window = run.window
+        tk_instance = UContext.app_instance()
+        if window is None or tk_instance is None:
+            return
+        UContext.dispatch(getattr(window, name), *args)
+
+    def _on_finish(
+        self,
+        fn_info: FnInfo,
+        arguments: Dict[str, Any],
+        return_value: Any,
+        exception: Optional[BaseException],
+    ):
+        with self._state_lock:
+            watch, self._watch = self._watch, None
+        if watch is not None:
+            watch.cancel()
+
+        def _callback():
+            with self._state_lock:
+                self._is_executing = False
+                self._worker = None
+                self._current_run = None
+                self._cancel_deadline = None
+                self._hard_timeout_expired = False
+            if self._listener:
+                self._listener.on_execute_finish(
+                    fn_info, arguments, return_value, exception
+                )
+
+        UContext.dispatch(_callback)
+
+    def _on_start(self, fn_info: FnInfo, arguments: Dict[str, Any]):
+        if self._listener:
+            UContext.dispatch(self._listener.on_execute_start, fn_info, arguments)
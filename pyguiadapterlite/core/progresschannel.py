@@ -0,0 +1,246 @@
+import dataclasses
+import itertools
+import threading
+import time
+from tkinter import Misc, TclError
+from typing import Optional, Callable, Tuple, List, Any
+
+from pyguiadapterlite.components.runlist import format_duration
+from pyguiadapterlite.core.ucontext import UContext
+from pyguiadapterlite.utils import _exception
+
+# (序号, 值, 消息, 时间)
+_Update = Tuple[int, float, Optional[str], float]
+# (序号, 函数, 参数)
+_Command = Tuple[int, Callable[..., Any], tuple]
+
+
+@dataclasses.dataclass(frozen=True)
+class ProgressStats(object):
+    value: float
+    """最近一次显示的进度值"""
+
+    total: float
+    """进度的最大值，未调用start_progressbar()时为0"""
+
+    message: Optional[str]
+    """最近一次显示的消息"""
+
+    rate: Optional[float]
+    """平滑后的进度速率（每秒），尚无法计算时为None"""
+
+    eta: Optional[float]
+    """预计剩余时间（秒），尚无法计算时为None"""
+
+    updates: int
+    """累计调用update()的次数"""
+
+    applied: int
+    """实际刷新到界面上的次数"""
+
+
+class ProgressChannel(object):
+    """
+    进度条更新的合并通道。
+    工作线程调用update()时只是覆盖“最新的(值, 消息)”这一个属性，不加锁，只在尚未安排刷新任务时才向事件循环投递一次任务；
+    主线程中的刷新任务每个刷新周期最多将最新的值应用到进度条一次，中间的值被直接丢弃，没有新的更新时不再安排刷新任务。
+    start_progressbar()、stop_progressbar()等较少调用的操作按调用顺序排队，与update()之间的先后顺序保持不变。
+    进度的速率（指数平滑）和剩余时间根据实际应用的更新计算。
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        flush_interval: int = 16,
+        smoothing: float = 0.3,
+        show_rate: bool = False,
+    ):
+        # target需提供start_progressbar()、update_progressbar()、stop_progressbar()方法（如MainArea）
+        self._target = target
+        self._flush_interval = max(1, int(flush_interval))
+        self._smoothing = min(1.0, max(0.01, smoothing))
+        self._show_rate = show_rate
+        self._counter = itertools.count(1)
+        self._latest: Optional[_Update] = None
+        self._applied_update: Optional[_Update] = None
+        self._lock = threading.Lock()
+        self._commands: List[_Command] = []
+
+        self._updates = 0
+        self._applied = 0
+        self._total = 0.0
+        self._value = 0.0
+        self._message: Optional[str] = None
+        self._rate: Optional[float] = None
+        self._last_sample: Optional[Tuple[float, float]] = None
+
+        self._widget: Optional[Misc] = None
+        self._tick_id: Optional[str] = None
+        # 是否已安排（或已请求安排）刷新任务
+        self._armed = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._widget is not None
+
+    def update(self, value: float, msg: Optional[str] = None) -> None:
+        """更新进度，可在任意线程中调用，开销仅为一次属性赋值"""
+        self._latest = (next(self._counter), value, msg, time.perf_counter())
+        self._updates += 1
+        if not self._armed:
+            self._request_tick()
+
+    def post(self, func: Callable[..., Any], *args) -> None:
+        """将一次界面操作（如启动、停止进度条）加入队列，它将在主线程中按与update()的先后顺序执行"""
+        with self._lock:
+            self._commands.append((next(self._counter), func, args))
+        if not self._armed:
+            self._request_tick()
+
+    def start_progressbar(
+        self,
+        total: int,
+        mode: str = "determinate",
+        initial_value: int = 0,
+        initial_msg: Optional[str] = "",
+    ):
+        self.post(self._apply_start, total, mode, initial_value, initial_msg)
+
+    def stop_progressbar(self, hide_after_stop: bool = False):
+        self.post(self._apply_stop, hide_after_stop)
+
+    def discard(self) -> None:
+        """丢弃尚未应用的更新和操作"""
+        with self._lock:
+            self._commands = []
+        self._applied_update = self._latest
+
+    def start(self, widget: Misc) -> None:
+        """启动周期性刷新任务，必须在主线程中调用"""
+        if self._widget is not None:
+            return
+        self._widget = widget
+        # 处理启动前的更新和操作
+        self._armed = True
+        self._schedule_tick()
+
+    def stop(self, flush: bool = True) -> None:
+        """停止周期性刷新任务，必须在主线程中调用"""
+        if self._widget is None:
+            return
+        if self._tick_id is not None:
+            try:
+                self._widget.after_cancel(self._tick_id)
+            except TclError:
+                pass
+            self._tick_id = None
+        if flush:
+            self.flush()
+        self._widget = None
+
+    def flush(self) -> None:
+        """应用排队的操作和最新的进度，必须在主线程中调用"""
+        # 先取出操作，再读取最新的进度：此时读到的进度一定不早于已取出的操作之前的更新
+        with self._lock:
+            commands, self._commands = self._commands, []
+        latest = self._latest
+        try:
+            for seq, func, args in commands:
+                if latest is not None and latest[0] < seq:
+                    self._apply_update(latest)
+                func(*args)
+            if latest is not None:
+                self._apply_update(latest)
+        except TclError as e:
+            _exception(e, "failed to flush progress channel")
+
+    def stats(self) -> ProgressStats:
+        return ProgressStats(
+            value=self._value,
+            total=self._total,
+            message=self._message,
+            rate=self._rate,
+            eta=self._eta(),
+            updates=self._updates,
+            applied=self._applied,
+        )
+
+    def _apply_start(
+        self, total: int, mode: str, initial_value: int, initial_msg: Optional[str]
+    ):
+        self._total = float(total)
+        self._value = float(initial_value)
+        self._message = initial_msg
+        self._rate = None
+        self._last_sample = None
+        self._target.start_progressbar(total, mode, initial_value, initial_msg)
+
+    def _apply_stop(self, hide_after_stop: bool):
+        self._rate = None
+        self._last_sample = None
+        self._target.stop_progressbar(hide_after_stop)
+
+    def _apply_update(self, update: _Update):
+        if update is self._applied_update:
+            return
+        self._applied_update = update
+        _, value, msg, timestamp = update
+        self._sample(value, timestamp)
+        self._value = value
+        if msg is not None:
+            self._message = msg
+        self._applied += 1
+        if self._show_rate:
+            msg = self._decorate(msg if msg is not None else self._message)
+        self._target.update_progressbar(value, msg)
+
+    def _sample(self, value: float, timestamp: float):
+        last = self._last_sample
+        self._last_sample = (value, timestamp)
+        if last is None:
+            return
+        elapsed = timestamp - last[1]
+        if elapsed <= 0:
+            return
+        rate = (value - last[0]) / elapsed
+        if self._rate is None:
+            self._rate = rate
+        else:
+            self._rate += self._smoothing * (rate - self._rate)
+
+    def _eta(self) -> Optional[float]:
+        if self._rate is None or self._rate <= 0 or self._total <= 0:
+            return None
+        return max(0.0, (self._total - self._value) / self._rate)
+
+    def _decorate(self, msg: Optional[str]) -> Optional[str]:
+        parts = [msg] if msg else []
+        if self._rate is not None:
+            parts.append(f"{self._rate:.1f}/s")
+        eta = self._eta()
+        if eta is not None:
+            parts.append(f"ETA {format_duration(eta)}")
+        return "  ".join(parts) if parts else msg
+
+    def _request_tick(self):
+        # 可在任意线程中调用。多个线程同时请求时可能安排多余的刷新任务，但不会遗漏更新
+        self._armed = True
+        if self._widget is None:
+            return
+        if threading.current_thread() is threading.main_thread():
+            self._schedule_tick()
+        else:
+            UContext.dispatch(self._schedule_tick)
+
+    def _schedule_tick(self):
+        if self._widget is None or self._tick_id is not None:
+            return
+        self._tick_id = self._widget.after(self._flush_interval, self._tick)
+
+    def _tick(self):
+        self._tick_id = None
+        if self._widget is None:
+            return
+        # 先清除标志再刷新，刷新过程中或之后的更新会重新安排刷新任务
+        self._armed = False
+        self.flush()
@@ -0,0 +1,453 @@
+import contextvars
+import dataclasses
+import itertools
+import threading
+import time
+from tkinter import Misc, TclError
+from typing import Optional, Dict, List, Tuple, Any
+
+from pyguiadapterlite.core.ucontext import UContext
+from pyguiadapterlite.utils import _exception
+
+# (值, 消息, 最大值, 时间)
+_Update = Tuple[float, Optional[str], float, float]
+
+# 当前上下文中通过with语句进入的进度任务，新建任务时默认作为其父任务
+_current_task: contextvars.ContextVar[Optional["ProgressTask"]] = (
+    contextvars.ContextVar("_current_progress_task", default=None)
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class ProgressTaskInfo(object):
+    """进度任务在某一时刻的状态，由ProgressTaskBoard.snapshot()生成"""
+
+    task_id: int
+    """任务编号"""
+
+    parent_id: Optional[int]
+    """父任务的编号，顶层任务为None"""
+
+    depth: int
+    """嵌套的层级，顶层任务为0"""
+
+    name: str
+    """任务名称"""
+
+    value: float
+    """当前进度值"""
+
+    total: float
+    """进度的最大值，不大于0时表示总量未知"""
+
+    message: Optional[str]
+    """最近一次更新的消息"""
+
+    rate: Optional[float]
+    """平滑后的进度速率（每秒），尚无法计算时为None"""
+
+    eta: Optional[float]
+    """预计剩余时间（秒），尚无法计算时为None"""
+
+    elapsed: float
+    """任务已进行的时间（秒）"""
+
+    finished: bool
+    """任务是否已结束"""
+
+    subtasks: int
+    """已创建的子任务数"""
+
+    finished_subtasks: int
+    """已结束的子任务数"""
+
+
+class ProgressTask(object):
+    """
+    一个具名的进度任务，由open_progress_task()或ProgressTask.subtask()创建。
+    update()、advance()只是覆盖任务的“最新进度”，可以在任意线程中以任意频率调用；
+    同一个任务应只由一个线程更新。任务可以作为上下文管理器使用，退出时自动结束，
+    在with语句中创建的任务默认成为它的子任务。
+    """
+
+    def __init__(
+        self,
+        board: "ProgressTaskBoard",
+        task_id: int,
+        name: str,
+        total: float,
+        parent: Optional["ProgressTask"],
+        msg: Optional[str],
+        run_id: Optional[int],
+    ):
+        self._board = board
+        self._task_id = task_id
+        self._name = name
+        self._parent = parent
+        self._depth = parent.depth + 1 if parent is not None else 0
+        self._run_id = run_id
+        self._started_at = time.monotonic()
+        self._finished_at: Optional[float] = None
+        self._latest: _Update = (0.0, msg, float(total), time.perf_counter())
+        self._subtasks = 0
+        self._finished_subtasks = 0
+        self._tokens: List[contextvars.Token] = []
+
+        # 以下字段只在主线程中访问
+        self._applied: Optional[_Update] = None
+        self._message = msg
+        self._rate: Optional[float] = None
+        self._last_sample: Optional[Tuple[float, float]] = None
+
+    @property
+    def task_id(self) -> int:
+        return self._task_id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def parent(self) -> Optional["ProgressTask"]:
+        return self._parent
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def run_id(self) -> Optional[int]:
+        return self._run_id
+
+    @property
+    def value(self) -> float:
+        return self._latest[0]
+
+    @property
+    def total(self) -> float:
+        return self._latest[2]
+
+    @property
+    def is_finished(self) -> bool:
+        return self._finished_at is not None
+
+    def update(self, value: float, msg: Optional[str] = None) -> None:
+        """设置任务的进度"""
+        if self._finished_at is not None:
+            return
+        self._latest = (value, msg, self._latest[2], time.perf_counter())
+        self._board._touched(self)
+
+    def advance(self, step: float = 1, msg: Optional[str] = None) -> None:
+        """在当前进度的基础上前进step"""
+        self.update(self._latest[0] + step, msg)
+
+    def set_total(self, total: float) -> None:
+        """修改进度的最大值"""
+        value, msg, _, _ = self._latest
+        self._latest = (value, msg, float(total), time.perf_counter())
+        self._board._touched(self)
+
+    def subtask(
+        self, name: str, total: float = 0, msg: Optional[str] = None
+    ) -> "ProgressTask":
+        """创建一个子任务"""
+        return self._board.open(name, total, parent=self, msg=msg, run_id=self._run_id)
+
+    def finish(self, msg: Optional[str] = None) -> None:
+        """结束任务，未结束的子任务也将一并结束"""
+        if self._finished_at is not None:
+            return
+        if msg is not None:
+            value, _, total, _ = self._latest
+            self._latest = (value, msg, total, time.perf_counter())
+        self._board._finished(self)
+
+    def __enter__(self) -> "ProgressTask":
+        self._tokens.append(_current_task.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._tokens:
+            try:
+                _current_task.reset(self._tokens.pop())
+            except ValueError:
+                # 在与进入时不同的上下文中退出
+                pass
+        self.finish()
+        return False
+
+    def __repr__(self) -> str:
+        return f"ProgressTask(id={self._task_id}, name={self._name!r})"
+
+
+def current_task() -> Optional[ProgressTask]:
+    """当前上下文中通过with语句进入的最内层进度任务"""
+    return _current_task.get()
+
+
+class ProgressTaskBoard(object):
+    """
+    进度任务的集合，负责将各个任务的更新合并后刷新到界面上。
+    任务的更新只设置一个“有变化”的标志，主线程中的刷新任务在每个刷新周期内最多调用一次target.render()，
+    并只在有变化时调用；没有变化、也没有等待移除的任务时不再安排刷新任务。
+    任务结束后其子任务立即从面板上折叠（只在父任务上显示已完成的子任务数），
+    顶层任务结束后继续显示linger秒，然后被移除，因此即使创建了大量的子任务，面板上也只显示少量的行。
+    """
+
+    def __init__(
+        self,
+        target: Any = None,
+        flush_interval: int = 16,
+        linger: float = 1.0,
+        smoothing: float = 0.3,
+    ):
+        # target需提供render(任务状态列表)方法（如ProgressTaskPanel）
+        self._target = target
+        self._flush_interval = max(1, int(flush_interval))
+        self._linger = max(0.0, linger)
+        self._smoothing = min(1.0, max(0.01, smoothing))
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, ProgressTask] = {}
+        self._dirty = False
+        # 最早一个已结束的顶层任务应被移除的时间
+        self._next_expiry: Optional[float] = None
+        self._renders = 0
+
+        self._widget: Optional[Misc] = None
+        self._tick_id: Optional[str] = None
+        # 是否已安排（或已请求安排）刷新任务
+        self._armed = False
+
+    @property
+    def renders(self) -> int:
+        """实际刷新界面的次数"""
+        return self._renders
+
+    def open(
+        self,
+        name: str,
+        total: float = 0,
+        parent: Optional[ProgressTask] = None,
+        msg: Optional[str] = None,
+        run_id: Optional[int] = None,
+    ) -> ProgressTask:
+        """创建一个任务，可在任意线程中调用"""
+        if parent is not None and parent.is_finished:
+            parent = None
+        task = ProgressTask(self, next(self._counter), name, total, parent, msg, run_id)
+        with self._lock:
+            self._tasks[task.task_id] = task
+            if parent is not None:
+                parent._subtasks += 1
+        self._mark_dirty()
+        self._opened(task)
+        return task
+
+    def tasks(self) -> List[ProgressTask]:
+        """尚未从面板上移除的任务"""
+        with self._lock:
+            return list(self._tasks.values())
+
+    def finish_run(self, run_id: Optional[int] = None) -> None:
+        """结束某次执行（run_id为None时为所有执行）中尚未结束的任务，可在任意线程中调用"""
+        for task in self.tasks():
+            if run_id is None or task.run_id == run_id:
+                task.finish()
+
+    def clear(self) -> None:
+        """移除所有任务"""
+        with self._lock:
+            for task in self._tasks.values():
+                if task._finished_at is None:
+                    task._finished_at = time.monotonic()
+            self._tasks.clear()
+        self._mark_dirty()
+
+    def snapshot(self) -> List[ProgressTaskInfo]:
+        """
+        移除已折叠或显示时间已到的任务，返回其余任务的状态，父任务在前、子任务紧随其后。
+        必须在主线程中调用。
+        """
+        now = time.monotonic()
+        with self._lock:
+            for task_id in [
+                task_id
+                for task_id, task in self._tasks.items()
+                if self._is_expired(task, now)
+            ]:
+                del self._tasks[task_id]
+            tasks = list(self._tasks.values())
+        self._next_expiry = min(
+            (
+                task._finished_at + self._linger
+                for task in tasks
+                if task._finished_at is not None
+            ),
+            default=None,
+        )
+        task_ids = {task.task_id for task in tasks}
+        children: Dict[Optional[int], List[ProgressTask]] = {}
+        for task in tasks:
+            parent_id = task.parent.task_id if task.parent is not None else None
+            if parent_id is not None and parent_id not in task_ids:
+                parent_id = None
+            children.setdefault(parent_id, []).append(task)
+
+        result: List[ProgressTaskInfo] = []
+
+        def _visit(parent_id: Optional[int]):
+            for child in children.get(parent_id, ()):
+                result.append(self._info(child, now))
+                _visit(child.task_id)
+
+        _visit(None)
+        return result
+
+    def start(self, widget: Misc) -> None:
+        """启动周期性刷新任务，必须在主线程中调用"""
+        if self._widget is not None:
+            return
+        self._widget = widget
+        # 处理启动前创建的任务
+        self._armed = True
+        self._schedule_tick(self._flush_interval)
+
+    def stop(self, flush: bool = True) -> None:
+        """停止周期性刷新任务，必须在主线程中调用"""
+        if self._widget is None:
+            return
+        if self._tick_id is not None:
+            try:
+                self._widget.after_cancel(self._tick_id)
+            except TclError:
+                pass
+            self._tick_id = None
+        if flush:
+            self.flush()
+        self._widget = None
+
+    def flush(self) -> None:
+        """任务有变化时刷新界面，必须在主线程中调用"""
+        if not self._dirty and not self._expiry_due():
+            return
+        self._dirty = False
+        infos = self.snapshot()
+        if self._target is None:
+            return
+        try:
+            self._target.render(infos)
+            self._renders += 1
+        except TclError as e:
+            _exception(e, "failed to render progress tasks")
+
+    def _opened(self, task: ProgressTask) -> None:
+        pass
+
+    def _touched(self, task: ProgressTask) -> None:
+        _ = task
+        self._mark_dirty()
+
+    def _finished(self, task: ProgressTask) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._finish_locked(task, now)
+        self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        # 可在任意线程中调用，尚未安排刷新任务时请求主线程安排
+        self._dirty = True
+        if self._armed:
+            return
+        self._armed = True
+        if self._widget is None:
+            return
+        if threading.current_thread() is threading.main_thread():
+            self._schedule_tick(self._flush_interval)
+        else:
+            UContext.dispatch(self._schedule_tick, self._flush_interval)
+
+    def _finish_locked(self, task: ProgressTask, now: float):
+        if task._finished_at is not None:
+            return
+        task._finished_at = now
+        if task.parent is not None:
+            task.parent._finished_subtasks += 1
+        for child in self._tasks.values():
+            if child.parent is task:
+                self._finish_locked(child, now)
+
+    def _is_expired(self, task: ProgressTask, now: float) -> bool:
+        if task._finished_at is None:
+            return False
+        if task.parent is not None:
+            return True
+        return now - task._finished_at >= self._linger
+
+    def _expiry_due(self) -> bool:
+        expiry = self._next_expiry
+        return expiry is not None and time.monotonic() >= expiry
+
+    def _info(self, task: ProgressTask, now: float) -> ProgressTaskInfo:
+        latest = task._latest
+        if latest is not task._applied:
+            task._applied = latest
+            value, msg, _, timestamp = latest
+            self._sample(task, value, timestamp)
+            if msg is not None:
+                task._message = msg
+        value, _, total, _ = latest
+        finished = task._finished_at is not None
+        end = task._finished_at if finished else now
+        eta = None
+        if not finished and task._rate and task._rate > 0 and total > 0:
+            eta = max(0.0, (total - value) / task._rate)
+        return ProgressTaskInfo(
+            task_id=task.task_id,
+            parent_id=task.parent.task_id if task.parent is not None else None,
+            depth=task.depth,
+            name=task.name,
+            value=value,
+            total=total,
+            message=task._message,
+            rate=task._rate,
+            eta=eta,
+            elapsed=end - task._started_at,
+            finished=finished,
+            subtasks=task._subtasks,
+            finished_subtasks=task._finished_subtasks,
+        )
+
+    def _sample(self, task: ProgressTask, value: float, timestamp: float):
+        last = task._last_sample
+        task._last_sample = (value, timestamp)
+        if last is None:
+            return
+        elapsed = timestamp - last[1]
+        if elapsed <= 0:
+            return
+        rate = (value - last[0]) / elapsed
+        if task._rate is None:
+            task._rate = rate
+        else:
+            task._rate += self._smoothing * (rate - task._rate)
+
+    def _schedule_tick(self, delay: int):
+        if self._widget is None or self._tick_id is not None:
+            return
+        self._tick_id = self._widget.after(delay, self._tick)
+
+    def _tick(self):
+        self._tick_id = None
+        if self._widget is None:
+            return
+        # 先清除标志再刷新，刷新过程中或之后的变化会重新安排刷新任务
+        self._armed = False
+        self.flush()
+        expiry = self._next_expiry
+        if expiry is not None and not self._armed:
+            # 已结束的顶层任务需要在显示时间到期后移除
+            delay = int((expiry - time.monotonic()) * 1000) + 1
+            self._armed = True
+            self._schedule_tick(max(self._flush_interval, delay))
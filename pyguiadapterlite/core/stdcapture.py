@@ -0,0 +1,160 @@
+import contextvars
+import sys
+import threading
+from typing import Callable, Optional, List
+
+_install_lock = threading.Lock()
+
+# 当前上下文中生效的输出捕获。它随contextvars上下文传递到该上下文中创建的Task，
+# 以及通过共享线程池、copy_run_context()等方式在该上下文中执行的线程
+_current_capture: "contextvars.ContextVar[Optional[StdCapture]]" = (
+    contextvars.ContextVar("pyguiadapterlite_std_capture", default=None)
+)
+
+
+class LineBufferedWriter(object):
+    """将零散的写入合并为整行后再转发，减少输出通道中的文本块数量"""
+
+    def __init__(
+        self, write: Callable[[str], None], prefix: str = "", suffix: str = ""
+    ):
+        self._write = write
+        self._prefix = prefix
+        self._suffix = suffix
+        self._buffer: List[str] = []
+        # 同一次执行中的多个线程可能同时写入
+        self._lock = threading.Lock()
+
+    def write(self, text: str):
+        newline = text.rfind("\n")
+        with self._lock:
+            if newline < 0:
+                self._buffer.append(text)
+                return
+            self._buffer.append(text[: newline + 1])
+            lines = "".join(self._buffer)
+            rest = text[newline + 1 :]
+            self._buffer = [rest] if rest else []
+        self._write(f"{self._prefix}{lines}{self._suffix}")
+
+    def flush(self):
+        with self._lock:
+            if not self._buffer:
+                return
+            text = "".join(self._buffer)
+            self._buffer = []
+        self._write(f"{self._prefix}{text}{self._suffix}")
+
+
+class ThreadRoutedStream(object):
+    """
+    sys.stdout/sys.stderr的代理对象。
+    写入的内容被转发到当前contextvars上下文中生效的StdCapture，没有生效的StdCapture时仍写入原始流。
+    按上下文（而非线程）路由，因此共享同一个事件循环线程的多个Task可以分别捕获各自的输出。
+    原始流为None时（如通过pythonw运行或打包为无控制台的程序），未被捕获的写入被忽略，与未安装代理时print()的行为一致。
+    """
+
+    def __init__(self, original, is_stderr: bool = False):
+        self._original = original
+        self._is_stderr = is_stderr
+
+    @property
+    def original(self):
+        return self._original
+
+    def _writer(self) -> Optional[LineBufferedWriter]:
+        capture = _current_capture.get()
+        if capture is None or not capture.active:
+            return None
+        return capture.stderr_writer if self._is_stderr else capture.stdout_writer
+
+    def write(self, text: str) -> int:
+        writer = self._writer()
+        if writer is None:
+            if self._original is None:
+                return len(text)
+            return self._original.write(text)
+        writer.write(text)
+        return len(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        writer = self._writer()
+        if writer is None:
+            if self._original is not None:
+                self._original.flush()
+        else:
+            writer.flush()
+
+    def isatty(self) -> bool:
+        if self._original is None or self._writer() is not None:
+            return False
+        return self._original.isatty()
+
+    def __getattr__(self, item):
+        return getattr(self._original, item)
+
+
+def install_stream_proxies():
+    """使用按上下文路由的代理对象替换sys.stdout和sys.stderr，重复调用不会产生副作用"""
+    with _install_lock:
+        if not isinstance(sys.stdout, ThreadRoutedStream):
+            sys.stdout = ThreadRoutedStream(sys.stdout)
+        if not isinstance(sys.stderr, ThreadRoutedStream):
+            sys.stderr = ThreadRoutedStream(sys.stderr, is_stderr=True)
+
+
+class StdCapture(object):
+    """
+    在当前contextvars上下文中捕获写入sys.stdout和sys.stderr的内容，按行转发到write。
+    捕获对当前线程（或当前Task）以及在该上下文中启动的Task和线程池任务生效，不影响其他执行。
+    用法：
+        with StdCapture(write):
+            ...
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str], None],
+        stderr_prefix: str = "\x1b[91m",
+        stderr_suffix: str = "\x1b[0m",
+    ):
+        self._stdout_writer = LineBufferedWriter(write)
+        self._stderr_writer = LineBufferedWriter(write, stderr_prefix, stderr_suffix)
+        self._token: Optional[contextvars.Token] = None
+        self._active = False
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    @property
+    def stdout_writer(self) -> LineBufferedWriter:
+        return self._stdout_writer
+
+    @property
+    def stderr_writer(self) -> LineBufferedWriter:
+        return self._stderr_writer
+
+    def __enter__(self) -> "StdCapture":
+        install_stream_proxies()
+        self._active = True
+        self._token = _current_capture.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # 继承了该上下文、仍在运行的线程此后的输出写入原始流
+        self._active = False
+        token, self._token = self._token, None
+        if token is not None:
+            try:
+                _current_capture.reset(token)
+            except ValueError:
+                # 在与进入时不同的上下文中退出
+                pass
+        self._stdout_writer.flush()
+        self._stderr_writer.flush()
+        return False
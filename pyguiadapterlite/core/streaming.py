@@ -0,0 +1,198 @@
+import dataclasses
+import inspect
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Callable, List, Union
+
+from pyguiadapterlite.utils import _exception
+
+# on_items(结果流, 第一项的序号, 新产生的各项)
+ItemsCallback = Callable[["ResultStream", int, List[Any]], None]
+
+
+@dataclasses.dataclass(frozen=True)
+class StreamedResult(object):
+    """生成器函数产生的结果过多（或未收集结果）时，代替结果列表作为函数的最终结果"""
+
+    count: int
+    """产生的结果数"""
+
+    path: Optional[str]
+    """结果流文件的路径，未写入文件时为None"""
+
+    def __str__(self) -> str:
+        if self.path:
+            return f"<{self.count} results streamed to {self.path}>"
+        return f"<{self.count} results streamed>"
+
+
+def is_result_stream(value: Any) -> bool:
+    """判断函数的返回值是否为需要逐项消费的生成器或异步生成器"""
+    return inspect.isgenerator(value) or inspect.isasyncgen(value)
+
+
+def result_stream_path(
+    directory: Union[str, Path, None], fn_name: str, run_id: int
+) -> Path:
+    """结果流文件的路径，directory为None时使用系统临时目录"""
+    if directory is None:
+        directory = Path(tempfile.gettempdir()) / "pyguiadapterlite" / "results"
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    return Path(directory) / f"{fn_name}-{timestamp}-{run_id}.jsonl"
+
+
+class ResultStream(object):
+    """
+    逐项接收生成器函数产生的结果。
+    每一项被追加到磁盘上的结果流文件中（JSON Lines格式，每行为{"index": 序号, "value": 值}，
+    无法序列化为JSON的值以{"index": 序号, "repr": repr(值)}的形式保存），
+    并通过schedule()分批转交给on_items回调：两次回调之间产生的多个结果将被合并为一次回调，避免界面被大量的回调阻塞。
+    collect为True时结果同时被收集到列表中，作为函数的最终结果；收集的项数超过max_collected（0表示不限制）后将停止收集，
+    最终结果变为StreamedResult，以限制内存的占用。
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        on_items: Optional[ItemsCallback] = None,
+        schedule: Optional[Callable[[Callable[[], None]], None]] = None,
+        collect: bool = True,
+        max_collected: int = 0,
+    ):
+        self._path: Optional[Path] = None
+        self._file = None
+        if path is not None:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(path, "a", encoding="utf-8")
+                self._path = Path(path)
+            except OSError as e:
+                _exception(e, f"failed to open result stream file: {path}")
+        self._on_items = on_items
+        self._schedule = schedule or (lambda callback: callback())
+        self._collect = collect
+        self._max_collected = max(0, max_collected)
+        self._collected: Optional[List[Any]] = [] if collect else None
+        self._count = 0
+        self._lock = threading.Lock()
+        self._pending: List[Any] = []
+        self._delivered = 0
+        self._scheduled = False
+        self._closed = False
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def append(self, item: Any):
+        if self._file is not None:
+            self._write(self._count, item)
+        if self._collected is not None:
+            if self._max_collected and len(self._collected) >= self._max_collected:
+                self._collected = None
+            else:
+                self._collected.append(item)
+        self._count += 1
+        if self._on_items is None:
+            return
+        with self._lock:
+            self._pending.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule(self._deliver)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                _exception(e, "failed to close result stream file")
+            self._file = None
+
+    def result(self, return_value: Any = None) -> Any:
+        """函数的最终结果：生成器的返回值（不为None时），否则为收集的结果列表或StreamedResult"""
+        if return_value is not None:
+            return return_value
+        if self._collected is not None:
+            return self._collected
+        return StreamedResult(
+            count=self._count,
+            path=str(self._path) if self._path is not None else None,
+        )
+
+    def _write(self, index: int, item: Any):
+        try:
+            line = json.dumps({"index": index, "value": item}, ensure_ascii=False)
+        except (TypeError, ValueError):
+            line = json.dumps({"index": index, "repr": repr(item)}, ensure_ascii=False)
+        try:
+            self._file.write(line + "\n")
+        except OSError as e:
+            _exception(e, "failed to write result stream file, stop writing")
+            self._file = None
+
+    def _deliver(self):
+        with self._lock:
+            items, self._pending = self._pending, []
+            start = self._delivered
+            self._delivered += len(items)
+            self._scheduled = False
+        if items:
+            try:
+                self._on_items(self, start, items)
+            except BaseException as e:
+                _exception(e, "exception raised in result stream callback")
+
+
+def consume_generator(
+    generator, stream: ResultStream, cancel_event: Optional[threading.Event] = None
+) -> Any:
+    """
+    逐项消费生成器，返回stream.result()。
+    cancel_event被设置后将在产生下一项之前关闭生成器，已产生的结果将被保留。
+    """
+    return_value = None
+    try:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                generator.close()
+                break
+            try:
+                item = next(generator)
+            except StopIteration as e:
+                return_value = e.value
+                break
+            stream.append(item)
+    finally:
+        stream.close()
+    return stream.result(return_value)
+
+
+async def consume_async_generator(
+    generator, stream: ResultStream, cancel_event: Optional[threading.Event] = None
+) -> Any:
+    """consume_generator()的异步版本，用于异步生成器"""
+    try:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                await generator.aclose()
+                break
+            try:
+                item = await generator.__anext__()
+            except StopAsyncIteration:
+                break
+            stream.append(item)
+    finally:
+        stream.close()
+    return stream.result()
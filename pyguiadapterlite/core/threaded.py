@@ -1,8 +1,15 @@
+import contextlib
 import threading
-from typing import Dict, Any, Optional
+from concurrent.futures import Future
+from functools import partial
+from typing import Dict, Any, Optional, ContextManager, Iterator
 
 from pyguiadapterlite.core.fn import BaseFunctionExecutor, FnInfo, ExecuteStateListener
-from pyguiadapterlite.core.ucontext import UContext
+from pyguiadapterlite.core.stdcapture import StdCapture
+from pyguiadapterlite.core.streaming import is_result_stream
+from pyguiadapterlite.core.ucontext import UContext, RunContext
+from pyguiadapterlite.core.watchdog import WatchHandle, ExecutionTimeoutError
+from pyguiadapterlite.core.workerpool import WorkerPool, default_worker_pool
 from pyguiadapterlite.utils import _exception
 
 
@@ -12,10 +19,20 @@ class ThreadRunningException(RuntimeError):
 
 class ThreadedExecutor(BaseFunctionExecutor):
 
-    def __init__(self, listener: Optional[ExecuteStateListener] = None):
+    def __init__(
+        self,
+        listener: Optional[ExecuteStateListener] = None,
+        pool: Optional[WorkerPool] = None,
+    ):
         super().__init__(listener)
+        # 所有执行器默认共享同一个线程池，避免每次执行都创建新线程
+        self._pool = pool or default_worker_pool()
         self._is_executing = False
-        self._current_thread = None
+        self._current_future: Optional[Future] = None
+        self._current_run: Optional[RunContext] = None
+        # 尚未报告结束的执行，用于保证每次执行只报告一次结束（硬超时后线程可能仍在运行）
+        self._unfinished_run: Optional[RunContext] = None
+        self._watch: Optional[WatchHandle] = None
         self._cancel_event = threading.Event()
         self._state_lock = threading.Lock()
 
@@ -23,23 +40,45 @@ class ThreadedExecutor(BaseFunctionExecutor):
         with self._state_lock:
             if self._is_executing:
                 raise ThreadRunningException("a function is already executing")
-            # 重置状态
+            # 重置状态，每次执行使用新的取消标志，以免影响因硬超时而被放弃、仍在运行的线程
             self._is_executing = True
-            self._cancel_event.clear()
-            UContext.current_thread_created(self._cancel_event)
+            self._cancel_event = threading.Event()
 
         # 必要的检查
         if not UContext.app_instance():
             raise RuntimeError("tkinter is not initialized yet")
 
+        # 创建本次执行的上下文，它将被绑定到执行函数的线程上
+        run = self.create_run_context(fn_info, arguments, self._cancel_event)
+        self._current_run = run
+        self._unfinished_run = run
         if self._listener:
             # 回调before_execute()，该方法在主线程中执行
             self._listener.before_execute(fn_info, arguments)
-        # 启动线程执行目标函数
-        self._current_thread = threading.Thread(
-            target=self._execute_in_thread, args=(fn_info, arguments), daemon=True
-        )
-        self._current_thread.start()
+        with self._state_lock:
+            # 在线程池中执行目标函数
+            self._current_future = self._pool.submit(
+                self._execute_in_thread,
+                fn_info,
+                arguments,
+                run,
+                run_context=partial(self._run_context, fn_info, run),
+            )
+            # 提交之后再开始计时，硬超时到期时_current_future已被赋值；函数已经结束时不再计时
+            if self._unfinished_run is run:
+                self._watch = self.watch_timeouts(
+                    fn_info,
+                    run,
+                    partial(self._on_hard_timeout, fn_info, arguments, run),
+                )
+
+    @property
+    def pool(self) -> WorkerPool:
+        return self._pool
+
+    @property
+    def current_run(self) -> Optional[RunContext]:
+        return self._current_run
 
     @property
     def is_cancelled(self) -> bool:
@@ -59,50 +98,99 @@ class ThreadedExecutor(BaseFunctionExecutor):
         with self._state_lock:
             self._cancel_event.set()
 
+    def _on_hard_timeout(
+        self, fn_info: FnInfo, arguments: Dict[str, Any], run: RunContext
+    ):
+        # 注意该方法在监视线程中被调用。
+        # Python无法安全地终止线程，因此只能放弃该线程：立即报告超时，线程结束后其结果将被忽略。
+        # 被放弃的线程不再占用共享线程池的名额，以免多次硬超时后线程池被占满
+        run.cancel_event.set()
+        with self._state_lock:
+            future = self._current_future if self._unfinished_run is run else None
+        if future is not None:
+            self._pool.abandon(future)
+        error = ExecutionTimeoutError(fn_info.hard_timeout)
+        self._on_finish(fn_info, arguments, None, error, run)
+
     def _on_finish(
         self,
         fn_info: FnInfo,
         arguments: Dict[str, Any],
         return_value: Any,
         exception: Optional[BaseException],
+        run: RunContext,
     ):
+        with self._state_lock:
+            if self._unfinished_run is not run:
+                # 本次执行已经报告过结束（例如已因硬超时被放弃）
+                return
+            self._unfinished_run = None
+            watch, self._watch = self._watch, None
+        if watch is not None:
+            watch.cancel()
+
         def _callback():
             self._is_executing = False
-            self._cancel_event.clear()
-            self._current_thread = None
+            self._current_future = None
+            self._current_run = None
             if self._listener:
                 self._listener.on_execute_finish(
                     fn_info, arguments, return_value, exception
                 )
 
-        tk_instance = UContext.app_instance()
-        assert tk_instance is not None
-        tk_instance.after(0, _callback)
+        UContext.dispatch(_callback)
 
     def _on_start(self, fn_info: FnInfo, arguments: Dict[str, Any]):
-        tk_instance = UContext.app_instance()
-        assert tk_instance is not None
         if self._listener:
-            tk_instance.after(0, self._listener.on_execute_start, fn_info, arguments)
-
-    def _execute_in_thread(self, fn_info: FnInfo, arguments: Dict[str, Any]):
+            UContext.dispatch(self._listener.on_execute_start, fn_info, arguments)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _run_context(fn_info: FnInfo, run: RunContext) -> Iterator[None]:
+        # 线程池中的线程会被复用，在每次执行前后绑定和解除执行上下文，并设置和恢复线程名称
+        thread = threading.current_thread()
+        name = thread.name
+        thread.name = f"{name}:{fn_info.fn_name}#{run.run_id}"
+        try:
+            with UContext.run_bound(run):
+                yield
+        finally:
+            thread.name = name
+
+    @staticmethod
+    def _output_capture(fn_info: FnInfo) -> ContextManager:
+        # 若开启了capture_output选项，则将当前线程写入sys.stdout/sys.stderr的内容转发到输出通道
+        if not getattr(fn_info.window_config, "capture_output", False):
+            return contextlib.nullcontext()
+        channel = UContext.current_output_channel()
+        if channel is None:
+            return contextlib.nullcontext()
+        return StdCapture(channel.write)
+
+    def _execute_in_thread(
+        self, fn_info: FnInfo, arguments: Dict[str, Any], run: RunContext
+    ):
         # 注意该方法会在子线程中被调用
         try:
             arguments = arguments or {}
             self._on_start(fn_info, arguments)
             fn = fn_info.fn
             arguments = arguments.copy()
-            result = fn(**arguments)
-            self._on_finish(fn_info, arguments, result, None)
+            with self._output_capture(fn_info):
+                result = fn(**arguments)
+                if is_result_stream(result):
+                    # 生成器函数：逐项消费，并将各项实时转交给界面
+                    result = self.consume_result_stream(fn_info, run, result)
+            self._on_finish(fn_info, arguments, result, None, run)
         except SystemExit as e:
             _exception(e, "SystemExit caught in function execution thread")
             if fn_info.capture_system_exit_exception:
-                self._on_finish(fn_info, arguments, None, e)
+                self._on_finish(fn_info, arguments, None, e, run)
             else:
                 tk_instance = UContext.app_instance()
                 if not tk_instance:
                     exit(e.code)
                 else:
-                    tk_instance.after(0, tk_instance.quit)
+                    UContext.dispatch(tk_instance.quit)
         except BaseException as e:
-            self._on_finish(fn_info, arguments, None, e)
+            self._on_finish(fn_info, arguments, None, e, run)
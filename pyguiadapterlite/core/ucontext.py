@@ -1,29 +1,110 @@
+import contextlib
+import contextvars
+import dataclasses
+import itertools
+import os
 import threading
+import time
+from concurrent.futures import Future
 from tkinter import Tk, TclError
-from typing import Optional
+from typing import Optional, Any, Iterator, Callable
 
+from pyguiadapterlite.core.dispatcher import default_ui_dispatcher, FutureCall
 from pyguiadapterlite.utils import _exception
 
+_run_ids = itertools.count(1)
+
+
+@dataclasses.dataclass
+class RunContext(object):
+    """一次函数执行的上下文，context中的各函数通过它找到对应的窗口、取消标志和输出通道"""
+
+    run_id: int
+    """执行编号"""
+
+    window: Any
+    """执行函数的窗口（FnExecuteWindow）"""
+
+    cancel_event: threading.Event
+    """取消标志"""
+
+    output_channel: Any = None
+    """本次执行的输出通道，为None时使用窗口的输出通道"""
+
+    started_at: float = dataclasses.field(default_factory=time.monotonic)
+    """创建时间（time.monotonic()）"""
+
+    @property
+    def output(self) -> Any:
+        if self.output_channel is not None:
+            return self.output_channel
+        if self.window is not None:
+            return self.window.output_channel
+        return None
+
+
+# 当前所处的执行上下文。执行器在执行函数前设置它，它会随contextvars上下文传递到函数创建的线程和任务中
+_current_run: "contextvars.ContextVar[Optional[RunContext]]" = contextvars.ContextVar(
+    "pyguiadapterlite_current_run", default=None
+)
+
 
 class UContext(object):
     _tk_instance: Optional[Tk] = None
+    _tk_pid: Optional[int] = None
+    # 以下两个类属性仅在未绑定执行上下文时（如在主线程中）作为后备使用
     _fn_execute_window = None
     _current_cancel_event: Optional[threading.Event] = None
 
     @classmethod
     def app_started(cls, tk_instance: Tk):
         cls._tk_instance = tk_instance
+        cls._tk_pid = os.getpid()
+        default_ui_dispatcher().start(tk_instance)
 
     @classmethod
     def app_quit(cls):
+        default_ui_dispatcher().stop()
         cls._tk_instance = None
 
+    @classmethod
+    def dispatch(cls, func: Callable[..., Any], *args, **kwargs) -> None:
+        """
+        在主线程中执行func，可在任意线程中调用。
+        操作进入共享的界面操作队列，由主线程批量执行；队列未启动时（如未通过GUIAdapter.run()启动主循环）
+        退回到Tk.after(0)，没有Tk实例时（如在工作进程中）直接调用。
+        """
+        dispatcher = default_ui_dispatcher()
+        if dispatcher.is_running:
+            dispatcher.submit(func, *args, **kwargs)
+            return
+        tk_instance = cls._tk_instance
+        if tk_instance is not None and cls._tk_pid == os.getpid():
+            tk_instance.after(0, lambda: func(*args, **kwargs))
+            return
+        func(*args, **kwargs)
+
+    @classmethod
+    def dispatch_call(cls, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        与dispatch()相同，但返回func的结果的Future。
+        在主线程中调用时直接执行func，避免主线程等待自身处理的队列而死锁。
+        """
+        call = FutureCall(func, *args, **kwargs)
+        dispatcher = default_ui_dispatcher()
+        if dispatcher.is_running and dispatcher.is_main_thread():
+            call()
+        else:
+            cls.dispatch(call)
+        return call.future
+
     @classmethod
     def app_instance(cls) -> Optional[Tk]:
         return cls._tk_instance
 
     @classmethod
     def reset(cls):
+        default_ui_dispatcher().stop()
         if cls._tk_instance:
             try:
                 cls._tk_instance.destroy()
@@ -43,12 +124,27 @@ class UContext(object):
 
     @classmethod
     def current_execute_window(cls):
+        run = cls.current_run()
+        if run is not None and run.window is not None:
+            return run.window
         return cls._fn_execute_window
 
     @classmethod
     def current_cancel_event(cls) -> Optional[threading.Event]:
+        run = cls.current_run()
+        if run is not None:
+            return run.cancel_event
         return cls._current_cancel_event
 
+    @classmethod
+    def current_output_channel(cls):
+        """当前执行上下文的输出通道，未绑定执行上下文时为当前窗口的输出通道"""
+        run = cls.current_run()
+        if run is not None:
+            return run.output
+        window = cls._fn_execute_window
+        return window.output_channel if window is not None else None
+
     @classmethod
     def current_thread_created(cls, cancel_event: threading.Event):
         cls._current_cancel_event = cancel_event
@@ -56,3 +152,43 @@ class UContext(object):
     @classmethod
     def current_thread_finished(cls):
         cls._current_cancel_event = None
+
+    @classmethod
+    def next_run_id(cls) -> int:
+        return next(_run_ids)
+
+    @classmethod
+    def current_run(cls) -> Optional[RunContext]:
+        return _current_run.get()
+
+    @classmethod
+    def bind_run(cls, run: Optional[RunContext]) -> contextvars.Token:
+        """在当前contextvars上下文中绑定执行上下文，返回的token可用于unbind_run()"""
+        return _current_run.set(run)
+
+    @classmethod
+    def unbind_run(cls, token: contextvars.Token):
+        _current_run.reset(token)
+
+    @classmethod
+    @contextlib.contextmanager
+    def run_bound(cls, run: Optional[RunContext]) -> Iterator[Optional[RunContext]]:
+        token = cls.bind_run(run)
+        try:
+            yield run
+        finally:
+            cls.unbind_run(token)
+
+    @classmethod
+    def run_context_wrapper(cls, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        返回一个包装函数，它在调用时所处的contextvars上下文（包括当前的执行上下文）中调用func。
+        用于将执行上下文传递到其他线程中执行的函数。
+        """
+        ctx = contextvars.copy_context()
+
+        def _wrapper(*args, **kwargs):
+            # 同一个Context对象不能被多个线程同时进入，因此每次调用时使用它的副本
+            return ctx.copy().run(func, *args, **kwargs)
+
+        return _wrapper
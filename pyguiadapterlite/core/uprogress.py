@@ -0,0 +1,385 @@
+"""
+与tqdm兼容的进度显示工具，将进度显示在函数执行窗口的进度条和进度标签上，而不是在输出区域中重绘文本进度条。
+进度的更新通过窗口的进度通道转交给主线程，工作线程中不会直接访问Tk。
+"""
+
+import re
+import time
+from asyncio import CancelledError
+from typing import Any, Iterable, Optional, Dict, Iterator
+
+from pyguiadapterlite.components.runlist import format_duration
+from pyguiadapterlite.core import context
+from pyguiadapterlite.core.ucontext import UContext
+
+_SI_PREFIXES = ("", "k", "M", "G", "T", "P", "E", "Z", "Y")
+
+
+def format_count(value: float, unit_scale: bool = False) -> str:
+    """格式化计数，unit_scale为True时使用k、M、G等单位前缀"""
+    if not unit_scale:
+        return f"{value:g}" if isinstance(value, float) else str(value)
+    for prefix in _SI_PREFIXES:
+        if abs(value) < 999.5:
+            if abs(value) < 99.95:
+                return f"{value:.2f}{prefix}" if prefix else f"{value:g}"
+            return f"{value:.1f}{prefix}" if prefix else f"{value:g}"
+        value /= 1000.0
+    return f"{value:.1f}Y"
+
+
+def _progressbar_available() -> bool:
+    # 只读取窗口的状态，不访问Tk，可在工作线程中调用
+    window = UContext.current_execute_window()
+    return window is not None and window.is_progressbar_enabled()
+
+
+def _raise_cancelled():
+    # 与Task.cancel()一致，窗口将其视为“已取消”而不是错误
+    raise CancelledError("progress iteration cancelled")
+
+
+class ProgressIterator(object):
+    """
+    tqdm的替代品，可以直接替换tqdm(iterable, desc=..., total=...)：
+    迭代的进度、速率和预计剩余时间显示在执行窗口的进度条和进度标签中。
+    每隔mininterval秒最多刷新一次（刷新本身也只是更新进度通道中的最新值），速率按smoothing进行指数平滑。
+    每一步都会检查函数是否被请求取消，若是则抛出asyncio.CancelledError（stop_on_cancel为True时结束迭代）。
+    不在函数执行期间（没有执行窗口）使用时只进行迭代，不显示进度。
+    """
+
+    def __init__(
+        self,
+        iterable: Optional[Iterable[Any]] = None,
+        desc: Optional[str] = None,
+        total: Optional[float] = None,
+        leave: bool = True,
+        mininterval: float = 0.1,
+        miniters: Optional[int] = None,
+        unit: str = "it",
+        unit_scale: bool = False,
+        disable: bool = False,
+        smoothing: float = 0.3,
+        initial: float = 0,
+        postfix: Any = None,
+        check_cancel: bool = True,
+        stop_on_cancel: bool = False,
+        **kwargs: Any,
+    ):
+        # 其余tqdm参数（file、ncols、position、bar_format等）只与文本进度条有关，被忽略
+        _ = kwargs
+        if total is None and iterable is not None:
+            try:
+                total = len(iterable)
+            except (TypeError, AttributeError):
+                total = None
+        self.iterable = iterable
+        self.desc = desc or ""
+        self.total = total
+        self.leave = leave
+        self.mininterval = max(0.0, mininterval)
+        self.miniters = max(1, miniters or 1)
+        # 未指定miniters时，根据速率动态调整，避免每一步都读取时钟
+        self.dynamic_miniters = miniters is None
+        self.unit = unit
+        self.unit_scale = unit_scale
+        self.smoothing = min(1.0, max(0.0, smoothing))
+        self.n = initial
+        self.postfix: Optional[str] = None
+        self.disable = disable or not _progressbar_available()
+        self._cancel_event = UContext.current_cancel_event() if check_cancel else None
+        self._stop_on_cancel = stop_on_cancel
+        self._start_t = time.perf_counter()
+        self._last_print_t = self._start_t
+        self._last_print_n = initial
+        self._rate: Optional[float] = None
+        self._closed = False
+        if postfix is not None:
+            self.set_postfix_str(
+                postfix if isinstance(postfix, str) else self._format_postfix(postfix),
+                refresh=False,
+            )
+        if not self.disable:
+            context.start_progressbar(
+                int(total) if total else 0,
+                "determinate" if total else "indeterminate",
+                int(initial),
+                self._format_message(),
+            )
+
+    @property
+    def rate(self) -> Optional[float]:
+        """平滑后的速率（每秒）"""
+        return self._rate
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start_t
+
+    @property
+    def eta(self) -> Optional[float]:
+        """预计剩余时间（秒）"""
+        if not self.total or not self._rate or self._rate <= 0:
+            return None
+        return max(0.0, (self.total - self.n) / self._rate)
+
+    def __len__(self) -> int:
+        if self.total is not None:
+            return int(self.total)
+        return len(self.iterable)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.iterable is None:
+            raise TypeError("iterable is not set")
+        cancel_event = self._cancel_event
+        if self.disable and cancel_event is None:
+            yield from self.iterable
+            return
+        mininterval = self.mininterval
+        n = self.n
+        last_print_n = self._last_print_n
+        perf_counter = time.perf_counter
+        try:
+            for obj in self.iterable:
+                if cancel_event is not None and cancel_event.is_set():
+                    self.n = n
+                    if self._stop_on_cancel:
+                        return
+                    _raise_cancelled()
+                yield obj
+                n += 1
+                if n - last_print_n >= self.miniters:
+                    now = perf_counter()
+                    if now - self._last_print_t >= mininterval:
+                        self.n = n
+                        self._refresh(now)
+                        last_print_n = n
+            self.n = n
+        finally:
+            self.close()
+
+    def update(self, n: float = 1) -> bool:
+        """前进n步，返回是否刷新了显示"""
+        self.n += n
+        self._check_cancel()
+        if self.n - self._last_print_n < self.miniters:
+            return False
+        now = time.perf_counter()
+        if now - self._last_print_t < self.mininterval:
+            return False
+        self._refresh(now)
+        return True
+
+    def refresh(self):
+        self._refresh(time.perf_counter())
+
+    def reset(self, total: Optional[float] = None):
+        """重新开始计数，可同时修改总数"""
+        self.n = 0
+        if total is not None:
+            self.total = total
+        self._start_t = self._last_print_t = time.perf_counter()
+        self._last_print_n = 0
+        self._rate = None
+        if not self.disable:
+            context.start_progressbar(
+                int(self.total) if self.total else 0,
+                "determinate" if self.total else "indeterminate",
+                0,
+                self._format_message(),
+            )
+
+    def set_description(self, desc: Optional[str] = None, refresh: bool = True):
+        self.desc = desc or ""
+        if refresh:
+            self.refresh()
+
+    set_description_str = set_description
+
+    def set_postfix(
+        self,
+        ordered_dict: Optional[Dict[str, Any]] = None,
+        refresh: bool = True,
+        **kwargs,
+    ):
+        values = dict(ordered_dict or {})
+        values.update(kwargs)
+        self.set_postfix_str(self._format_postfix(values), refresh=refresh)
+
+    def set_postfix_str(self, s: str = "", refresh: bool = True):
+        self.postfix = str(s) if s else None
+        if refresh:
+            self.refresh()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self.disable:
+            return
+        self._refresh(time.perf_counter())
+        if not self.total:
+            # 停止不确定模式的动画
+            context.stop_progressbar(hide_after_stop=not self.leave)
+        elif not self.leave:
+            context.hide_progressbar()
+
+    def clear(self):
+        pass
+
+    def display(self, msg: Optional[str] = None):
+        if not self.disable:
+            context.update_progressbar(int(self.n), msg or self._format_message())
+
+    @staticmethod
+    def write(s: str, file: Any = None, end: str = "\n", nolock: bool = False):
+        """与tqdm.write()对应，输出到执行窗口的输出区域"""
+        _ = file, nolock
+        context.uprint(s, end=end)
+
+    def __enter__(self) -> "ProgressIterator":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def _check_cancel(self):
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            _raise_cancelled()
+
+    def _refresh(self, now: float):
+        dt = now - self._last_print_t
+        dn = self.n - self._last_print_n
+        if dt > 0 and dn >= 0:
+            rate = dn / dt
+            if self.dynamic_miniters and dn > 0 and self.mininterval > 0:
+                # 与tqdm相同，使两次检查时钟之间的步数约等于一个mininterval内的步数
+                expected = dn * self.mininterval / dt
+                miniters = self.smoothing * expected + (1 - self.smoothing) * (
+                    self.miniters
+                )
+                self.miniters = max(1, int(miniters))
+            if self._rate is None or self.smoothing >= 1.0:
+                self._rate = rate
+            elif self.smoothing > 0:
+                self._rate += self.smoothing * (rate - self._rate)
+            elif self.elapsed > 0:
+                # smoothing为0时使用整体平均速率
+                self._rate = self.n / self.elapsed
+        self._last_print_t = now
+        self._last_print_n = self.n
+        if not self.disable:
+            context.update_progressbar(int(self.n), self._format_message())
+
+    def _format_message(self) -> str:
+        n = format_count(self.n, self.unit_scale)
+        if self.total:
+            counts = f"{n}/{format_count(self.total, self.unit_scale)}"
+        else:
+            counts = f"{n}{self.unit}"
+        stats = format_duration(self.elapsed)
+        eta = self.eta
+        if eta is not None:
+            stats += f"<{format_duration(eta)}"
+        if self._rate is not None:
+            if self.unit_scale:
+                rate = format_count(self._rate, True)
+            else:
+                rate = f"{self._rate:.2f}"
+            stats += f", {rate}{self.unit}/s"
+        message = f"{counts} [{stats}]"
+        if self.desc:
+            message = f"{self.desc}: {message}"
+        if self.postfix:
+            message += f", {self.postfix}"
+        return message
+
+    @staticmethod
+    def _format_postfix(values: Any) -> str:
+        if isinstance(values, dict):
+            return ", ".join(f"{key}={value}" for key, value in values.items())
+        return str(values)
+
+
+def uprogress(
+    iterable: Optional[Iterable[Any]] = None, *args, **kwargs
+) -> ProgressIterator:
+    """ProgressIterator的快捷方式，用法与tqdm()相同"""
+    return ProgressIterator(iterable, *args, **kwargs)
+
+
+def utrange(*args, **kwargs) -> ProgressIterator:
+    """与tqdm.trange()对应，相当于uprogress(range(*args), **kwargs)"""
+    return ProgressIterator(range(*args), **kwargs)
+
+
+# 匹配tqdm输出中的“已完成/总数”，数值可能带有单位前缀（unit_scale=True时）
+_COUNTS_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)([kMGTPEZY]?)\s*/\s*(\d+(?:\.\d+)?)([kMGTPEZY]?)"
+)
+_PERCENT_PATTERN = re.compile(r"(\d{1,3})%")
+# tqdm的文本进度条部分（“|████   |”），显示在进度标签中时将其去掉
+_BAR_PATTERN = re.compile(r"\|[^|]*\|")
+
+
+def _scaled(number: str, prefix: str) -> float:
+    return float(number) * (1000 ** _SI_PREFIXES.index(prefix))
+
+
+class ProgressSink(object):
+    """
+    可以作为tqdm的file参数的类文件对象：tqdm(iterable, file=ProgressSink())。
+    tqdm写入的文本进度条被解析为进度值，驱动执行窗口的进度条，其余部分（描述、速率、剩余时间等）显示在进度标签中。
+    tqdm可能在其监视线程中写入，因此创建时记录当前的执行上下文，并在该上下文中更新进度。
+    每次写入时检查函数是否被请求取消，若是则抛出asyncio.CancelledError，从而中断使用tqdm的循环。
+    """
+
+    def __init__(self, check_cancel: bool = True):
+        self._apply = UContext.run_context_wrapper(self._apply_line)
+        self._cancel_event = UContext.current_cancel_event() if check_cancel else None
+        self._enabled = _progressbar_available()
+        self._buffer = ""
+        self._total: Optional[float] = None
+
+    def write(self, s: str) -> int:
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise CancelledError("progress iteration cancelled")
+        if not self._enabled:
+            return len(s)
+        self._buffer += s
+        # tqdm以“\r”开头重绘进度条，以“\n”结束；只处理最后一行完整的内容
+        *lines, self._buffer = re.split(r"[\r\n]", self._buffer)
+        for line in reversed(lines):
+            line = line.strip()
+            if line:
+                self._apply(line)
+                break
+        return len(s)
+
+    def flush(self):
+        line = self._buffer.strip()
+        if line and self._enabled:
+            self._buffer = ""
+            self._apply(line)
+
+    def isatty(self) -> bool:
+        return False
+
+    def _apply_line(self, line: str):
+        label = " ".join(_BAR_PATTERN.sub(" ", line).split())
+        match = _COUNTS_PATTERN.search(line)
+        if match is not None:
+            value = _scaled(match.group(1), match.group(2))
+            total = _scaled(match.group(3), match.group(4))
+        else:
+            match = _PERCENT_PATTERN.search(line)
+            if match is None:
+                context.update_progressbar(0, label)
+                return
+            value, total = float(match.group(1)), 100.0
+        if total != self._total:
+            self._total = total
+            context.start_progressbar(int(total), "determinate", int(value), label)
+            return
+        context.update_progressbar(int(value), label)
@@ -0,0 +1,138 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Optional, Callable, List, Tuple
+
+from pyguiadapterlite.utils import _exception, _warning
+
+
+class ExecutionTimeoutError(TimeoutError):
+    """函数执行时间超过了硬超时时间，执行已被放弃（线程）或强制终止（进程）"""
+
+    def __init__(self, timeout: float, message: Optional[str] = None):
+        self.timeout = timeout
+        super().__init__(message or f"function execution timed out after {timeout}s")
+
+
+class WatchHandle(object):
+    """Watchdog.watch()返回的句柄，执行结束后应调用cancel()"""
+
+    __slots__ = ("name", "soft_timeout", "hard_timeout", "on_soft", "on_hard", "_done")
+
+    def __init__(
+        self,
+        name: str,
+        soft_timeout: Optional[float],
+        hard_timeout: Optional[float],
+        on_soft: Optional[Callable[[], None]],
+        on_hard: Optional[Callable[[], None]],
+    ):
+        self.name = name
+        self.soft_timeout = soft_timeout
+        self.hard_timeout = hard_timeout
+        self.on_soft = on_soft
+        self.on_hard = on_hard
+        self._done = False
+
+    @property
+    def is_active(self) -> bool:
+        return not self._done
+
+    def cancel(self):
+        self._done = True
+
+
+class Watchdog(object):
+    """
+    监视执行时间的后台线程。
+    所有执行共享同一个线程，各个超时时间按到期先后保存在堆中，线程只在最早的超时时间到期时被唤醒，
+    而不是为每次执行创建一个定时器。回调在监视线程中被调用，不应执行耗时的操作。
+    """
+
+    def __init__(self, name: str = "ExecutionWatchdog"):
+        self._name = name
+        self._cond = threading.Condition()
+        # (到期时间, 序号, 句柄, 是否为硬超时)
+        self._heap: List[Tuple[float, int, WatchHandle, bool]] = []
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(
+        self,
+        soft_timeout: Optional[float],
+        hard_timeout: Optional[float],
+        on_soft: Optional[Callable[[], None]] = None,
+        on_hard: Optional[Callable[[], None]] = None,
+        name: str = "",
+    ) -> WatchHandle:
+        """
+        开始监视一次执行：soft_timeout秒后调用on_soft，hard_timeout秒后调用on_hard，None表示不设置对应的超时。
+        """
+        handle = WatchHandle(name, soft_timeout, hard_timeout, on_soft, on_hard)
+        now = time.monotonic()
+        with self._cond:
+            if soft_timeout is not None and on_soft is not None:
+                self._push(now + soft_timeout, handle, False)
+            if hard_timeout is not None and on_hard is not None:
+                self._push(now + hard_timeout, handle, True)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return handle
+
+    def pending(self) -> int:
+        """尚未到期且未被取消的超时的数量"""
+        with self._cond:
+            return sum(1 for entry in self._heap if entry[2].is_active)
+
+    def _push(self, deadline: float, handle: WatchHandle, hard: bool):
+        heapq.heappush(self._heap, (deadline, next(self._counter), handle, hard))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    # 丢弃已被取消的执行的超时
+                    while self._heap and not self._heap[0][2].is_active:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                _, _, handle, hard = heapq.heappop(self._heap)
+                if hard:
+                    handle.cancel()
+            self._fire(handle, hard)
+
+    @staticmethod
+    def _fire(handle: WatchHandle, hard: bool):
+        if hard:
+            _warning(f"hard timeout ({handle.hard_timeout}s) expired: {handle.name}")
+            callback = handle.on_hard
+        else:
+            _warning(f"soft timeout ({handle.soft_timeout}s) expired: {handle.name}")
+            callback = handle.on_soft
+        try:
+            callback()
+        except BaseException as e:
+            _exception(e, "exception raised in watchdog callback")
+
+
+_default_watchdog: Optional[Watchdog] = None
+_default_watchdog_lock = threading.Lock()
+
+
+def default_watchdog() -> Watchdog:
+    """所有窗口和执行器共享的监视线程"""
+    global _default_watchdog
+    with _default_watchdog_lock:
+        if _default_watchdog is None:
+            _default_watchdog = Watchdog()
+        return _default_watchdog
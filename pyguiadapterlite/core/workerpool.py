@@ -0,0 +1,300 @@
+import contextvars
+import dataclasses
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional, ContextManager, Any, Dict
+
+
+@dataclasses.dataclass(frozen=True)
+class WorkerPoolStats(object):
+    max_workers: int
+    """线程数上限"""
+
+    live_workers: int
+    """当前存活的线程数"""
+
+    idle_workers: int
+    """当前空闲的线程数"""
+
+    queued_tasks: int
+    """等待执行的任务数"""
+
+    total_tasks: int
+    """累计提交的任务数"""
+
+    completed_tasks: int
+    """累计完成的任务数"""
+
+    last_queue_wait: float
+    """最近一个任务从提交到开始执行所等待的时间（秒）"""
+
+    max_queue_wait: float
+    """任务排队等待时间的历史最大值（秒）"""
+
+    total_queue_wait: float
+    """所有任务排队等待时间之和（秒）"""
+
+    last_run_time: float
+    """最近一个完成的任务的执行时间（秒）"""
+
+    max_run_time: float
+    """任务执行时间的历史最大值（秒）"""
+
+    total_run_time: float
+    """所有任务执行时间之和（秒）"""
+
+    abandoned_workers: int = 0
+    """被放弃、但仍在执行任务的线程数，这些线程不计入live_workers"""
+
+
+class _Task(object):
+    __slots__ = (
+        "fn",
+        "args",
+        "kwargs",
+        "run_context",
+        "future",
+        "submitted_at",
+        "context",
+    )
+
+    def __init__(self, fn, args, kwargs, run_context, future):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.run_context = run_context
+        self.future = future
+        self.submitted_at = time.perf_counter()
+        # 任务在提交者的contextvars上下文中执行，从而继承提交者所处的执行上下文
+        self.context = contextvars.copy_context()
+
+
+class WorkerPool(object):
+    """
+    有上限的共享工作线程池。
+    线程在需要时创建，空闲超过idle_timeout秒后退出，但始终保留min_workers个预热的线程。
+    执行中的任务可以通过abandon()放弃（如硬超时），执行它的线程不再占用线程数上限，必要时启动新的线程代替它。
+    每个任务可以指定run_context，它将在执行任务的线程中被调用，返回的上下文管理器包裹任务的执行，
+    用于设置和清理线程相关的上下文（如输出捕获）。
+    任务在提交时所处的contextvars上下文的副本中执行。
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        min_workers: int = 1,
+        idle_timeout: float = 60.0,
+        name: str = "WorkerPool",
+    ):
+        self._max_workers = max(1, max_workers)
+        self._min_workers = min(max(0, min_workers), self._max_workers)
+        self._idle_timeout = idle_timeout
+        self._name = name
+        self._queue: "queue.SimpleQueue[Optional[_Task]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._live = 0
+        self._idle = 0
+        self._queued = 0
+        self._thread_counter = 0
+        self._shutdown = False
+        # 正在执行的任务的Future -> 执行它的线程
+        self._running: Dict[Future, threading.Thread] = {}
+        self._abandoned: Dict[threading.Thread, Future] = {}
+
+        self._total_tasks = 0
+        self._completed_tasks = 0
+        self._last_queue_wait = 0.0
+        self._max_queue_wait = 0.0
+        self._total_queue_wait = 0.0
+        self._last_run_time = 0.0
+        self._max_run_time = 0.0
+        self._total_run_time = 0.0
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def ensure_capacity(self, max_workers: int) -> int:
+        """将线程数上限提高到至少max_workers（不会降低上限），有任务在排队时立即启动新的线程。返回新的上限"""
+        with self._lock:
+            if max_workers > self._max_workers:
+                self._max_workers = max_workers
+                while (
+                    not self._shutdown
+                    and self._queued > self._idle
+                    and self._live < self._max_workers
+                ):
+                    self._spawn()
+            return self._max_workers
+
+    def prestart(self, count: Optional[int] = None):
+        """预先启动count个线程（默认为min_workers个），以减少第一次执行时的延迟"""
+        count = self._min_workers if count is None else count
+        with self._lock:
+            while self._live < min(count, self._max_workers):
+                self._spawn()
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        run_context: Optional[Callable[[], ContextManager]] = None,
+        **kwargs,
+    ) -> Future:
+        """提交任务，返回对应的Future"""
+        future = Future()
+        task = _Task(fn, args, kwargs, run_context, future)
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("worker pool is shut down")
+            self._total_tasks += 1
+            self._queued += 1
+            if self._queued > self._idle and self._live < self._max_workers:
+                self._spawn()
+        self._queue.put(task)
+        return future
+
+    def abandon(self, future: Future) -> bool:
+        """
+        放弃一个任务。尚未开始执行的任务将被取消；正在执行的任务无法被安全地终止，
+        其所在的线程将继续运行直到任务结束后退出，但不再计入线程数上限，如有任务在排队则立即启动新的线程。
+        返回任务是否被取消或放弃。
+        """
+        if future.cancel():
+            return True
+        with self._lock:
+            thread = self._running.pop(future, None)
+            if thread is None:
+                return False
+            self._abandoned[thread] = future
+            self._live -= 1
+            if (
+                not self._shutdown
+                and self._queued > self._idle
+                and self._live < self._max_workers
+            ):
+                self._spawn()
+        return True
+
+    def stats(self) -> WorkerPoolStats:
+        with self._lock:
+            return WorkerPoolStats(
+                max_workers=self._max_workers,
+                live_workers=self._live,
+                idle_workers=self._idle,
+                queued_tasks=self._queued,
+                total_tasks=self._total_tasks,
+                completed_tasks=self._completed_tasks,
+                last_queue_wait=self._last_queue_wait,
+                max_queue_wait=self._max_queue_wait,
+                total_queue_wait=self._total_queue_wait,
+                last_run_time=self._last_run_time,
+                max_run_time=self._max_run_time,
+                total_run_time=self._total_run_time,
+                abandoned_workers=len(self._abandoned),
+            )
+
+    def shutdown(self):
+        """停止接受新任务，已提交的任务执行完毕后线程退出"""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            live = self._live
+        for _ in range(live):
+            self._queue.put(None)
+
+    def _spawn(self):
+        # 调用时必须已持有self._lock
+        self._thread_counter += 1
+        self._live += 1
+        self._idle += 1
+        thread = threading.Thread(
+            target=self._worker,
+            name=f"{self._name}-{self._thread_counter}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _worker(self):
+        thread = threading.current_thread()
+        while True:
+            try:
+                task = self._queue.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._live > self._min_workers and self._queued <= 0:
+                        self._live -= 1
+                        self._idle -= 1
+                        return
+                continue
+
+            if task is None:
+                with self._lock:
+                    self._live -= 1
+                    self._idle -= 1
+                return
+
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._idle -= 1
+                wait = started_at - task.submitted_at
+                self._last_queue_wait = wait
+                self._max_queue_wait = max(self._max_queue_wait, wait)
+                self._total_queue_wait += wait
+                future = task.future
+                self._running[future] = thread
+
+            task.context.run(self._run, task)
+
+            run_time = time.perf_counter() - started_at
+            with self._lock:
+                self._completed_tasks += 1
+                self._last_run_time = run_time
+                self._max_run_time = max(self._max_run_time, run_time)
+                self._total_run_time += run_time
+                if self._abandoned.pop(thread, None) is not None:
+                    # 已被放弃的线程不再计入线程池，任务结束后直接退出
+                    return
+                self._running.pop(future, None)
+                self._idle += 1
+
+    @staticmethod
+    def _run(task: _Task):
+        future = task.future
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            if task.run_context is not None:
+                with task.run_context():
+                    result = task.fn(*task.args, **task.kwargs)
+            else:
+                result = task.fn(*task.args, **task.kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            # 避免任务对象在下一次任务到来之前一直被线程引用
+            task.fn = task.args = task.kwargs = task.context = None
+
+
+_default_pool: Optional[WorkerPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def default_worker_pool() -> WorkerPool:
+    """所有执行器共享的默认线程池"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WorkerPool(name="FunctionWorker")
+            _default_pool.prestart()
+        return _default_pool
+
+
+def get_worker_pool_stats() -> WorkerPoolStats:
+    return default_worker_pool().stats()
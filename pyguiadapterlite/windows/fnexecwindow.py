@@ -1,23 +1,52 @@
 import dataclasses
 import json
+import threading
+import time
+from asyncio import CancelledError
+from concurrent.futures import Future
 from dataclasses import field
 from pathlib import Path
 from tkinter import Tk, Toplevel, BooleanVar, filedialog
 from tkinter.ttk import Button, Checkbutton, Progressbar, Label, Frame
-from typing import Union, Optional, Any, cast, Dict, Literal, Callable
+from typing import (
+    Union,
+    Optional,
+    Any,
+    cast,
+    Dict,
+    Literal,
+    Callable,
+    List,
+    Iterable,
+    Tuple,
+)
 
 from pyguiadapterlite._messages import messages as msgs
+from pyguiadapterlite.components.batchview import BatchView
 from pyguiadapterlite.components.common import get_default_widget_font
 from pyguiadapterlite.components.paramtabview import ParameterGroupTabView
+from pyguiadapterlite.components.progresspanel import ProgressTaskPanel
+from pyguiadapterlite.components.resultsview import ResultsTableView
+from pyguiadapterlite.components.runlist import RunListView, format_duration
 from pyguiadapterlite.components.scrollarea import ParameterWidgetArea
 from pyguiadapterlite.components.termview import TermView
+from pyguiadapterlite.components.outputsearch import SearchBar
 from pyguiadapterlite.components.textview import TextView, SimpleTextViewer
+from pyguiadapterlite.components.virtualtermview import VirtualTermView
 from pyguiadapterlite.components.valuewidget import InvalidValue
+from pyguiadapterlite.core.batch import BatchRunner, BatchItemResult, uses_processes
+from pyguiadapterlite.core.cache import ResultCache, function_identity
 from pyguiadapterlite.core.fn import FnInfo, BaseFunctionExecutor, ExecuteStateListener
 from pyguiadapterlite.core.fn import ParameterError
+from pyguiadapterlite.core.fingerprint import path_parameter_names
+from pyguiadapterlite.core.outputchannel import OutputChannel, OutputPolicy
 from pyguiadapterlite.core.paramgroup import ParametersGroupBase, group_name_hash
+from pyguiadapterlite.core.progresschannel import ProgressChannel
+from pyguiadapterlite.core.progresstasks import ProgressTaskBoard, ProgressTask
+from pyguiadapterlite.core.streaming import ResultStream
 from pyguiadapterlite.core.threaded import ThreadedExecutor
-from pyguiadapterlite.core.ucontext import UContext
+from pyguiadapterlite.core.ucontext import UContext, RunContext
+from pyguiadapterlite.core.workerpool import default_worker_pool
 from pyguiadapterlite.utils import (
     _warning,
     show_warning,
@@ -100,6 +129,71 @@ class FnExecuteWindowConfig(BaseWindowConfig):
     enable_output_default_menu: bool = True
     """是否显示默认的模拟终端区域右键菜单"""
 
+    virtual_output_view: bool = False
+    """是否使用虚拟化的输出视图。虚拟化视图将全部输出保存在紧凑的行缓冲区中，只渲染当前可见的行，适用于输出数百万行的函数。启用后`output_scrollback_*`、`output_spool*`选项将被忽略。"""
+
+    output_search_bar: bool = True
+    """是否在模拟终端区域上方显示搜索栏。搜索在后台线程中进行，支持正则表达式以及“只显示匹配行”的过滤模式。"""
+
+    output_scrollback_lines: int = 0
+    """模拟终端区域最多保留的行数，超出部分的旧行将被分块丢弃。0表示不限制。"""
+
+    output_scrollback_chars: int = 0
+    """模拟终端区域最多保留的字符数（不含ANSI转义序列），超出部分的旧行将被分块丢弃。0表示不限制。"""
+
+    output_spool: bool = False
+    """是否将完整输出同步写入磁盘上的临时文件（去除ANSI转义序列）。启用后，“保存到文件”将直接复制该文件，模拟终端区域可只保留输出的尾部。"""
+
+    output_spool_file: Optional[str] = None
+    """完整输出的写入路径。设置此项时将自动启用`output_spool`，且窗口关闭后该文件会被保留。"""
+
+    capture_output: bool = False
+    """是否捕获函数执行线程写入`sys.stdout`和`sys.stderr`的内容（如`print()`的输出），并将其显示在模拟终端区域中。其他线程的输出不受影响。"""
+
+    output_flush_interval: int = 16
+    """输出缓冲区的刷新间隔（毫秒）。函数执行期间产生的输出会先进入缓冲区，然后在主线程中按此间隔批量写入模拟终端区域。"""
+
+    output_policy: OutputPolicy = "unbounded"
+    """输出缓冲区中待刷新的文本超过`output_max_pending_chars`时的处理策略。可选值：`unbounded`（不限制）、`block`（阻塞输出的工作线程）、`drop_oldest`（丢弃最早的输出）、`sample`（丢弃本刷新周期内多余的输出，并显示被丢弃的行数）。"""
+
+    output_max_pending_chars: int = 1024 * 1024
+    """输出缓冲区中待刷新文本的字符数上限，仅当`output_policy`不为`unbounded`时生效。"""
+
+    max_concurrent_runs: int = 1
+    """同时执行的最大次数。大于1时启用多次执行模式：每次执行拥有独立的执行编号、取消标志、输出Tab页和结果，并在“执行列表”Tab页中显示各次执行的状态和耗时。共享线程池的线程数上限将被提高到不小于该值；其他任务占满线程池时，尚未开始的执行显示为“排队中”。"""
+
+    batch_mode: bool = False
+    """是否启用批量执行模式。启用后窗口中将增加“批量”Tab页，可以将多组参数加入列表，然后在线程池（或进程池）中并行执行，并在结果表格中查看各项的状态、耗时和结果。"""
+
+    batch_max_workers: int = 4
+    """批量执行时并行执行的最大项数。"""
+
+    batch_use_processes: bool = False
+    """批量执行时是否在工作进程中执行函数，适用于CPU密集型的函数。此时函数、参数和返回值必须可以被pickle。函数的执行器为ProcessExecutor时总是使用工作进程。"""
+
+    batch_items_factory: Optional[
+        Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]]
+    ] = None
+    """将当前参数值展开为多组参数的函数，点击“添加当前参数”时调用。例如，可以将文件列表参数中的每个文件与多个阈值组合（参见`parameter_grid()`）。为None时将当前参数值作为一组参数加入列表。"""
+
+    streamed_results_view: Literal["output", "table"] = "output"
+    """生成器函数逐项产生的结果的显示位置：`output`（模拟终端区域）或`table`（“结果”Tab页中的表格）。多次执行模式下结果总是显示在各次执行的输出Tab页中。"""
+
+    streamed_result_format: str = "[{index}] {item!r}"
+    """在模拟终端区域中显示逐项结果的模板，`{index}`为该项的序号，`{item}`为该项的值。"""
+
+    results_table_max_rows: int = 10000
+    """结果表格最多保留的行数，超出部分的旧行将被丢弃。0表示不限制。"""
+
+    result_stream_dir: Optional[str] = None
+    """生成器函数的结果流文件（JSON Lines格式）所在的目录，每次执行写入一个新文件。为None时使用系统临时目录，为空字符串时不写入文件。"""
+
+    collect_streamed_results: bool = True
+    """是否将生成器函数产生的各项收集到列表中作为函数的最终结果。生成器有返回值时以其返回值作为最终结果。"""
+
+    max_collected_results: int = 1000
+    """最多收集的项数，超过后函数的最终结果将变为`StreamedResult`（包含项数和结果流文件的路径），以限制内存占用。0表示不限制。"""
+
     disable_widgets_on_execute: bool = False
     """是否在执行函数时禁用窗口内的所有控件"""
 
@@ -168,6 +262,21 @@ class FnExecuteWindowConfig(BaseWindowConfig):
     ] = "center"
     """进度标签文本对齐方式。"""
 
+    progress_update_interval: int = 16
+    """进度条的刷新间隔（毫秒）。函数中频繁调用`update_progressbar()`时，每个刷新周期只有最新的进度会被显示。"""
+
+    progress_show_rate: bool = False
+    """是否在进度标签中显示根据进度更新计算的速率和预计剩余时间。"""
+
+    enable_progress_tasks: bool = False
+    """是否在输出区域下方显示多任务进度面板，函数可通过`open_progress_task()`创建多个（可嵌套的）进度任务。"""
+
+    progress_tasks_max_rows: int = 8
+    """多任务进度面板最多显示的行数，超出的任务只显示其数量。"""
+
+    progress_task_linger: float = 1.0
+    """顶层进度任务结束后在面板上继续显示的时间（秒）。子任务结束后立即折叠到其父任务中。"""
+
     after_window_create_callback: Optional[Callable[["FnExecuteWindow"], None]] = None
     """窗口创建后回调此函数。"""
 
@@ -179,6 +288,10 @@ class MainArea(ParameterGroupTabView):
 
     _DOCUMENT_TAB_ID = "__document__"
     _OUTPUT_TAB_ID = "__output__"
+    _RUNS_TAB_ID = "__runs__"
+    _BATCH_TAB_ID = "__batch__"
+    _RESULTS_TAB_ID = "__results__"
+    _RUN_TAB_ID_TEMPLATE = "__run_{}__"
 
     def __init__(self, parent_window: "FnExecuteWindow", **kwargs):
         self._parent_window = parent_window
@@ -192,20 +305,53 @@ class MainArea(ParameterGroupTabView):
 
         self._document_view: Optional[TextView] = None
         self._output_frame: Optional[Frame] = None
-        self._output_view: Optional[TermView] = None
+        self._output_view: Union[TermView, VirtualTermView, None] = None
+        self._output_search_bar: Optional[SearchBar] = None
         self._progress_frame: Optional[Frame] = None
         self._progressbar: Optional[Progressbar] = None
         self._progress_label: Optional[Label] = None
+        self._progress_task_panel: Optional[ProgressTaskPanel] = None
+        self._run_list_view: Optional[RunListView] = None
+        self._batch_view: Optional[BatchView] = None
+        self._results_view: Optional[ResultsTableView] = None
 
         # self._create_parameter_group(DEFAULT_GROUP_NAME)
         self._add_function_parameters()
         self._create_document_tab()
         self._create_output_tab()
+        if self._config.max_concurrent_runs > 1:
+            # 各次执行共享默认线程池，避免其线程数上限小于同时执行的最大次数
+            default_worker_pool().ensure_capacity(self._config.max_concurrent_runs)
+            self._create_runs_tab()
+        if self._config.batch_mode:
+            self._create_batch_tab()
+        if self._config.streamed_results_view == "table":
+            self._create_results_tab()
 
     @property
-    def output_view(self) -> Optional[TermView]:
+    def output_view(self) -> Union[TermView, VirtualTermView, None]:
         return self._output_view
 
+    @property
+    def output_search_bar(self) -> Optional[SearchBar]:
+        return self._output_search_bar
+
+    @property
+    def progress_task_panel(self) -> Optional[ProgressTaskPanel]:
+        return self._progress_task_panel
+
+    @property
+    def run_list_view(self) -> Optional[RunListView]:
+        return self._run_list_view
+
+    @property
+    def batch_view(self) -> Optional[BatchView]:
+        return self._batch_view
+
+    @property
+    def results_view(self) -> Optional[ResultsTableView]:
+        return self._results_view
+
     def create_parameter_tab(self) -> ParameterWidgetArea:
         return ParameterWidgetArea(
             self._notebook,
@@ -232,16 +378,41 @@ class MainArea(ParameterGroupTabView):
                 content=document_frame,
             )
 
-    def _create_output_tab(self):
-        terminal_frame = Frame(self._notebook)
-        self._output_frame = terminal_frame
-        self._output_view = TermView(
-            terminal_frame,
+    def _create_output_view(
+        self, parent, spool_file: Optional[str] = None
+    ) -> Union[TermView, VirtualTermView]:
+        if self._config.virtual_output_view:
+            return VirtualTermView(
+                parent,
+                font=self._config.output_font,
+                default_context_menu=self._config.enable_output_default_menu,
+                background=self._config.output_background,
+                foreground=self._config.output_foreground,
+            )
+        return TermView(
+            parent,
             font=self._config.output_font,
             default_context_menu=self._config.enable_output_default_menu,
             background=self._config.output_background,
             foreground=self._config.output_foreground,
+            scrollback_lines=self._config.output_scrollback_lines,
+            scrollback_chars=self._config.output_scrollback_chars,
+            spool=self._config.output_spool,
+            spool_file=spool_file,
+        )
+
+    def _create_output_tab(self):
+        terminal_frame = Frame(self._notebook)
+        self._output_frame = terminal_frame
+        self._output_view = self._create_output_view(
+            terminal_frame, spool_file=self._config.output_spool_file
         )
+        if self._config.output_search_bar:
+            self._output_search_bar = SearchBar(terminal_frame, self._output_view)
+            self._output_search_bar.pack(side="top", fill="x", padx=2, pady=2)
+            terminal_frame.winfo_toplevel().bind(
+                "<Control-f>", lambda _: self._output_search_bar.focus_entry(), add="+"
+            )
         self._output_view.pack(side="top", fill="both", expand=True)
         terminal_frame.pack_propagate(False)
 
@@ -264,6 +435,12 @@ class MainArea(ParameterGroupTabView):
                     )
             self._progress_frame.grid_columnconfigure(0, weight=1)
 
+        if self._config.enable_progress_tasks:
+            self._progress_task_panel = ProgressTaskPanel(
+                terminal_frame, max_rows=self._config.progress_tasks_max_rows
+            )
+            self._progress_task_panel.pack(side="bottom", fill="x", pady=(2, 0))
+
         self.add_tab(
             tab_id=self.__class__._OUTPUT_TAB_ID,
             tab_name=self._config.output_tab_title,
@@ -335,6 +512,73 @@ class MainArea(ParameterGroupTabView):
         if self._output_view:
             self.set_current_tab(self.__class__._OUTPUT_TAB_ID)
 
+    def _create_runs_tab(self):
+        self._run_list_view = RunListView(self._notebook)
+        self.add_tab(
+            tab_id=self.__class__._RUNS_TAB_ID,
+            tab_name=msgs().MSG_RUNS_TAB_TITLE,
+            content=self._run_list_view,
+        )
+
+    @classmethod
+    def _run_tab_id(cls, run_id: int) -> str:
+        return cls._RUN_TAB_ID_TEMPLATE.format(run_id)
+
+    def add_run_tab(self, run_id: int) -> Union[TermView, VirtualTermView]:
+        """为一次执行创建单独的输出Tab页，返回该Tab页中的输出视图"""
+        run_frame = Frame(self._notebook)
+        view = self._create_output_view(run_frame)
+        if self._config.output_search_bar:
+            SearchBar(run_frame, view).pack(side="top", fill="x", padx=2, pady=2)
+        view.pack(side="top", fill="both", expand=True)
+        run_frame.pack_propagate(False)
+        self.add_tab(
+            tab_id=self._run_tab_id(run_id),
+            tab_name=msgs().MSG_RUN_TAB_TITLE.format(run_id),
+            content=run_frame,
+        )
+        return view
+
+    def remove_run_tab(self, run_id: int):
+        tab_id = self._run_tab_id(run_id)
+        if self.has_tab(tab_id):
+            self.remove_tab(tab_id, destroy_content=True)
+
+    def show_run_tab(self, run_id: int):
+        tab_id = self._run_tab_id(run_id)
+        if self.has_tab(tab_id):
+            self.set_current_tab(tab_id)
+
+    def show_runs_tab(self):
+        if self._run_list_view:
+            self.set_current_tab(self.__class__._RUNS_TAB_ID)
+
+    def _create_batch_tab(self):
+        self._batch_view = BatchView(self._notebook)
+        self.add_tab(
+            tab_id=self.__class__._BATCH_TAB_ID,
+            tab_name=msgs().MSG_BATCH_TAB_TITLE,
+            content=self._batch_view,
+        )
+
+    def show_batch_tab(self):
+        if self._batch_view:
+            self.set_current_tab(self.__class__._BATCH_TAB_ID)
+
+    def _create_results_tab(self):
+        self._results_view = ResultsTableView(
+            self._notebook, max_rows=self._config.results_table_max_rows
+        )
+        self.add_tab(
+            tab_id=self.__class__._RESULTS_TAB_ID,
+            tab_name=msgs().MSG_RESULTS_TAB_TITLE,
+            content=self._results_view,
+        )
+
+    def show_results_tab(self):
+        if self._results_view:
+            self.set_current_tab(self.__class__._RESULTS_TAB_ID)
+
 
 class BottomArea(Frame):
     def __init__(self, parent_window: "FnExecuteWindow", **kwargs):
@@ -396,6 +640,89 @@ class BottomArea(Frame):
         self._clear_button.config(state="normal" if enabled else "disabled")
 
 
+RunState = Literal["queued", "running", "done", "failed", "cancelled"]
+
+
+class _RunSlot(object):
+    """多次执行模式下，一次执行的输出视图、输出通道、执行器和结果"""
+
+    def __init__(
+        self,
+        run_id: int,
+        view: Union[TermView, VirtualTermView],
+        channel: OutputChannel,
+    ):
+        self.run_id = run_id
+        self.view = view
+        self.channel = channel
+        self.executor: Optional[BaseFunctionExecutor] = None
+        self.state: RunState = "queued"
+        self.created_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.return_value: Any = None
+        self.exception: Optional[BaseException] = None
+        self.cancel_requested = False
+        self.cache_key: Optional[str] = None
+        self.result_stream: Optional[ResultStream] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.state in ("queued", "running")
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def print(self, message: str, end: str = "\n"):
+        self.channel.flush()
+        self.view.write(f"{message}{end}")
+
+
+class _RunListener(ExecuteStateListener):
+    """将一次执行的状态回调转发给窗口，并为该次执行提供单独的执行上下文"""
+
+    def __init__(self, window: "FnExecuteWindow", slot: _RunSlot):
+        self._window = window
+        self._slot = slot
+
+    def create_run_context(
+        self,
+        fn_info: "FnInfo",
+        arguments: Dict[str, Any],
+        cancel_event: threading.Event,
+    ) -> RunContext:
+        return RunContext(
+            run_id=self._slot.run_id,
+            window=self._window,
+            cancel_event=cancel_event,
+            output_channel=self._slot.channel,
+        )
+
+    def on_execute_start(self, fn_info: "FnInfo", arguments: Dict[str, Any]) -> None:
+        self._window.on_run_start(self._slot)
+
+    def on_execute_finish(
+        self,
+        fn_info: "FnInfo",
+        arguments: Dict[str, Any],
+        return_value: Any,
+        exception: Optional[BaseException],
+    ) -> None:
+        self._window.on_run_finish(self._slot, arguments, return_value, exception)
+
+    def on_execute_result_items(
+        self,
+        fn_info: "FnInfo",
+        stream: ResultStream,
+        start_index: int,
+        items: List[Any],
+    ) -> None:
+        self._window.on_run_result_items(self._slot, stream, start_index, items)
+
+
 class FnExecuteWindow(BaseWindow, ExecuteStateListener):
     def __init__(
         self,
@@ -409,14 +736,71 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
 
         self.clear_output_on_execute = BooleanVar(value=config.clear_checkbox_checked)
         self._executor: Optional[BaseFunctionExecutor] = None
+        self._output_channel: Optional[OutputChannel] = None
+        self._progress_channel: Optional[ProgressChannel] = None
+        self._progress_tasks: Optional[ProgressTaskBoard] = None
+        # 工作进程中创建的进度任务，(执行编号, 子进程中的任务编号) -> 任务
+        self._worker_progress_tasks: Dict[Tuple[int, int], ProgressTask] = {}
+        # 多次执行模式下的各次执行，按执行编号排列
+        self._runs: Dict[int, _RunSlot] = {}
+        self._run_refresh_id: Optional[str] = None
+        # 批量执行模式下的参数列表和当前的批量执行
+        self._batch_items: List[Dict[str, Any]] = []
+        self._batch_runner: Optional[BatchRunner] = None
+        self._batch_refresh_id: Optional[str] = None
+        # 本次执行的结果缓存键，未启用缓存时为None
+        self._pending_cache_key: Optional[str] = None
+        self._cancel_requested = False
+        # 文件、目录类型的参数，其缓存键需要根据文件内容计算
+        self._path_parameters = path_parameter_names(fn_info) if fn_info.cache else ()
+        # 缓存键中使用的函数标识，不同模块中的同名函数不会共享缓存
+        self._cache_name = function_identity(fn_info.fn) if fn_info.cache else ""
+        self._cache_lookup_pending = False
+        # 本次执行的结果流（仅当函数为生成器函数时）
+        self._result_stream: Optional[ResultStream] = None
 
         self._param_validation_win_parent: Optional[Toplevel] = None
         self._param_validation_win: Optional[ParameterValidationWindow] = None
 
         super().__init__(parent, config)
 
+        self._output_channel = OutputChannel(
+            self._main_area.output_view.write,
+            flush_interval=config.output_flush_interval,
+            policy=config.output_policy,
+            max_pending_chars=config.output_max_pending_chars,
+        )
+        self._output_channel.start(self.parent)
+        if config.enable_progressbar:
+            self._progress_channel = ProgressChannel(
+                self._main_area,
+                flush_interval=config.progress_update_interval,
+                show_rate=config.progress_show_rate,
+            )
+            self._progress_channel.start(self.parent)
+        if config.enable_progress_tasks:
+            self._progress_tasks = ProgressTaskBoard(
+                self._main_area.progress_task_panel,
+                flush_interval=config.progress_update_interval,
+                linger=config.progress_task_linger,
+            )
+            self._progress_tasks.start(self.parent)
+
         executor_cls = fn_info.executor or ThreadedExecutor
         self._executor = executor_cls(listener=self)
+        run_list_view = self._main_area.run_list_view
+        if run_list_view is not None:
+            run_list_view.set_cancel_handler(self.cancel_runs)
+            run_list_view.set_close_finished_handler(self.close_finished_runs)
+            run_list_view.set_activate_handler(self._main_area.show_run_tab)
+        batch_view = self._main_area.batch_view
+        if batch_view is not None:
+            batch_view.set_add_handler(self.on_add_batch_item)
+            batch_view.set_remove_handler(self.remove_batch_items)
+            batch_view.set_clear_handler(self.clear_batch_items)
+            batch_view.set_run_handler(self.run_batch)
+            batch_view.set_cancel_handler(self.cancel_batch)
+            batch_view.set_cancel_selected_handler(self.cancel_batch_items)
 
         UContext.execute_window_created(self)
         _info(f"execute window created(fn={fn_info.fn_name})")
@@ -436,13 +820,34 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
         return self._main_area
 
     @property
-    def output_view(self) -> TermView:
+    def output_view(self) -> Union[TermView, VirtualTermView]:
         return self._main_area.output_view
 
+    @property
+    def output_channel(self) -> OutputChannel:
+        return self._output_channel
+
+    @property
+    def progress_channel(self) -> Optional[ProgressChannel]:
+        """进度条更新的合并通道，未启用进度条时为None"""
+        return self._progress_channel
+
+    @property
+    def progress_tasks(self) -> Optional[ProgressTaskBoard]:
+        """多任务进度面板中的任务，未启用多任务进度面板时为None"""
+        return self._progress_tasks
+
     @property
     def bottom_area(self) -> BottomArea:
         return self._bottom_area
 
+    @property
+    def multi_run_enabled(self) -> bool:
+        return self.config.max_concurrent_runs > 1
+
+    def active_run_count(self) -> int:
+        return sum(1 for slot in self._runs.values() if slot.is_active)
+
     def create_main_area(self) -> Any:
         self._main_area = MainArea(self)
         self._main_area.pack(side="top", fill="both", padx=5, pady=5, expand=True)
@@ -473,6 +878,8 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
         doc_viewer.show()
 
     def print(self, *messages: str, sep: str = " ", end: str = "\n"):
+        # 先输出缓冲区中尚未刷新的内容，保证输出顺序
+        self._output_channel.flush()
         if len(messages) == 0:
             self._main_area.output_view.write(end)
             return
@@ -513,6 +920,52 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
     def hide_progressbar(self):
         self._main_area.hide_progressbar()
 
+    def open_worker_progress_task(
+        self,
+        run_id: int,
+        task_id: int,
+        parent_id: Optional[int],
+        name: str,
+        total: float,
+        msg: Optional[str],
+    ):
+        if self._progress_tasks is None:
+            return
+        parent = self._worker_progress_tasks.get((run_id, parent_id), None)
+        if parent is not None:
+            task = parent.subtask(name, total, msg)
+        else:
+            task = self._progress_tasks.open(name, total, msg=msg, run_id=run_id)
+        self._worker_progress_tasks[(run_id, task_id)] = task
+
+    def update_worker_progress_task(
+        self, run_id: int, task_id: int, value: float, msg: Optional[str], total: float
+    ):
+        task = self._worker_progress_tasks.get((run_id, task_id), None)
+        if task is None:
+            return
+        if total != task.total:
+            task.set_total(total)
+        task.update(value, msg)
+
+    def finish_worker_progress_task(
+        self, run_id: int, task_id: int, msg: Optional[str] = None
+    ):
+        task = self._worker_progress_tasks.pop((run_id, task_id), None)
+        if task is not None:
+            task.finish(msg)
+
+    def _finish_progress_tasks(self, run_id: Optional[int] = None):
+        if self._progress_tasks is None:
+            return
+        # 结束函数未结束的进度任务（如函数抛出了异常）
+        self._progress_tasks.finish_run(run_id)
+        self._worker_progress_tasks = {
+            key: task
+            for key, task in self._worker_progress_tasks.items()
+            if not task.is_finished
+        }
+
     def show_output_tab(self):
         self._main_area.show_output_tab()
 
@@ -522,6 +975,18 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
     def show_parameter_group_tab(self, group_name: str) -> bool:
         return self._main_area.show_parameter_group(group_name)
 
+    def create_run_context(
+        self,
+        fn_info: "FnInfo",
+        arguments: Dict[str, Any],
+        cancel_event: threading.Event,
+    ) -> RunContext:
+        return RunContext(
+            run_id=UContext.next_run_id(),
+            window=self,
+            cancel_event=cancel_event,
+        )
+
     def before_execute(self, fn_info: "FnInfo", arguments: Dict[str, Any]) -> None:
         super().before_execute(fn_info, arguments)
         # 切换到输出tab页，方便查看执行结果
@@ -532,6 +997,7 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
         # self._bottom_area.set_clear_button_state(False)
         # 清理输出
         if self.clear_output_on_execute.get():
+            self._output_channel.discard()
             self._main_area.output_view.clear()
 
     def on_execute_start(self, fn_info: "FnInfo", arguments: Dict[str, Any]) -> None:
@@ -549,14 +1015,81 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
         self._bottom_area.set_execute_button_state(True)
         self._bottom_area.set_cancel_button_state(False)
         # self._bottom_area.set_clear_button_state(True)
-        UContext.current_thread_finished()
-        if exception:
+        self._finish_progress_tasks()
+        cache_key, self._pending_cache_key = self._pending_cache_key, None
+        if isinstance(exception, CancelledError):
+            # 函数通过Task.cancel()被取消，不视为错误
+            self.print(f"\033[93m{msgs().MSG_FUNC_CANCELLED}\033[0m")
+        elif exception:
             self._handle_function_exception(exception)
         else:
             self._handle_function_result(return_value)
+            if cache_key is not None and not self._cancel_requested:
+                self._store_cached_result(cache_key, return_value, printer=self.print)
+        stream, self._result_stream = self._result_stream, None
+        self._print_stream_summary(stream, printer=self.print)
         if self._fn_info.after_execute_callback:
             self._fn_info.after_execute_callback(self, return_value, exception)
 
+    def on_execute_result_items(
+        self,
+        fn_info: "FnInfo",
+        stream: ResultStream,
+        start_index: int,
+        items: List[Any],
+    ) -> None:
+        if self._main_area is None:
+            return
+        self._result_stream = stream
+        self._show_result_items(start_index, items, printer=self.print, use_table=True)
+
+    def on_run_result_items(
+        self,
+        slot: _RunSlot,
+        stream: ResultStream,
+        start_index: int,
+        items: List[Any],
+    ):
+        if self._main_area is None:
+            return
+        slot.result_stream = stream
+        self._show_result_items(start_index, items, printer=slot.print, use_table=False)
+
+    def _show_result_items(
+        self,
+        start_index: int,
+        items: List[Any],
+        printer: Callable[[str], None],
+        use_table: bool,
+    ):
+        results_view = self._main_area.results_view if use_table else None
+        if results_view is not None:
+            if start_index == 0:
+                # 新的一次执行
+                results_view.clear()
+                self._main_area.show_results_tab()
+            results_view.append(start_index, items)
+            return
+        result_format = self.config.streamed_result_format
+        printer(
+            "\n".join(
+                result_format.format(index=start_index + offset, item=item)
+                for offset, item in enumerate(items)
+            )
+        )
+
+    @staticmethod
+    def _print_stream_summary(
+        stream: Optional[ResultStream], printer: Callable[[str], None]
+    ):
+        if stream is None or stream.path is None:
+            return
+        printer(
+            "\033[2m"
+            + msgs().MSG_STREAM_SUMMARY.format(stream.count, stream.path)
+            + "\033[0m"
+        )
+
     def after(self, delay: int, func, *args):
         return self.parent.after(delay, func, *args)
 
@@ -570,13 +1103,18 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
         return self._fn_info.cancelable
 
     def is_function_executing(self) -> bool:
-        return self._executor.is_executing
+        return (
+            self._executor.is_executing
+            or self._cache_lookup_pending
+            or self.active_run_count() > 0
+            or self.is_batch_running()
+        )
 
     def try_cancel(self):
         self.on_cancel()
 
     def on_close(self):
-        if self._executor.is_executing:
+        if self.is_function_executing():
             show_warning(self.config.function_executing_message, parent=self.parent)
             return False
 
@@ -585,6 +1123,20 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
                 return False
 
         self.close_param_validation_win()
+        self._output_channel.stop(flush=False)
+        if self._progress_channel is not None:
+            self._progress_channel.stop(flush=False)
+        if self._progress_tasks is not None:
+            self._progress_tasks.stop(flush=False)
+        for slot in self._runs.values():
+            slot.channel.stop(flush=False)
+        self._runs.clear()
+        if self._run_refresh_id is not None:
+            self.parent.after_cancel(self._run_refresh_id)
+            self._run_refresh_id = None
+        if self._batch_refresh_id is not None:
+            self.parent.after_cancel(self._batch_refresh_id)
+            self._batch_refresh_id = None
         UContext.execute_window_closed()
         self._main_area.clear_parameters()
         self._main_area.clear(destroy_content=True)
@@ -595,7 +1147,14 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
         return super().on_close()
 
     def on_execute(self):
-        if self._executor.is_executing:
+        if self.multi_run_enabled:
+            max_runs = self.config.max_concurrent_runs
+            if self.active_run_count() >= max_runs:
+                show_warning(
+                    msgs().MSG_MAX_CONCURRENT_RUNS.format(max_runs), parent=self.parent
+                )
+                return
+        elif self._executor.is_executing or self._cache_lookup_pending:
             show_warning(self.config.function_executing_message, parent=self.parent)
             return
         self.close_param_validation_win()
@@ -623,19 +1182,476 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
         if not self.validate_parameter_values(parameter_values):
             return
 
-        self._executor.execute(fn_info=self._fn_info, arguments=parameter_values)
+        if self.multi_run_enabled:
+            self._start_run(parameter_values)
+            return
+
+        self._cache_lookup_pending = True
+        self._bottom_area.set_execute_button_state(False)
+        self._lookup_cached_result(
+            parameter_values,
+            lambda key, hit, value: self._execute(parameter_values, key, hit, value),
+        )
+
+    def _execute(
+        self,
+        arguments: Dict[str, Any],
+        cache_key: Optional[str],
+        hit: bool,
+        cached_value: Any,
+    ):
+        self._cache_lookup_pending = False
+        if self._main_area is None:
+            return
+        if hit:
+            self._bottom_area.set_execute_button_state(True)
+            self._main_area.show_output_tab()
+            if self.clear_output_on_execute.get():
+                self._output_channel.discard()
+                self._main_area.output_view.clear()
+            self._handle_cached_result(cached_value, printer=self.print)
+            return
+        self._pending_cache_key = cache_key
+        self._cancel_requested = False
+        self._executor.execute(fn_info=self._fn_info, arguments=arguments)
 
     def on_cancel(self):
         if not self._fn_info.cancelable:
             show_warning(self.config.uncancelable_function_message, parent=self.parent)
             return
+        if self.multi_run_enabled:
+            active_runs = [s.run_id for s in self._runs.values() if s.is_active]
+            if not active_runs:
+                show_warning(
+                    self.config.function_not_executing_message, parent=self.parent
+                )
+                return
+            self.cancel_runs(active_runs)
+            return
         if not self._executor.is_executing:
             show_warning(self.config.function_not_executing_message, parent=self.parent)
             return
+        self._cancel_requested = True
         self._executor.try_cancel()
 
+    def cancel_runs(self, run_ids: List[int]):
+        """请求取消指定的各次执行，已结束的执行将被忽略"""
+        if not self._fn_info.cancelable:
+            show_warning(self.config.uncancelable_function_message, parent=self.parent)
+            return
+        for run_id in run_ids:
+            slot = self._runs.get(run_id)
+            if slot is not None and slot.is_active and slot.executor is not None:
+                slot.cancel_requested = True
+                slot.executor.try_cancel()
+
+    def close_finished_runs(self):
+        """关闭所有已结束的执行的输出Tab页，并将其从执行列表中移除"""
+        for run_id, slot in list(self._runs.items()):
+            if slot.is_active:
+                continue
+            slot.channel.stop(flush=False)
+            self._main_area.remove_run_tab(run_id)
+            self._main_area.run_list_view.remove_run(run_id)
+            del self._runs[run_id]
+
+    def _start_run(self, arguments: Dict[str, Any]):
+        config = self.config
+        run_id = UContext.next_run_id()
+        view = self._main_area.add_run_tab(run_id)
+        channel = OutputChannel(
+            view.write,
+            flush_interval=config.output_flush_interval,
+            policy=config.output_policy,
+            max_pending_chars=config.output_max_pending_chars,
+        )
+        channel.start(self.parent)
+        slot = _RunSlot(run_id, view, channel)
+        self._runs[run_id] = slot
+        self._main_area.run_list_view.add_run(
+            run_id,
+            state=msgs().MSG_RUN_STATE_QUEUED,
+            title=msgs().MSG_RUN_TAB_TITLE.format(run_id),
+        )
+        self._main_area.show_run_tab(run_id)
+        self._update_run_buttons()
+        self._lookup_cached_result(
+            arguments,
+            lambda key, hit, value: self._continue_run(
+                slot, arguments, key, hit, value
+            ),
+        )
+
+    def _continue_run(
+        self,
+        slot: _RunSlot,
+        arguments: Dict[str, Any],
+        cache_key: Optional[str],
+        hit: bool,
+        cached_value: Any,
+    ):
+        if self._main_area is None:
+            return
+        run_id = slot.run_id
+        slot.cache_key = cache_key
+        if hit:
+            slot.state = "done"
+            slot.started_at = slot.finished_at = time.monotonic()
+            slot.return_value = cached_value
+            self._main_area.run_list_view.update_run(
+                run_id,
+                state=msgs().MSG_RUN_STATE_DONE,
+                duration=0,
+                result=repr(cached_value),
+            )
+            self._handle_cached_result(cached_value, printer=slot.print)
+            self._update_run_buttons()
+            return
+
+        executor_cls = self._fn_info.executor or ThreadedExecutor
+        slot.executor = executor_cls(listener=_RunListener(self, slot))
+        try:
+            slot.executor.execute(fn_info=self._fn_info, arguments=arguments)
+        except BaseException as e:
+            _exception(e, f"failed to start run #{run_id}")
+            self.on_run_finish(slot, arguments, None, e)
+            return
+        self._update_run_buttons()
+        self._schedule_run_refresh()
+
+    def on_run_start(self, slot: _RunSlot):
+        slot.state = "running"
+        slot.started_at = time.monotonic()
+        if self._main_area is None:
+            return
+        self._main_area.run_list_view.update_run(
+            slot.run_id, state=msgs().MSG_RUN_STATE_RUNNING, duration=0
+        )
+
+    def on_run_finish(
+        self,
+        slot: _RunSlot,
+        arguments: Dict[str, Any],
+        return_value: Any,
+        exception: Optional[BaseException],
+    ):
+        slot.finished_at = time.monotonic()
+        if slot.started_at is None:
+            slot.started_at = slot.finished_at
+        slot.return_value = return_value
+        slot.exception = exception
+        if self._main_area is None:
+            return
+        self._finish_progress_tasks(slot.run_id)
+
+        msgs_ = msgs()
+        if isinstance(exception, CancelledError) or (
+            exception is None and slot.cancel_requested
+        ):
+            slot.state = "cancelled"
+            state_text, result_text = msgs_.MSG_RUN_STATE_CANCELLED, ""
+        elif exception is not None:
+            slot.state = "failed"
+            state_text = msgs_.MSG_RUN_STATE_FAILED
+            result_text = f"{type(exception).__name__}: {exception}"
+        else:
+            slot.state = "done"
+            state_text, result_text = msgs_.MSG_RUN_STATE_DONE, repr(return_value)
+        self._main_area.run_list_view.update_run(
+            slot.run_id, state=state_text, duration=slot.duration, result=result_text
+        )
+        self._update_run_buttons()
+
+        if isinstance(exception, CancelledError):
+            slot.print(f"\033[93m{msgs_.MSG_FUNC_CANCELLED}\033[0m")
+        elif exception:
+            self._handle_function_exception(exception, printer=slot.print)
+        else:
+            self._handle_function_result(return_value, printer=slot.print)
+            if slot.state == "done" and slot.cache_key is not None:
+                self._store_cached_result(
+                    slot.cache_key, return_value, printer=slot.print
+                )
+        self._print_stream_summary(slot.result_stream, printer=slot.print)
+        if self._fn_info.after_execute_callback:
+            self._fn_info.after_execute_callback(self, return_value, exception)
+
+    def _lookup_cached_result(
+        self,
+        arguments: Dict[str, Any],
+        callback: Callable[[Optional[str], bool, Any], None],
+    ):
+        # 查找结果缓存，并以(缓存键, 是否命中, 缓存的值)为参数在主线程中调用callback，
+        # 未启用缓存或参数无法计算缓存键时缓存键为None。
+        # 参数中包含文件、目录时计算缓存键需要读取文件内容，缓存保存在磁盘上时命中需要读取并unpickle文件，
+        # 这两种情况下在摘要服务的线程池中查找，以免阻塞界面，也不会排在共享线程池中长时间运行的函数之后
+        cache = self._fn_info.cache
+        if cache is None:
+            callback(None, False, None)
+            return
+        fn_name = self._cache_name
+        if not self._path_parameters and cache.persist_dir is None:
+            callback(*self._find_cached_result(cache, fn_name, arguments, ()))
+            return
+        future = cache.fingerprinter.submit(
+            self._find_cached_result, cache, fn_name, arguments, self._path_parameters
+        )
+        future.add_done_callback(lambda f: UContext.dispatch(callback, *f.result()))
+
+    @staticmethod
+    def _find_cached_result(
+        cache: ResultCache,
+        fn_name: str,
+        arguments: Dict[str, Any],
+        path_parameters: Tuple[str, ...],
+    ) -> Tuple[Optional[str], bool, Any]:
+        try:
+            key = cache.make_key(fn_name, arguments, path_parameters)
+        except BaseException as e:
+            _exception(e, "failed to compute cache key, cache will be bypassed")
+            return None, False, None
+        hit, value = cache.lookup(key)
+        return key, hit, value
+
+    def _handle_cached_result(self, return_value: Any, printer: Callable[[str], None]):
+        printer(f"\033[2m{msgs().MSG_CACHE_HIT}\033[0m")
+        self._handle_function_result(return_value, printer=printer)
+        self._print_cache_stats(printer)
+        if self._fn_info.after_execute_callback:
+            self._fn_info.after_execute_callback(self, return_value, None)
+
+    def _store_cached_result(
+        self, key: str, return_value: Any, printer: Callable[[str], None]
+    ):
+        # 需要pickle返回值（保存到磁盘或按大小淘汰）时在后台线程中写入，以免较大的返回值阻塞界面
+        future = self._fn_info.cache.put_async(key, return_value)
+        if future.done():
+            self._on_cached_result_stored(future, printer)
+        else:
+            future.add_done_callback(
+                lambda f: UContext.dispatch(self._on_cached_result_stored, f, printer)
+            )
+
+    def _on_cached_result_stored(self, future: Future, printer: Callable[[str], None]):
+        exception = future.exception()
+        if exception is not None:
+            _exception(exception, "failed to cache function result")
+        self._print_cache_stats(printer)
+
+    def _print_cache_stats(self, printer: Callable[[str], None]):
+        stats = self._fn_info.cache.stats()
+        printer(
+            "\033[2m"
+            + msgs().MSG_CACHE_STATS.format(
+                stats.hits, stats.misses, stats.evictions, stats.entries
+            )
+            + "\033[0m"
+        )
+
+    @property
+    def batch_runner(self) -> Optional[BatchRunner]:
+        return self._batch_runner
+
+    @property
+    def batch_items(self) -> List[Dict[str, Any]]:
+        return list(self._batch_items)
+
+    def is_batch_running(self) -> bool:
+        return self._batch_runner is not None and self._batch_runner.is_running
+
+    def add_batch_items(self, items: Iterable[Dict[str, Any]]):
+        """将多组参数加入批量执行列表"""
+        if self.is_batch_running():
+            show_warning(msgs().MSG_BATCH_RUNNING, parent=self.parent)
+            return
+        self._batch_items.extend(dict(item) for item in items)
+        self._reset_batch_view()
+
+    def remove_batch_items(self, indexes: List[int]):
+        if self.is_batch_running():
+            return
+        indexes = set(indexes)
+        self._batch_items = [
+            item for i, item in enumerate(self._batch_items) if i not in indexes
+        ]
+        self._reset_batch_view()
+
+    def clear_batch_items(self):
+        if self.is_batch_running():
+            return
+        self._batch_items.clear()
+        self._reset_batch_view()
+
+    def on_add_batch_item(self):
+        self.close_param_validation_win()
+        if self._fn_info.parameters_grouped:
+            parameter_values = self.get_grouped_parameter_values()
+        else:
+            parameter_values = self.get_parameter_values()
+        if not self.validate_parameter_values(parameter_values):
+            return
+        factory = self.config.batch_items_factory
+        try:
+            items = factory(parameter_values) if factory else [parameter_values]
+            self.add_batch_items(items)
+        except BaseException as e:
+            _exception(e, "failed to create batch items")
+            show_error(str(e), parent=self.parent)
+
+    def run_batch(self, items: Optional[Iterable[Dict[str, Any]]] = None):
+        """
+        批量执行。items为None时执行批量执行列表中的各组参数，否则先用items替换列表。
+        各项的输出写入“函数输出”Tab页，结果显示在“批量”Tab页的表格中。
+        """
+        msgs_ = msgs()
+        if self.is_batch_running() or self.is_function_executing():
+            show_warning(msgs_.MSG_BATCH_RUNNING, parent=self.parent)
+            return
+        if items is not None:
+            self._batch_items = [dict(item) for item in items]
+        if not self._batch_items:
+            show_warning(msgs_.MSG_BATCH_NO_ITEMS, parent=self.parent)
+            return
+        self._reset_batch_view()
+        config = self.config
+
+        def _on_item_start(index: int, _arguments: Dict[str, Any]):
+            UContext.dispatch(self._on_batch_item_start, index)
+
+        def _on_item_finished(result: BatchItemResult):
+            UContext.dispatch(self._on_batch_item_finished, result)
+
+        self._batch_runner = BatchRunner(
+            self._fn_info.fn,
+            self._batch_items,
+            max_workers=config.batch_max_workers,
+            use_processes=config.batch_use_processes
+            or uses_processes(self._fn_info.executor),
+            window=self,
+            output_channel=self._output_channel,
+            capture_output=config.capture_output,
+            cache=self._fn_info.cache,
+            cache_name=self._cache_name,
+            cache_path_parameters=self._path_parameters,
+            on_item_start=_on_item_start,
+            on_item_finished=_on_item_finished,
+            timeout=self._fn_info.timeout,
+            hard_timeout=self._fn_info.hard_timeout,
+        )
+        batch_view = self._main_area.batch_view
+        if batch_view is not None:
+            batch_view.set_running(True)
+            self._main_area.show_batch_tab()
+        self._bottom_area.set_execute_button_state(False)
+        self._batch_runner.start()
+        self._refresh_batch()
+
+    def cancel_batch(self):
+        if self.is_batch_running():
+            self._batch_runner.cancel()
+
+    def cancel_batch_items(self, indexes: List[int]):
+        if not self.is_batch_running():
+            return
+        for index in indexes:
+            self._batch_runner.cancel_item(index)
+
+    def _reset_batch_view(self):
+        batch_view = self._main_area.batch_view
+        if batch_view is None:
+            return
+        batch_view.set_items(self._batch_items, state=msgs().MSG_RUN_STATE_QUEUED)
+        batch_view.set_progress(0, "")
+
+    def _on_batch_item_start(self, index: int):
+        if self._main_area is None or self._main_area.batch_view is None:
+            return
+        self._main_area.batch_view.update_item(
+            index, state=msgs().MSG_RUN_STATE_RUNNING
+        )
+
+    def _on_batch_item_finished(self, result: BatchItemResult):
+        if self._main_area is None or self._main_area.batch_view is None:
+            return
+        msgs_ = msgs()
+        if result.state == "done":
+            state_text, result_text = msgs_.MSG_RUN_STATE_DONE, repr(
+                result.return_value
+            )
+        elif result.state == "failed":
+            state_text = msgs_.MSG_RUN_STATE_FAILED
+            result_text = f"{type(result.exception).__name__}: {result.exception}"
+        else:
+            state_text, result_text = msgs_.MSG_RUN_STATE_CANCELLED, ""
+        self._main_area.batch_view.update_item(
+            result.index,
+            state=state_text,
+            duration=result.duration,
+            result=result_text,
+        )
+
+    def _refresh_batch(self):
+        # 定期刷新批量执行的整体进度，批量执行结束后停止刷新
+        self._batch_refresh_id = None
+        runner = self._batch_runner
+        if self._main_area is None or runner is None:
+            return
+        msgs_ = msgs()
+        progress = runner.progress()
+        batch_view = self._main_area.batch_view
+        if batch_view is not None:
+            eta = "-" if progress.eta is None else format_duration(progress.eta)
+            batch_view.set_progress(
+                progress.percent,
+                msgs_.MSG_BATCH_PROGRESS.format(
+                    progress.finished,
+                    progress.total,
+                    progress.failed,
+                    progress.cancelled,
+                    format_duration(progress.elapsed),
+                    eta,
+                ),
+            )
+        if runner.is_running:
+            self._batch_refresh_id = self.parent.after(250, self._refresh_batch)
+            return
+        if batch_view is not None:
+            batch_view.set_running(False)
+        self._bottom_area.set_execute_button_state(True)
+        self.print(
+            msgs_.MSG_BATCH_SUMMARY.format(
+                progress.succeeded, progress.failed, progress.cancelled
+            )
+        )
+
+    def _update_run_buttons(self):
+        active = self.active_run_count()
+        self._bottom_area.set_execute_button_state(
+            active < self.config.max_concurrent_runs
+        )
+        self._bottom_area.set_cancel_button_state(
+            self._fn_info.cancelable and active > 0
+        )
+
+    def _schedule_run_refresh(self):
+        if self._run_refresh_id is None:
+            self._run_refresh_id = self.parent.after(500, self._refresh_runs)
+
+    def _refresh_runs(self):
+        # 定期刷新正在执行的各次执行的耗时，没有正在执行的执行时停止刷新
+        self._run_refresh_id = None
+        if self._main_area is None:
+            return
+        run_list_view = self._main_area.run_list_view
+        for slot in self._runs.values():
+            if slot.state == "running":
+                run_list_view.update_run(slot.run_id, duration=slot.duration)
+        if self.active_run_count() > 0:
+            self._schedule_run_refresh()
+
     def on_clear_output(self):
         self.close_param_validation_win()
+        self._output_channel.discard()
         self._main_area.output_view.clear()
 
     def get_parameter_values(self) -> Dict[str, Union[Any, InvalidValue]]:
@@ -876,30 +1892,38 @@ class FnExecuteWindow(BaseWindow, ExecuteStateListener):
                 return config.label or param_name
         return param_name
 
-    def _handle_function_result(self, return_value: Any):
+    def _handle_function_result(
+        self, return_value: Any, printer: Optional[Callable[[str], None]] = None
+    ):
         if not (self.config.show_function_result or self.config.print_function_result):
             return
         config = self.config
+        printer = printer or self.print
         msg = config.function_result_message.format(return_value)
         if config.print_function_result:
-            self.print(f"\033[1m\033[92m{msg}\033[0m")
+            printer(f"\033[1m\033[92m{msg}\033[0m")
         if config.show_function_result:
             show_information(
                 title=config.result_dialog_title, message=msg, parent=self.parent
             )
 
-    def _handle_function_exception(self, exception: BaseException):
+    def _handle_function_exception(
+        self,
+        exception: BaseException,
+        printer: Optional[Callable[[str], None]] = None,
+    ):
         config = self.config
+        printer = printer or self.print
         print_traceback(exception)
         exc_type, exc_msg, exc_tb = get_exception_info(exception)
         exc_output_msg = config.function_error_message.format(exc_type, exc_msg).strip()
         if config.print_function_error:
-            self.print(
+            printer(
                 f"\033[1m\033[91m{msgs().MSG_EXCEPTION_DURING_EXEC}\n"
                 f"{exc_output_msg}\033[0m"
             )
             if config.function_error_traceback and exc_tb:
-                self.print(f"\033[1m\033[93mTraceback:\n{exc_tb}\033[0m")
+                printer(f"\033[1m\033[93mTraceback:\n{exc_tb}\033[0m")
         if config.show_function_error:
             show_error(
                 title=config.error_dialog_title,
@@ -0,0 +1,94 @@
+from pyguiadapterlite.components.ansi import (
+    AnsiParser,
+    DEFAULT_STYLE,
+    ANSI_PATTERN,
+    split_incomplete,
+    xterm_256_color,
+)
+
+RED = ("red", None, False, False, False, False)
+
+
+def test_plain_text():
+    parser = AnsiParser()
+    assert parser.feed("hello") == [("hello", DEFAULT_STYLE)]
+    assert parser.feed("") == []
+
+
+def test_sgr_colors_and_attributes():
+    parser = AnsiParser()
+    segments = parser.feed("a\x1b[31mb\x1b[1;4;44mc\x1b[22;24;49md\x1b[0me")
+    assert segments == [
+        ("a", DEFAULT_STYLE),
+        ("b", RED),
+        ("c", ("red", "blue", True, False, True, False)),
+        ("d", RED),
+        ("e", DEFAULT_STYLE),
+    ]
+
+
+def test_bright_and_extended_colors():
+    parser = AnsiParser()
+    parser.feed("\x1b[91;102m")
+    assert parser.style[:2] == ("bright_red", "bright_green")
+    parser.feed("\x1b[38;5;196m")
+    assert parser.style[0] == "#ff0000"
+    parser.feed("\x1b[48;2;1;2;300m")
+    assert parser.style[1] == "#0102ff"
+    parser.feed("\x1b[39;49m")
+    assert parser.style == DEFAULT_STYLE
+
+
+def test_style_persists_between_feeds():
+    parser = AnsiParser()
+    parser.feed("\x1b[31m")
+    assert parser.feed("x") == [("x", RED)]
+
+
+def test_split_escape_sequence():
+    parser = AnsiParser()
+    assert parser.feed("a\x1b[3") == [("a", DEFAULT_STYLE)]
+    assert parser.has_pending
+    assert parser.feed("1mb") == [("b", RED)]
+    assert not parser.has_pending
+
+
+def test_non_sgr_sequences_are_ignored():
+    parser = AnsiParser()
+    assert parser.feed("a\x1b[2Kb\x1b[?25lc") == [
+        ("a", DEFAULT_STYLE),
+        ("b", DEFAULT_STYLE),
+        ("c", DEFAULT_STYLE),
+    ]
+
+
+def test_set_style_and_reset():
+    parser = AnsiParser()
+    parser.set_style(RED)
+    assert parser.feed("x") == [("x", RED)]
+    parser.feed("\x1b[")
+    parser.reset()
+    assert parser.style == DEFAULT_STYLE
+    assert not parser.has_pending
+
+
+def test_split_incomplete():
+    assert split_incomplete("abc") == ("abc", "")
+    assert split_incomplete("abc\x1b") == ("abc", "\x1b")
+    assert split_incomplete("abc\x1b[1;3") == ("abc", "\x1b[1;3")
+    assert split_incomplete("abc\x1b[1mdef") == ("abc\x1b[1mdef", "")
+
+
+def test_xterm_256_color():
+    assert xterm_256_color(1) == "red"
+    assert xterm_256_color(9) == "bright_red"
+    assert xterm_256_color(16) == "#000000"
+    assert xterm_256_color(231) == "#ffffff"
+    assert xterm_256_color(232) == "#080808"
+
+
+def test_ansi_pattern_strips_what_the_parser_drops():
+    text = "\x1b[1;31merror\x1b[0m\x1b[2K: \x1b[?25ldone\x1b[1A"
+    assert ANSI_PATTERN.sub("", text) == "error: done"
+    parser = AnsiParser()
+    assert "".join(segment for segment, _ in parser.feed(text)) == "error: done"
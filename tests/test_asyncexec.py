@@ -0,0 +1,69 @@
+import asyncio
+import contextvars
+import importlib
+import pkgutil
+import sys
+import threading
+
+import pytest
+
+import pyguiadapterlite
+from pyguiadapterlite.core.asyncexec import EventLoopThread, _run_in_thread
+from pyguiadapterlite.core.process import _call_function
+
+_var = contextvars.ContextVar("_var", default=None)
+
+
+def _module_names():
+    for module in pkgutil.walk_packages(
+        pyguiadapterlite.__path__, pyguiadapterlite.__name__ + "."
+    ):
+        # hdpi只能在Windows中导入
+        if module.name.endswith(".hdpi") and sys.platform != "win32":
+            continue
+        yield module.name
+
+
+@pytest.mark.parametrize("name", list(_module_names()))
+def test_import(name):
+    # 包括python_requires的最低版本（3.8）在内，所有模块都应能被导入
+    importlib.import_module(name)
+
+
+def test_run_in_thread_copies_context():
+    def _get(suffix):
+        return _var.get(), suffix, threading.current_thread()
+
+    async def _main():
+        _var.set("value")
+        return await _run_in_thread(_get, suffix="!")
+
+    value, suffix, thread = asyncio.run(_main())
+    assert (value, suffix) == ("value", "!")
+    assert thread is not threading.current_thread()
+
+
+def test_event_loop_thread():
+    loop_thread = EventLoopThread(name="TestLoop")
+    try:
+
+        async def _main():
+            await asyncio.sleep(0)
+            return loop_thread.in_loop_thread(), threading.current_thread().name
+
+        assert loop_thread.submit(_main()).result(5) == (True, "TestLoop")
+        assert not loop_thread.in_loop_thread()
+    finally:
+        loop_thread.stop()
+
+
+def test_call_function_runs_coroutines():
+    async def _async_add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    def _add(a, b):
+        return a + b
+
+    assert _call_function(_async_add, {"a": 1, "b": 2}) == 3
+    assert _call_function(_add, {"a": 1, "b": 2}) == 3
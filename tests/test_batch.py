@@ -0,0 +1,80 @@
+import threading
+import time
+
+from pyguiadapterlite.core.batch import BatchRunner, BatchCancelledError
+from pyguiadapterlite.core.context import is_cancel_requested
+from pyguiadapterlite.core.watchdog import ExecutionTimeoutError
+
+
+def test_cancel_item_skips_pending_item():
+    release = threading.Event()
+
+    def _fn(x):
+        if x == 0:
+            release.wait(5)
+        return x
+
+    # 只有一个线程，第二项在第一项结束前一直在排队
+    runner = BatchRunner(_fn, [{"x": 0}, {"x": 1}, {"x": 2}], max_workers=1).start()
+    runner.cancel_item(1)
+    release.set()
+    results = runner.wait(5)
+    assert [r.state for r in results] == ["done", "cancelled", "done"]
+    assert isinstance(results[1].exception, BatchCancelledError)
+    progress = runner.progress()
+    assert progress.finished == 3
+    assert progress.cancelled == 1
+    assert progress.succeeded == 2
+
+
+def test_cancel_item_requests_cancel_of_running_item():
+    started = threading.Event()
+
+    def _fn(x):
+        if x == 0:
+            started.set()
+            while not is_cancel_requested():
+                time.sleep(0.01)
+            return "stopped"
+        return x
+
+    runner = BatchRunner(_fn, [{"x": 0}, {"x": 1}], max_workers=2).start()
+    assert started.wait(5)
+    runner.cancel_item(0)
+    results = runner.wait(5)
+    # 响应取消请求而提前返回的项视为被取消，其他项不受影响
+    assert results[0].state == "cancelled"
+    assert results[0].return_value == "stopped"
+    assert results[1].state == "done"
+
+
+def test_soft_timeout_requests_cancel():
+    def _fn(x):
+        while not is_cancel_requested():
+            time.sleep(0.01)
+        return x
+
+    runner = BatchRunner(_fn, [{"x": 0}], timeout=0.05).start()
+    results = runner.wait(5)
+    assert results[0].state == "cancelled"
+
+
+def test_hard_timeout_fails_only_the_stuck_item():
+    release = threading.Event()
+
+    def _fn(x):
+        if x == 0:
+            release.wait(5)
+            return "late"
+        return x
+
+    runner = BatchRunner(
+        _fn, [{"x": 0}, {"x": 1}, {"x": 2}], max_workers=1, hard_timeout=0.1
+    ).start()
+    results = runner.wait(5)
+    release.set()
+    assert results[0].state == "failed"
+    assert isinstance(results[0].exception, ExecutionTimeoutError)
+    # 执行该项的线程被放弃，其余的项由新的线程继续执行
+    assert [r.state for r in results[1:]] == ["done", "done"]
+    assert [r.return_value for r in results[1:]] == [1, 2]
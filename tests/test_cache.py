@@ -0,0 +1,161 @@
+import dataclasses
+from pathlib import Path
+
+from pyguiadapterlite.core.cache import (
+    ResultCache,
+    function_identity,
+    make_cache_key,
+    normalize_value,
+)
+from pyguiadapterlite.core.fingerprint import FileFingerprinter
+
+
+class _PickleCounter(object):
+    # 记录被pickle的次数，用于检查只在需要时才序列化返回值
+    dumps = 0
+
+    def __reduce__(self):
+        _PickleCounter.dumps += 1
+        return _PickleCounter, ()
+
+
+@dataclasses.dataclass
+class _Point(object):
+    x: int
+    y: int
+
+
+def _add(a, b):
+    return a + b
+
+
+def _outer():
+    def _add(a, b):
+        return a + b
+
+    return _add
+
+
+def test_normalize_value():
+    assert normalize_value({"b": 1, "a": 2}) == normalize_value({"a": 2, "b": 1})
+    assert normalize_value({1, 2, 3}) == normalize_value({3, 2, 1})
+    assert normalize_value([1, 2]) != normalize_value((1, 2))
+    assert normalize_value(Path("a") / "b") == ("path", "a/b")
+    assert normalize_value(_Point(1, 2)) == normalize_value(_Point(1, 2))
+    assert normalize_value(_Point(1, 2)) != normalize_value(_Point(2, 1))
+
+
+def test_make_cache_key():
+    key = make_cache_key("fn", {"a": 1, "b": [1, 2]})
+    assert key == make_cache_key("fn", {"b": [1, 2], "a": 1})
+    assert key != make_cache_key("fn", {"a": 2, "b": [1, 2]})
+    assert key != make_cache_key("other", {"a": 1, "b": [1, 2]})
+
+
+def test_function_identity():
+    identity = function_identity(_add)
+    assert identity.startswith(f"{__name__}._add:")
+    assert identity == function_identity(_add)
+    # 同名但限定名不同的函数
+    inner = _outer()
+    assert function_identity(inner).startswith(f"{__name__}._outer.<locals>._add:")
+    assert function_identity(inner) != identity
+
+    # 代码被修改后标识随之改变
+    def _changed(a, b):
+        return a - b
+
+    assert function_identity(_changed).split(":")[1] != identity.split(":")[1]
+
+
+def test_lookup_and_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.lookup("a") == (True, 1)
+    cache.put("c", 3)
+    # b最久未被使用，被淘汰
+    assert cache.lookup("b") == (False, None)
+    assert cache.get("c") == 3
+    assert cache.get("missing", "default") == "default"
+
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.evictions == 1
+    assert stats.hits == 2
+    assert stats.misses == 2
+    assert stats.hit_rate == 0.5
+
+
+def test_put_without_serialization():
+    cache = ResultCache()
+    assert not cache.needs_serialization
+    _PickleCounter.dumps = 0
+    value = _PickleCounter()
+    cache.put("key", value)
+    future = cache.put_async("key2", value)
+    assert future.done()
+    assert _PickleCounter.dumps == 0
+    assert cache.get("key") is value
+    assert cache.get("key2") is value
+    assert cache.stats().size == 0
+
+
+def test_max_size_eviction():
+    cache = ResultCache(max_entries=0, max_size=1000)
+    assert cache.needs_serialization
+    cache.put("small", b"x" * 10)
+    cache.put("large", b"x" * 2000)
+    assert "small" not in cache
+    assert "large" not in cache
+    assert cache.stats().size == 0
+
+
+def test_unpicklable_value_is_kept_in_memory(tmp_path):
+    cache = ResultCache(persist_dir=tmp_path)
+    value = lambda: None  # noqa: E731
+    cache.put("key", value)
+    assert cache.get("key") is value
+    assert cache.stats().disk_entries == 0
+
+
+def test_persist_dir(tmp_path):
+    cache = ResultCache(persist_dir=tmp_path)
+    assert cache.needs_serialization
+    cache.put_async("key", {"result": [1, 2, 3]}).result(5)
+    assert (tmp_path / "key.pkl").is_file()
+
+    reloaded = ResultCache(persist_dir=tmp_path)
+    assert "key" in reloaded
+    assert reloaded.lookup("key") == (True, {"result": [1, 2, 3]})
+    assert reloaded.stats().disk_hits == 1
+
+    reloaded.clear()
+    assert "key" not in reloaded
+    assert not (tmp_path / "key.pkl").exists()
+
+
+def test_max_disk_size(tmp_path):
+    cache = ResultCache(persist_dir=tmp_path, max_disk_size=300)
+    for key in ("a", "b", "c"):
+        cache.put(key, b"x" * 120)
+    assert not (tmp_path / "a.pkl").exists()
+    assert (tmp_path / "c.pkl").is_file()
+    assert cache.stats().disk_size <= 300
+
+
+def test_content_keys(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("one")
+    cache = ResultCache(fingerprinter=FileFingerprinter())
+    key = cache.make_key("fn", {"path": str(path)}, ["path"])
+    assert key == cache.make_key("fn", {"path": str(path)}, ["path"])
+
+    path.write_text("two!")
+    assert key != cache.make_key("fn", {"path": str(path)}, ["path"])
+
+    plain = ResultCache(content_keys=False)
+    assert plain.make_key("fn", {"path": str(path)}, ["path"]) == make_cache_key(
+        "fn", {"path": str(path)}
+    )
+    cache.fingerprinter.shutdown()
@@ -0,0 +1,148 @@
+import threading
+import time
+
+from pyguiadapterlite.core.dispatcher import UIDispatcher
+
+
+class _FakeWidget(object):
+    # 记录after()调度的回调及其延迟，由测试手动触发
+    def __init__(self):
+        self.callbacks = {}
+        self.delays = []
+        self._next_id = 0
+
+    def after(self, ms, func):
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.callbacks[after_id] = func
+        self.delays.append(ms)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for func in callbacks.values():
+            func()
+
+
+def test_operations_run_in_submission_order():
+    dispatcher = UIDispatcher()
+    order = []
+    for i in range(5):
+        dispatcher.submit(order.append, i)
+    assert dispatcher.pump() is False
+    assert order == [0, 1, 2, 3, 4]
+    stats = dispatcher.stats()
+    assert stats.dispatched == 5
+    assert stats.pending == 0
+    assert stats.max_pending == 5
+
+
+def test_pump_stops_when_budget_is_exceeded():
+    dispatcher = UIDispatcher(budget=0.01)
+    done = []
+
+    def _slow(i):
+        time.sleep(0.006)
+        done.append(i)
+
+    for i in range(6):
+        dispatcher.submit(_slow, i)
+    # 超出时间预算后剩余的操作留到下一次处理
+    assert dispatcher.pump() is True
+    assert 0 < len(done) < 6
+    assert dispatcher.stats().overruns == 1
+    while dispatcher.pump():
+        pass
+    assert done == list(range(6))
+
+
+def test_pump_without_budget_runs_everything():
+    dispatcher = UIDispatcher(budget=0.001)
+    done = []
+    for i in range(3):
+        dispatcher.submit(lambda i=i: (time.sleep(0.002), done.append(i)))
+    assert dispatcher.pump(budget=None) is False
+    assert done == [0, 1, 2]
+
+
+def test_exception_does_not_stop_queue():
+    dispatcher = UIDispatcher()
+    done = []
+
+    def _raise():
+        raise RuntimeError("ui callback failed")
+
+    dispatcher.submit(_raise)
+    dispatcher.submit(done.append, 1)
+    dispatcher.pump()
+    assert done == [1]
+
+
+def test_call_returns_result_future():
+    dispatcher = UIDispatcher()
+    future = dispatcher.call(lambda a, b: a + b, 1, 2)
+    assert not future.done()
+    dispatcher.pump()
+    assert future.result(0) == 3
+
+
+def test_stop_cancels_pending_calls():
+    dispatcher = UIDispatcher()
+    widget = _FakeWidget()
+    dispatcher.start(widget)
+    assert dispatcher.is_running
+    executed = []
+    future = dispatcher.call(executed.append, 1)
+    dispatcher.submit(executed.append, 2)
+    dispatcher.stop()
+    # 未执行的操作被丢弃，等待结果的线程不会永远阻塞
+    assert future.cancelled()
+    assert executed == []
+    assert widget.callbacks == {}
+    assert not dispatcher.is_running
+
+
+def test_stop_with_drain_runs_pending_calls():
+    dispatcher = UIDispatcher()
+    dispatcher.start(_FakeWidget())
+    future = dispatcher.call(lambda: "done")
+    dispatcher.stop(drain=True)
+    assert future.result(0) == "done"
+
+
+def test_waiting_thread_is_released_on_stop():
+    dispatcher = UIDispatcher()
+    dispatcher.start(_FakeWidget())
+    future = dispatcher.call(lambda: None)
+    released = threading.Event()
+
+    def _wait():
+        try:
+            future.result(5)
+        except BaseException:
+            pass
+        released.set()
+
+    thread = threading.Thread(target=_wait)
+    thread.start()
+    dispatcher.stop()
+    assert released.wait(5)
+    thread.join()
+
+
+def test_idle_ticks_back_off():
+    dispatcher = UIDispatcher(interval=10, idle_interval=40)
+    widget = _FakeWidget()
+    dispatcher.start(widget)
+    for _ in range(4):
+        widget.run_pending()
+    assert widget.delays == [10, 20, 40, 40, 40]
+
+    # 有新的操作后恢复为interval
+    dispatcher.submit(lambda: None)
+    widget.run_pending()
+    assert widget.delays[-1] == 10
+    dispatcher.stop()
@@ -0,0 +1,139 @@
+import json
+import os
+
+import pytest
+
+from pyguiadapterlite.core import fingerprint
+from pyguiadapterlite.core.fingerprint import (
+    FileFingerprinter,
+    MISSING_DIGEST,
+    default_fingerprinter,
+    set_fingerprint_index_path,
+)
+
+
+@pytest.fixture
+def fingerprinter():
+    fp = FileFingerprinter()
+    yield fp
+    fp.shutdown()
+
+
+def test_file_digest(tmp_path, fingerprinter):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"hello")
+    digest = fingerprinter.fingerprint(path)
+    assert digest == fingerprinter.fingerprint(str(path))
+    assert fingerprinter.stats()["hashed_files"] == 1
+    # 大小和修改时间未变时使用索引中的摘要
+    assert fingerprinter.stats()["index_hits"] == 1
+
+    path.write_bytes(b"world!")
+    assert fingerprinter.fingerprint(path) != digest
+    assert fingerprinter.fingerprint(tmp_path / "missing") == MISSING_DIGEST
+
+
+def test_directory_digest(tmp_path, fingerprinter):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    (tmp_path / "a.txt").write_text("a")
+    digest = fingerprinter.fingerprint(tmp_path)
+
+    snapshot = fingerprinter.snapshot([tmp_path, tmp_path / "a.txt"])
+    assert fingerprinter.changed_paths(snapshot) == []
+
+    (tmp_path / "sub" / "b.txt").write_text("bb")
+    modified = fingerprinter.fingerprint(tmp_path)
+    assert modified != digest
+    assert fingerprinter.changed_paths(snapshot) == [os.path.abspath(tmp_path)]
+
+    # 新建的空文件也会改变目录的摘要
+    (tmp_path / "sub" / "c.txt").write_text("")
+    assert fingerprinter.fingerprint(tmp_path) not in (digest, modified)
+
+
+def test_fingerprint_arguments(tmp_path, fingerprinter):
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    arguments = {"file": str(path), "files": [str(path), ""], "n": 1, "empty": ""}
+    result = fingerprinter.fingerprint_arguments(arguments, ["file", "files", "empty"])
+    digest = fingerprinter.fingerprint(path)
+    key = ("content", os.path.abspath(path), digest)
+    assert result["file"] == key
+    assert result["files"] == (key, "")
+    assert result["n"] == 1
+    assert result["empty"] == ""
+
+
+def test_fingerprint_arguments_keeps_path(tmp_path, fingerprinter):
+    # 内容相同、路径不同的文件得到不同的键
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("same")
+    second.write_text("same")
+    assert fingerprinter.fingerprint(first) == fingerprinter.fingerprint(second)
+    a = fingerprinter.fingerprint_arguments({"file": str(first)}, ["file"])
+    b = fingerprinter.fingerprint_arguments({"file": str(second)}, ["file"])
+    assert a["file"] != b["file"]
+
+
+def test_index_lru_limit(tmp_path):
+    fp = FileFingerprinter(max_index_entries=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.txt"
+        path.write_text(str(i))
+        paths.append(path)
+    fp.fingerprint(paths[0])
+    fp.fingerprint(paths[1])
+    fp.fingerprint(paths[0])
+    fp.fingerprint(paths[2])
+    assert fp.stats()["indexed_files"] == 2
+    # paths[1]最久未使用，已被移出索引，需要重新计算
+    hashed = fp.stats()["hashed_files"]
+    fp.fingerprint(paths[0])
+    assert fp.stats()["hashed_files"] == hashed
+    fp.fingerprint(paths[1])
+    assert fp.stats()["hashed_files"] == hashed + 1
+    fp.shutdown()
+
+
+def test_index_persistence(tmp_path):
+    index_path = tmp_path / "index" / "fingerprints.json"
+    kept = tmp_path / "kept.txt"
+    removed = tmp_path / "removed.txt"
+    kept.write_text("kept")
+    removed.write_text("removed")
+
+    fp = FileFingerprinter(index_path=index_path)
+    digest = fp.fingerprint(kept)
+    fp.fingerprint(removed)
+    fp.shutdown()
+    with open(index_path, encoding="utf-8") as f:
+        assert len(json.load(f)["files"]) == 2
+
+    removed.unlink()
+    reloaded = FileFingerprinter(index_path=index_path)
+    assert reloaded.fingerprint(kept) == digest
+    stats = reloaded.stats()
+    assert stats["hashed_files"] == 0
+    # 已不存在的文件在加载索引时被移除
+    assert stats["indexed_files"] == 1
+    reloaded.shutdown()
+    with open(index_path, encoding="utf-8") as f:
+        assert list(json.load(f)["files"]) == [os.path.abspath(kept)]
+
+
+def test_default_fingerprinter_index_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(fingerprint, "_default_fingerprinter", None)
+    monkeypatch.setattr(fingerprint, "_default_index_path", None)
+    fp = default_fingerprinter()
+    assert fp is default_fingerprinter()
+    assert fp.index_path is None
+
+    index_path = tmp_path / "fingerprints.json"
+    set_fingerprint_index_path(index_path)
+    assert default_fingerprinter() is not fp
+    assert default_fingerprinter().index_path == index_path
+    default_fingerprinter().shutdown()
+    fp.shutdown()
@@ -0,0 +1,77 @@
+import pytest
+
+from pyguiadapterlite.components.linebuffer import LineBuffer
+
+
+def test_append_and_get_lines():
+    buffer = LineBuffer()
+    assert len(buffer) == 0
+    assert buffer.open_line_index == 0
+
+    assert buffer.append("first\nsec") == 1
+    assert len(buffer) == 2
+    assert buffer.open_line_index == 1
+    assert buffer[1] == "sec"
+
+    assert buffer.append("ond\nthird\n") == 2
+    # 末尾空的未结束行不计入行数
+    assert len(buffer) == 3
+    assert buffer.open_line_index == 3
+    assert buffer.get_lines(0, 10) == ["first", "second", "third"]
+    assert list(buffer.iter_lines(1)) == ["second", "third"]
+    assert buffer[-1] == "third"
+    with pytest.raises(IndexError):
+        _ = buffer[3]
+
+
+def test_non_ascii_text():
+    buffer = LineBuffer()
+    buffer.append("中文\n")
+    buffer.append("émoji 😀")
+    assert buffer[0] == "中文"
+    assert buffer[1] == "émoji 😀"
+    assert buffer.nbytes == len("中文\némoji 😀".encode("utf-8"))
+
+
+def test_discard_before_keeps_line_numbers():
+    buffer = LineBuffer()
+    buffer.append("".join(f"line{i}\n" for i in range(5)) + "open")
+    assert buffer.discard_before(3) == 3
+    assert buffer.first_line == 3
+    assert len(buffer) == 6
+    assert buffer[3] == "line3"
+    assert buffer[5] == "open"
+    assert buffer.get_lines(0, 6) == ["line3", "line4", "open"]
+    with pytest.raises(IndexError):
+        _ = buffer[2]
+
+    # 未结束的行不会被丢弃
+    assert buffer.discard_before(100) == 2
+    assert buffer.first_line == 5
+    assert buffer[5] == "open"
+    buffer.append("ed\nnext\n")
+    assert buffer.get_lines(5, 7) == ["opened", "next"]
+
+
+def test_clear_increments_epoch():
+    buffer = LineBuffer()
+    buffer.append("a\nb\n")
+    buffer.discard_before(1)
+    epoch = buffer.epoch
+    buffer.clear()
+    assert buffer.epoch == epoch + 1
+    assert len(buffer) == 0
+    assert buffer.first_line == 0
+    assert buffer.nbytes == 0
+
+
+def test_first_line_offsets_line_numbers():
+    buffer = LineBuffer(first_line=10)
+    buffer.append("a\nb\nopen")
+    assert buffer.first_line == 10
+    assert buffer.open_line_index == 12
+    assert len(buffer) == 13
+    assert buffer[10] == "a"
+    assert buffer.get_lines(0, 13) == ["a", "b", "open"]
+    buffer.clear()
+    assert buffer.first_line == 0
@@ -0,0 +1,194 @@
+import threading
+import time
+
+import pytest
+
+from pyguiadapterlite.core.outputchannel import OutputChannel
+
+
+class _FakeWidget(object):
+    # 只记录after()调度的回调，由测试手动触发刷新
+    def __init__(self):
+        self.callbacks = {}
+        self._next_id = 0
+
+    def after(self, _ms, func):
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.callbacks[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        OutputChannel(lambda _: None, policy="unknown")
+
+
+def test_unbounded_flush_joins_chunks():
+    out = []
+    channel = OutputChannel(out.append, max_pending_chars=4)
+    for text in ("hello ", "", "world", "\n"):
+        channel.write(text)
+    stats = channel.stats()
+    assert stats.pending_chunks == 3
+    assert stats.pending_chars == 12
+
+    channel.flush()
+    assert out == ["hello world\n"]
+    stats = channel.stats()
+    assert stats.pending_chars == 0
+    assert stats.total_flushes == 1
+    assert stats.dropped_chunks == 0
+
+    # 没有待刷新的文本时不调用sink
+    channel.flush()
+    assert out == ["hello world\n"]
+
+
+def test_drop_oldest_keeps_newest_text():
+    out = []
+    channel = OutputChannel(out.append, policy="drop_oldest", max_pending_chars=12)
+    for i in range(5):
+        channel.write(f"line{i}\n")
+    stats = channel.stats()
+    assert stats.pending_chars == 12
+    assert stats.dropped_chunks == 3
+    assert stats.dropped_lines == 3
+    assert stats.written_chars == 30
+
+    channel.flush()
+    assert len(out) == 1
+    # 提示行位于保留的输出之前
+    notice, rest = out[0].split("\n", 1)
+    assert "3" in notice
+    assert rest == "line3\nline4\n"
+
+
+def test_sample_keeps_buffered_text():
+    out = []
+    channel = OutputChannel(out.append, policy="sample", max_pending_chars=10)
+    for i in range(5):
+        channel.write(f"line{i}\n")
+    stats = channel.stats()
+    assert stats.pending_chars == 12
+    assert stats.dropped_lines == 3
+
+    channel.flush()
+    assert out[0].startswith("line0\nline1\n")
+    assert "3" in out[0][len("line0\nline1\n") :]
+
+    # 刷新后恢复写入
+    channel.write("next\n")
+    channel.flush()
+    assert out[-1] == "next\n"
+
+
+def test_block_waits_for_flush():
+    out = []
+    widget = _FakeWidget()
+    channel = OutputChannel(out.append, policy="block", max_pending_chars=4)
+    channel.start(widget)
+    channel.write("full")
+
+    done = threading.Event()
+
+    def producer():
+        channel.write("more")
+        done.set()
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    assert not done.wait(0.2)
+    assert channel.stats().blocked_count == 1
+
+    channel.flush()
+    assert done.wait(5)
+    thread.join(5)
+    channel.stop()
+    assert "".join(out) == "fullmore"
+    stats = channel.stats()
+    assert stats.dropped_chunks == 0
+    assert stats.blocked_time > 0
+
+
+def test_block_does_not_block_main_thread():
+    channel = OutputChannel(lambda _: None, policy="block", max_pending_chars=4)
+    channel.start(_FakeWidget())
+    channel.write("full")
+    channel.write("more")
+    assert channel.stats().pending_chars == 8
+    channel.stop(flush=False)
+
+
+def test_stop_releases_blocked_producer():
+    widget = _FakeWidget()
+    channel = OutputChannel(lambda _: None, policy="block", max_pending_chars=4)
+    channel.start(widget)
+    channel.write("full")
+    thread = threading.Thread(target=channel.write, args=("more",), daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    channel.stop(flush=False)
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_wait_for_capacity_timeout():
+    channel = OutputChannel(lambda _: None)
+    channel.start(_FakeWidget())
+    channel.write("12345")
+    assert not channel.wait_for_capacity(5, timeout=0.05)
+    assert channel.wait_for_capacity(6, timeout=0.05)
+    channel.discard()
+    assert channel.wait_for_capacity(1, timeout=0.05)
+    channel.stop()
+
+
+def test_tick_is_armed_only_while_output_is_pending():
+    out = []
+    widget = _FakeWidget()
+    channel = OutputChannel(out.append)
+    channel.start(widget)
+    assert channel.is_running
+
+    def run_tick():
+        ((after_id, tick),) = widget.callbacks.items()
+        del widget.callbacks[after_id]
+        tick()
+
+    # 启动时安排一次刷新，没有输出时不再重新安排
+    run_tick()
+    assert out == []
+    assert not widget.callbacks
+
+    channel.write("a")
+    channel.write("b")
+    assert len(widget.callbacks) == 1
+    run_tick()
+    assert out == ["ab"]
+    assert not widget.callbacks
+
+    channel.write("c")
+    channel.stop()
+    assert out == ["ab", "c"]
+    assert not channel.is_running
+    assert not widget.callbacks
+
+
+def test_write_from_worker_thread_arms_tick():
+    widget = _FakeWidget()
+    channel = OutputChannel(lambda _: None)
+    channel.start(widget)
+    widget.callbacks.clear()
+    channel._tick_id = None
+    channel._armed = False
+
+    thread = threading.Thread(target=channel.write, args=("a",))
+    thread.start()
+    thread.join(5)
+    # 界面操作队列未启动时，请求直接在写入的线程中执行
+    assert len(widget.callbacks) == 1
+    channel.stop()
@@ -0,0 +1,123 @@
+import threading
+
+from pyguiadapterlite.core.progresschannel import ProgressChannel
+
+
+class _FakeWidget(object):
+    # 只记录after()调度的回调，由测试手动触发刷新
+    def __init__(self):
+        self.callbacks = {}
+        self._next_id = 0
+
+    def after(self, _ms, func):
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.callbacks[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for func in callbacks.values():
+            func()
+
+
+class _FakeTarget(object):
+    def __init__(self):
+        self.calls = []
+
+    def start_progressbar(self, total, mode, initial_value, initial_msg):
+        self.calls.append(("start", total, initial_value))
+
+    def update_progressbar(self, value, msg=None):
+        self.calls.append(("update", value, msg))
+
+    def stop_progressbar(self, hide_after_stop=False):
+        self.calls.append(("stop", hide_after_stop))
+
+
+def test_updates_are_coalesced():
+    target = _FakeTarget()
+    channel = ProgressChannel(target)
+    for i in range(100):
+        channel.update(i, f"step {i}")
+    channel.flush()
+    assert target.calls == [("update", 99, "step 99")]
+    stats = channel.stats()
+    assert stats.updates == 100
+    assert stats.applied == 1
+
+    # 没有新的更新时不会重复应用
+    channel.flush()
+    assert len(target.calls) == 1
+
+
+def test_commands_keep_their_order_with_updates():
+    target = _FakeTarget()
+    channel = ProgressChannel(target)
+    channel.update(5)
+    channel.start_progressbar(10)
+    channel.update(3)
+    channel.update(7)
+    channel.stop_progressbar()
+    channel.flush()
+    # 中间的值被丢弃，最新的值在其后提交的stop之前、start之后应用
+    assert target.calls == [("start", 10, 0), ("update", 7, None), ("stop", False)]
+
+
+def test_update_after_stop_is_applied_after_stop():
+    target = _FakeTarget()
+    channel = ProgressChannel(target)
+    channel.start_progressbar(10)
+    channel.stop_progressbar()
+    channel.update(1)
+    channel.flush()
+    assert target.calls == [("start", 10, 0), ("stop", False), ("update", 1, None)]
+
+
+def test_discard_drops_pending_updates_and_commands():
+    target = _FakeTarget()
+    channel = ProgressChannel(target)
+    channel.start_progressbar(10)
+    channel.update(4)
+    channel.discard()
+    channel.flush()
+    assert target.calls == []
+
+
+def test_tick_is_armed_only_while_updates_are_pending():
+    target = _FakeTarget()
+    widget = _FakeWidget()
+    channel = ProgressChannel(target)
+    channel.start(widget)
+    assert len(widget.callbacks) == 1
+    widget.run_pending()
+    # 空闲时不再安排刷新任务
+    assert widget.callbacks == {}
+
+    channel.update(1)
+    channel.update(2)
+    assert len(widget.callbacks) == 1
+    widget.run_pending()
+    assert target.calls == [("update", 2, None)]
+    assert widget.callbacks == {}
+
+    channel.stop()
+    assert not channel.is_running
+
+
+def test_update_from_worker_thread():
+    target = _FakeTarget()
+    channel = ProgressChannel(target)
+
+    def _produce():
+        for i in range(1000):
+            channel.update(i)
+
+    thread = threading.Thread(target=_produce)
+    thread.start()
+    thread.join()
+    channel.flush()
+    assert target.calls[-1] == ("update", 999, None)
@@ -0,0 +1,48 @@
+import pytest
+
+from pyguiadapterlite.components.spool import OutputSpool
+
+
+@pytest.fixture
+def spool():
+    s = OutputSpool(copy_chunk_size=4096)
+    yield s
+    s.close(timeout=5)
+
+
+def test_spool_strips_ansi(spool):
+    spool.write("\x1b[31mred\x1b")
+    spool.write("[0m plain\n")
+    assert spool.read_text(timeout=5) == "red plain\n"
+
+
+def test_copy_is_ordered_after_submitted_text(spool, tmp_path):
+    for i in range(10000):
+        spool.write(f"line {i}\n")
+    future = spool.copy_to_async(tmp_path / "copy.txt")
+    spool.write("after\n")
+    assert future.result(5) is None
+    text = (tmp_path / "copy.txt").read_text(encoding="utf-8")
+    assert text.count("\n") == 10000
+    assert "after" not in text
+
+    spool.copy_to(tmp_path / "copy2.txt", timeout=5)
+    assert (tmp_path / "copy2.txt").read_text(encoding="utf-8").endswith("after\n")
+
+
+def test_copy_error_is_reported_through_future(spool, tmp_path):
+    future = spool.copy_to_async(tmp_path / "missing" / "copy.txt")
+    assert isinstance(future.exception(5), OSError)
+
+
+def test_close_removes_temporary_file(tmp_path):
+    spool = OutputSpool()
+    path = spool.path
+    spool.write("text\n")
+    assert spool.close(timeout=5)
+    assert not path.exists()
+
+    kept = OutputSpool(tmp_path / "kept.log")
+    kept.write("text\n")
+    assert kept.close(timeout=5)
+    assert (tmp_path / "kept.log").read_text(encoding="utf-8") == "text\n"
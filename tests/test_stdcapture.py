@@ -0,0 +1,100 @@
+import asyncio
+import sys
+import threading
+
+
+from pyguiadapterlite.core.stdcapture import (
+    LineBufferedWriter,
+    StdCapture,
+    ThreadRoutedStream,
+)
+from pyguiadapterlite.core.workerpool import WorkerPool
+
+
+def test_line_buffered_writer():
+    out = []
+    writer = LineBufferedWriter(out.append, "<", ">")
+    writer.write("a")
+    writer.write("b\nc")
+    assert out == ["<ab\n>"]
+    writer.flush()
+    assert out == ["<ab\n>", "<c>"]
+    writer.flush()
+    assert len(out) == 2
+
+
+def test_capture_routes_stdout_and_stderr(capsys):
+    out = []
+    with StdCapture(out.append, stderr_prefix="E:", stderr_suffix=""):
+        assert isinstance(sys.stdout, ThreadRoutedStream)
+        assert not sys.stdout.isatty()
+        print("hello")
+        print("oops", file=sys.stderr)
+        sys.stdout.write("partial")
+    assert out == ["hello\n", "E:oops\n", "partial"]
+    print("after")
+    assert capsys.readouterr() == ("after\n", "")
+
+
+def test_other_threads_are_not_captured(capsys):
+    out = []
+    with StdCapture(out.append):
+        thread = threading.Thread(target=print, args=("other",))
+        thread.start()
+        thread.join(5)
+        print("captured")
+    assert out == ["captured\n"]
+    assert capsys.readouterr().out == "other\n"
+
+
+def test_capture_follows_pool_tasks():
+    out = []
+    pool = WorkerPool(max_workers=1, min_workers=0)
+    try:
+        with StdCapture(out.append):
+            pool.submit(print, "from pool").result(5)
+    finally:
+        pool.shutdown()
+    assert out == ["from pool\n"]
+
+
+def test_concurrent_tasks_on_one_loop(capsys):
+    outputs = {1: [], 2: []}
+
+    async def run(run_id: int, delay: float):
+        with StdCapture(outputs[run_id].append):
+            print(f"{run_id}: start")
+            await asyncio.sleep(delay)
+            print(f"{run_id}: end")
+
+    async def main():
+        await asyncio.gather(run(1, 0.01), run(2, 0.05))
+        print("loop")
+
+    asyncio.run(main())
+    assert outputs[1] == ["1: start\n", "1: end\n"]
+    # 先结束的执行不会移除其他执行的捕获
+    assert outputs[2] == ["2: start\n", "2: end\n"]
+    assert capsys.readouterr().out == "loop\n"
+
+
+def test_nested_capture():
+    outer, inner = [], []
+    with StdCapture(outer.append):
+        with StdCapture(inner.append):
+            print("inner")
+        print("outer")
+    assert inner == ["inner\n"]
+    assert outer == ["outer\n"]
+
+
+def test_missing_original_stream(monkeypatch):
+    monkeypatch.setattr(sys, "stdout", None)
+    proxy = ThreadRoutedStream(None)
+    assert proxy.write("ignored") == len("ignored")
+    proxy.flush()
+    assert not proxy.isatty()
+    out = []
+    with StdCapture(out.append):
+        print("captured")
+    assert out == ["captured\n"]
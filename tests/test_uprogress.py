@@ -0,0 +1,107 @@
+import threading
+from asyncio import CancelledError
+
+import pytest
+
+from pyguiadapterlite.core.progresschannel import ProgressChannel
+from pyguiadapterlite.core.ucontext import UContext, RunContext
+from pyguiadapterlite.core.uprogress import ProgressSink
+
+
+class _FakeWindow(object):
+    # 进度的更新经由进度通道交给记录调用的target，由测试手动刷新
+    def __init__(self, enabled: bool = True):
+        self.calls = []
+        self.enabled = enabled
+        self.progress_channel = ProgressChannel(self)
+
+    def is_progressbar_enabled(self) -> bool:
+        return self.enabled
+
+    def start_progressbar(self, total, mode, initial_value, initial_msg):
+        self.calls.append(("start", total, initial_value, initial_msg))
+
+    def update_progressbar(self, value, msg=None):
+        self.calls.append(("update", value, msg))
+
+    def stop_progressbar(self, hide_after_stop=False):
+        self.calls.append(("stop",))
+
+    def flush(self):
+        self.progress_channel.flush()
+        calls, self.calls = self.calls, []
+        return calls
+
+
+@pytest.fixture
+def window():
+    window = _FakeWindow()
+    run = RunContext(run_id=1, window=window, cancel_event=threading.Event())
+    with UContext.run_bound(run):
+        yield window
+
+
+def test_counts_start_then_update(window):
+    sink = ProgressSink()
+    sink.write("\rtask:  10%|#         | 1/10 [00:01<00:09,  1.00it/s]")
+    sink.write("\rtask:  20%|##        | 2/10 [00:02<00:08,  1.00it/s]")
+    # 未结束的行在下一次重绘或flush()时才被解析
+    sink.write("\rtask:  30%|###       | 3/10 [00:03<00:07,  1.00it/s]")
+    calls = window.flush()
+    assert calls[0] == (
+        "start",
+        10,
+        1,
+        "task: 10% 1/10 [00:01<00:09, 1.00it/s]",
+    )
+    assert calls[1] == ("update", 2, "task: 20% 2/10 [00:02<00:08, 1.00it/s]")
+
+    sink.flush()
+    assert window.flush() == [("update", 3, "task: 30% 3/10 [00:03<00:07, 1.00it/s]")]
+
+
+def test_only_last_complete_line_is_applied(window):
+    sink = ProgressSink()
+    sink.write("\r1/4\r2/4\r3/4\n")
+    calls = window.flush()
+    assert calls == [("start", 4, 3, "3/4")]
+
+
+def test_scaled_counts_and_percent(window):
+    sink = ProgressSink()
+    sink.write("\r1.5k/2.0M\n")
+    assert window.flush() == [("start", 2000000, 1500, "1.5k/2.0M")]
+
+    sink = ProgressSink()
+    sink.write("\rdownload:  42%|####  |\n")
+    assert window.flush() == [("start", 100, 42, "download: 42%")]
+
+
+def test_line_without_progress_updates_label_only(window):
+    sink = ProgressSink()
+    sink.write("\rwaiting for data\n")
+    assert window.flush() == [("update", 0, "waiting for data")]
+
+
+def test_write_is_ignored_when_progressbar_disabled(window):
+    window.enabled = False
+    sink = ProgressSink()
+    assert sink.write("\r1/2\n") == len("\r1/2\n")
+    sink.flush()
+    assert window.flush() == []
+
+
+def test_write_raises_when_cancelled(window):
+    sink = ProgressSink()
+    UContext.current_cancel_event().set()
+    with pytest.raises(CancelledError):
+        sink.write("\r1/2")
+    assert ProgressSink(check_cancel=False).write("\r1/2") == 4
+
+
+def test_write_from_another_thread_uses_creator_context(window):
+    sink = ProgressSink()
+    thread = threading.Thread(target=sink.write, args=("\r5/8\n",))
+    thread.start()
+    thread.join()
+    assert window.flush() == [("start", 8, 5, "5/8")]
@@ -0,0 +1,68 @@
+import threading
+
+from pyguiadapterlite.core.watchdog import Watchdog, ExecutionTimeoutError
+
+
+def test_soft_timeout_fires_before_hard_timeout():
+    watchdog = Watchdog(name="TestWatchdog")
+    events = []
+    done = threading.Event()
+
+    def _on_hard():
+        events.append("hard")
+        done.set()
+
+    handle = watchdog.watch(
+        0.02, 0.06, on_soft=lambda: events.append("soft"), on_hard=_on_hard
+    )
+    assert done.wait(5)
+    assert events == ["soft", "hard"]
+    # 硬超时到期后句柄不再有效
+    assert not handle.is_active
+    assert watchdog.pending() == 0
+
+
+def test_cancelled_watch_does_not_fire():
+    watchdog = Watchdog(name="TestWatchdog")
+    fired = threading.Event()
+    handle = watchdog.watch(0.05, 0.05, on_soft=fired.set, on_hard=fired.set)
+    assert watchdog.pending() == 2
+    handle.cancel()
+    assert watchdog.pending() == 0
+    assert not fired.wait(0.2)
+
+
+def test_earliest_deadline_fires_first():
+    watchdog = Watchdog(name="TestWatchdog")
+    order = []
+    done = threading.Event()
+
+    def _on_hard(name):
+        order.append(name)
+        if len(order) == 2:
+            done.set()
+
+    # 后登记、先到期的超时不必等待先登记的超时
+    watchdog.watch(None, 0.2, on_hard=lambda: _on_hard("late"))
+    watchdog.watch(None, 0.02, on_hard=lambda: _on_hard("early"))
+    assert done.wait(5)
+    assert order == ["early", "late"]
+
+
+def test_callback_exception_does_not_stop_watchdog():
+    watchdog = Watchdog(name="TestWatchdog")
+    fired = threading.Event()
+
+    def _raise():
+        raise RuntimeError("callback failed")
+
+    watchdog.watch(None, 0.01, on_hard=_raise)
+    watchdog.watch(None, 0.05, on_hard=fired.set)
+    assert fired.wait(5)
+
+
+def test_execution_timeout_error():
+    error = ExecutionTimeoutError(1.5)
+    assert isinstance(error, TimeoutError)
+    assert error.timeout == 1.5
+    assert "1.5" in str(error)
@@ -0,0 +1,55 @@
+import threading
+
+from pyguiadapterlite.core.workerpool import WorkerPool
+
+
+def test_abandon_cancels_queued_task():
+    pool = WorkerPool(max_workers=1, min_workers=0, name="TestPool")
+    release = threading.Event()
+    running = pool.submit(release.wait, 5)
+    queued = pool.submit(lambda: "never")
+    assert pool.abandon(queued)
+    assert queued.cancelled()
+    release.set()
+    assert running.result(5) is True
+    pool.shutdown()
+
+
+def test_abandon_running_task_frees_its_slot():
+    pool = WorkerPool(max_workers=1, min_workers=0, name="TestPool")
+    started = threading.Event()
+    release = threading.Event()
+
+    def _block():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    stuck = pool.submit(_block)
+    assert started.wait(5)
+    queued = pool.submit(lambda: "next")
+    assert pool.abandon(stuck)
+    # 被放弃的线程不再占用线程数上限，排队的任务由新的线程执行
+    assert queued.result(5) == "next"
+    stats = pool.stats()
+    assert stats.abandoned_workers == 1
+    assert stats.live_workers == 1
+
+    release.set()
+    assert stuck.result(5) == "late"
+    # 已结束的任务不能再被放弃
+    assert not pool.abandon(stuck)
+    pool.shutdown()
+
+
+def test_ensure_capacity_only_grows_and_starts_queued_tasks():
+    pool = WorkerPool(max_workers=1, min_workers=0, name="TestPool")
+    release = threading.Event()
+    first = pool.submit(release.wait, 5)
+    second = pool.submit(lambda: "second")
+    assert pool.ensure_capacity(2) == 2
+    assert second.result(5) == "second"
+    assert pool.ensure_capacity(1) == 2
+    release.set()
+    assert first.result(5) is True
+    pool.shutdown()